@@ -0,0 +1,104 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.services.maintenance import (
+    Progress,
+    compact_store,
+    convert_store,
+    rebuild_store,
+    verify_store,
+)
+from app.services.snapshot import SNAPSHOT_FORMATS
+from app.services.storage import (
+    STORAGE_BACKENDS,
+    StorageBackend,
+    StorageError,
+    create_backend,
+)
+
+# Default store location, same as the service
+DEFAULT_DATA_FILE = "data/feature_metadata.json"
+
+
+# Command line parser
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="feature-store",
+        description="Offline maintenance for the feature metadata store",
+    )
+    parser.add_argument("--data-file", default=DEFAULT_DATA_FILE)
+    parser.add_argument(
+        "--backend", choices=STORAGE_BACKENDS, help="default: FEATURE_METADATA_BACKEND"
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=SNAPSHOT_FORMATS,
+        help="default: FEATURE_METADATA_SNAPSHOT_FORMAT",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="no throughput reports on stderr"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("verify", help="check checksums and record schema")
+    commands.add_parser("compact", help="fold logs into a new snapshot")
+    commands.add_parser("rebuild", help="rebuild derived indexes")
+    convert = commands.add_parser("convert", help="copy records into another store")
+    convert.add_argument("--output", required=True, help="target data file")
+    convert.add_argument("--to-backend", choices=STORAGE_BACKENDS, default="json")
+    convert.add_argument("--to-format", choices=SNAPSHOT_FORMATS, default="json")
+    return parser
+
+
+# Open store, including a log left by the service
+def open_store(
+    data_file: str, kind: str | None, snapshot_format: str | None
+) -> StorageBackend:
+    log_file = Path(f"{data_file}.wal")
+    has_log = log_file.exists() or Path(f"{log_file}.1").exists()
+    return create_backend(
+        data_file,
+        kind=kind,
+        snapshot_format=snapshot_format,
+        wal_enabled=True if has_log else None,
+    )
+
+
+# Run maintenance command
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    progress = Progress(args.command, None if args.quiet else sys.stderr)
+    try:
+        source = open_store(args.data_file, args.backend, args.snapshot_format)
+    except (OSError, ValueError, StorageError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    try:
+        if args.command == "verify":
+            report = verify_store(source, progress)
+            print(json.dumps(report, indent=2))
+            return 0 if report["ok"] else 1
+        if args.command == "compact":
+            count = compact_store(source, progress)
+            print(f"Compacted {count} records")
+        elif args.command == "rebuild":
+            count = rebuild_store(source, progress)
+            print(f"Rebuilt indexes for {count} records")
+        else:
+            target = open_store(args.output, args.to_backend, args.to_format)
+            try:
+                count = convert_store(source, target, progress)
+            finally:
+                target.close()
+            print(f"Converted {count} records to {args.output}")
+        return 0
+    except (OSError, ValueError, StorageError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        source.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,11 @@ from contextlib import asynccontextmanager
 from typing import Any
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from app.models.request import (
     ApproveFeatureMetadataRequest,
@@ -28,7 +29,19 @@ from app.models.response import (
     UpdateFeatureMetadataResponse,
     WorkflowMetadataResponse,
 )
+from app.services.checkpoint import SnapshotCheckpointer, create_checkpointer
 from app.services.feature_service import FeatureMetadataService
+from app.services.projection import check_fields
+from app.services.versions import etag_matches
+from app.utils.config import env_int
+from app.utils.constants import (
+    AGGREGATE_OPTIONS,
+    DEFAULT_PAGE_SIZE,
+    LISTING_OPTIONS,
+    SORT_ORDERS,
+)
+from app.utils.query_string import listing_request, parse_fields
+from app.utils.responses import FastJSONResponse
 from app.utils.timestamp import get_current_timestamp
 
 # Logger setup
@@ -56,9 +69,18 @@ async def lifespan(app: FastAPI) -> Any:
     global feature_service
     with _service_lock:
         feature_service = FeatureMetadataService()
+        checkpointer: SnapshotCheckpointer | None = create_checkpointer(feature_service)
+    if checkpointer is not None:
+        checkpointer.start()
     logger.info("Feature metadata service initialized")
     yield
     logger.info("Shutting down feature metadata service")
+    if checkpointer is not None:
+        checkpointer.stop()
+    with _service_lock:
+        if feature_service is not None:
+            feature_service.close()
+            feature_service = None
 
 
 # FastAPI app setup
@@ -89,15 +111,32 @@ async def root() -> dict[str, str]:
 @app.get("/health", response_model=HealthResponse)
 @app.post("/health", response_model=HealthResponse)
 async def health_check() -> dict[str, Any]:
+    # Liveness: answers while the catalog is still loading
+    service = feature_service
+    ready = service is not None and service.is_ready()
     return {
         "status": "healthy",
         "version": "1.0.0",
         "uptime_seconds": 0,
-        "dependencies": {"feature_service": "healthy"},
+        "dependencies": {"feature_service": "healthy" if ready else "loading"},
+        "persistence": service.persistence_lag() if service is not None else {},
+        "checkpoints": service.checkpoint_stats() if service is not None else {},
+        "ready": ready,
+        "loading": service.load_status() if service is not None else {},
         "timestamp": get_current_timestamp(),
     }
 
 
+# Readiness probe, 503 until the catalog is loaded
+@app.get("/health/ready", response_model=HealthResponse)
+async def readiness_check() -> JSONResponse:
+    health = await health_check()
+    return JSONResponse(
+        HealthResponse(**health).model_dump(),
+        status_code=200 if health["ready"] else 503,
+    )
+
+
 # Create feature metadata
 @app.post(
     "/create_feature_metadata",
@@ -109,10 +148,11 @@ async def create_feature_metadata(
 ) -> CreateFeatureMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.create_feature_metadata(request.model_dump())
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.create_feature_metadata, request.model_dump()
+        )
         return CreateFeatureMetadataResponse(
             message="Feature metadata created successfully",
             metadata=metadata,
@@ -131,47 +171,85 @@ async def create_feature_metadata(
 @app.post(
     "/get_feature_metadata",
     response_model=FeatureMetadataSingleResponse | FeatureMetadataBatchResponse,
+    response_class=FastJSONResponse,
 )
 async def get_feature_metadata(
     request: GetFeatureMetadataRequest,
-) -> FeatureMetadataSingleResponse | FeatureMetadataBatchResponse:
+    if_none_match: str | None = Header(None),
+) -> Response:
+    # Bodies are spliced from cached record bytes, shaped as response_model;
+    # current versions are answered without a body
     try:
         ensure_service()
         if feature_service is None:
             raise HTTPException(status_code=500, detail="Service not initialized")
         features = request.features
         user_role = request.user_role
+        fields = request.fields
+        service = feature_service
+        ready = service.is_ready()
+
         if isinstance(features, str):
-            metadata = feature_service.get_feature_metadata(features, user_role)
-            return FeatureMetadataSingleResponse(
-                values=metadata.dict(),
-                status="200 OK",
-                event_timestamp=get_current_timestamp(),
+            # Misses may read storage or wait while the catalog loads
+            if ready:
+                etag, value = service.get_versioned_json(
+                    features, user_role, fields, if_none_match
+                )
+            else:
+                etag, value = await run_in_threadpool(
+                    service.get_versioned_json,
+                    features,
+                    user_role,
+                    fields,
+                    if_none_match,
+                )
+            if value is None:
+                return Response(status_code=304, headers={"ETag": etag})
+            return FastJSONResponse(
+                {
+                    "values": value,
+                    "status": "200 OK",
+                    "event_timestamp": get_current_timestamp(),
+                },
+                headers={"ETag": etag},
             )
         elif isinstance(features, list):
-            values = []
+            # One lock acquisition and one timestamp for the whole batch;
+            # repeated names are resolved once, unchanged ones left out
+            known = request.known_versions
+            if ready:
+                found = service.get_many_versioned(features, user_role, fields, known)
+            else:
+                found = await run_in_threadpool(
+                    service.get_many_versioned, features, user_role, fields, known
+                )
+            names = []
+            values: list[Any] = []
             status_list = []
-            ts_list = []
-            found_features = []
+            versions: list[str | None] = []
             for fname in features:
-                try:
-                    meta = feature_service.get_feature_metadata(fname, user_role)
-                    values.append(meta.dict())
+                entry = found[fname]
+                if entry is None:
+                    values.append(b"{}")
+                    status_list.append(f"Feature {fname} not found")
+                    versions.append(None)
+                elif entry[1] is None:
+                    continue
+                else:
+                    values.append(entry[1])
                     status_list.append("200 OK")
-                    ts_list.append(get_current_timestamp())
-                    found_features.append(fname)
-                except Exception as e:
-                    values.append({})
-                    status_list.append(str(e))
-                    ts_list.append(get_current_timestamp())
-                    found_features.append(fname)
-            return FeatureMetadataBatchResponse(
-                metadata={"features": found_features},
-                results={
-                    "values": values,
-                    "status/message": status_list,
-                    "event_timestamp": ts_list,
-                },
+                    versions.append(entry[0])
+                names.append(fname)
+            return FastJSONResponse(
+                {
+                    "metadata": {"features": names},
+                    "results": {
+                        "values": values,
+                        "status/message": status_list,
+                        "event_timestamp": [get_current_timestamp()] * len(names),
+                        "versions": versions,
+                    },
+                }
             )
         else:
             raise HTTPException(status_code=400, detail="Invalid features type")
@@ -184,8 +262,18 @@ async def get_feature_metadata(
 
 
 # Get all feature metadata (POST with filters)
-@app.post("/get_all_feature_metadata")
-async def get_all_feature_metadata(request: dict) -> dict[str, Any]:
+@app.post(
+    "/get_all_feature_metadata",
+    response_model=dict[str, Any],
+    response_class=FastJSONResponse,
+)
+async def get_all_feature_metadata(request: dict) -> Response:
+    # Records are spliced in as JSON bytes, never built as models
+    return await _list_feature_metadata(request)
+
+
+# Listing shared by the POST and GET routes
+async def _list_feature_metadata(request: dict[str, Any]) -> Response:
     try:
         ensure_service()
         if feature_service is None:
@@ -195,14 +283,94 @@ async def get_all_feature_metadata(request: dict) -> dict[str, Any]:
 
         if not FeatureValidator.validate_user_role(user_role):
             raise HTTPException(status_code=400, detail="Invalid role")
+        count_only = bool(request.get("count_only"))
+        # Name prefix, e.g. "fraud:" or "fraud:amount:"
+        prefix = request.get("prefix")
+        # Filter expression, e.g. {"or": [{"field": "status", "eq": "DRAFT"}, ...]}
+        where = request.get("where")
+        explain = bool(request.get("explain"))
+        # Only these record keys are built, e.g. ["status", "feature_data_type"]
+        fields = request.get("fields")
         filters = {
-            k: v for k, v in request.items() if k != "user_role" and v is not None
-        }
-        result = feature_service.get_all_feature_metadata(user_role, filters)
-        return {
-            "metadata": [meta.dict() for meta in result.values()],
-            "total_count": len(result),
+            k: v
+            for k, v in request.items()
+            if k not in LISTING_OPTIONS and v is not None
         }
+        if where is not None and filters:
+            raise ValueError("Use either where or field filters, not both")
+        if explain and where is None:
+            raise ValueError("explain needs a where expression")
+        order = request.get("order", "asc")
+        if order not in SORT_ORDERS:
+            raise ValueError(f"Invalid order: {order!r}. Must be one of: {SORT_ORDERS}")
+        if not count_only and any(
+            key in request for key in ("limit", "cursor", "order_by")
+        ):
+            # Cursor page, total only on request
+            page = await run_in_threadpool(
+                feature_service.page_feature_metadata,
+                user_role,
+                filters,
+                prefix,
+                where,
+                request.get("limit", DEFAULT_PAGE_SIZE),
+                request.get("cursor"),
+                bool(request.get("include_total")),
+                request.get("order_by"),
+                order == "desc",
+                fields,
+                True,
+            )
+            page["metadata"] = list(page["metadata"].values())
+            if not explain:
+                page.pop("plan", None)
+            return FastJSONResponse(page)
+        if where is not None:
+            response: dict[str, Any]
+            if count_only:
+                count, plan = await run_in_threadpool(
+                    feature_service.count_query_matches, user_role, where, prefix
+                )
+                response = {"metadata": [], "total_count": count}
+            else:
+                matched, plan = await run_in_threadpool(
+                    feature_service.query_feature_metadata,
+                    user_role,
+                    where,
+                    prefix,
+                    fields,
+                    True,
+                )
+                response = {
+                    "metadata": list(matched.values()),
+                    "total_count": len(matched),
+                }
+            if explain:
+                response["plan"] = plan
+            return FastJSONResponse(response)
+        if count_only:
+            # Counted from index bitsets, no records built
+            count = await run_in_threadpool(
+                feature_service.count_feature_metadata, user_role, filters, prefix
+            )
+            return FastJSONResponse({"metadata": [], "total_count": count})
+        if feature_service.is_ready():
+            result = feature_service.get_all_feature_metadata(
+                user_role, filters, prefix, fields, True
+            )
+        else:
+            # Scans wait for the load off the event loop
+            result = await run_in_threadpool(
+                feature_service.get_all_feature_metadata,
+                user_role,
+                filters,
+                prefix,
+                fields,
+                True,
+            )
+        return FastJSONResponse(
+            {"metadata": list(result.values()), "total_count": len(result)}
+        )
     except HTTPException as e:
         raise e
     except ValueError as e:
@@ -213,6 +381,158 @@ async def get_all_feature_metadata(request: dict) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+# Cache headers of GET reads: every input is in the URL, and the CORS
+# middleware answers per Origin
+def _cache_headers(etag: str) -> dict[str, str]:
+    max_age = env_int("FEATURE_METADATA_CACHE_MAX_AGE", 5)
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Origin",
+    }
+
+
+# Errors must not be cached, 404s are otherwise heuristically cacheable
+def _uncached(e: HTTPException) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+# Get one feature (GET, cacheable)
+@app.get(
+    "/features/{feature_name}",
+    response_model=dict[str, Any],
+    response_class=FastJSONResponse,
+)
+async def get_feature(
+    feature_name: str,
+    user_role: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    # The record's cached JSON bytes as the body, so the ETag names exactly
+    # these bytes
+    try:
+        ensure_service()
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        service = feature_service
+        from app.utils.validation import FeatureValidator
+
+        # Checked here, so a missing role is a 400 sent with no-store too
+        if not user_role or not FeatureValidator.validate_user_role(user_role):
+            raise HTTPException(status_code=400, detail="Invalid role")
+        try:
+            requested = check_fields(parse_fields(fields) if fields else None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        args = (feature_name, user_role, requested, if_none_match)
+        if service.is_ready():
+            etag, body = service.get_versioned_json(*args)
+        else:
+            etag, body = await run_in_threadpool(service.get_versioned_json, *args)
+        headers = _cache_headers(etag)
+        if body is None:
+            return Response(status_code=304, headers=headers)
+        return FastJSONResponse(body, headers=headers)
+    except HTTPException as e:
+        raise _uncached(e) from e
+    except ValueError as e:
+        logger.error(f"Error getting feature: {e}")
+        raise _uncached(HTTPException(status_code=404, detail=str(e))) from e
+    except Exception as e:
+        logger.error(f"Unexpected error getting feature: {e}")
+        raise _uncached(
+            HTTPException(status_code=500, detail="Internal server error")
+        ) from e
+
+
+# Conditional GET listing; the catalog tag is taken before listing
+async def _get_listing(request: Request, prefix: str | None = None) -> Response:
+    try:
+        ensure_service()
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        try:
+            body = listing_request(request.query_params.multi_items())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if prefix is not None:
+            if "prefix" in body:
+                raise HTTPException(
+                    status_code=400, detail="Use either the namespace or prefix"
+                )
+            body["prefix"] = prefix
+        etag = feature_service.catalog_etag(f"{request.url.path}?{request.url.query}")
+        headers = _cache_headers(etag)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        response = await _list_feature_metadata(body)
+        response.headers.update(headers)
+        return response
+    except HTTPException as e:
+        raise _uncached(e) from e
+
+
+# List features (GET with query string filters, cacheable)
+@app.get("/features", response_model=dict[str, Any], response_class=FastJSONResponse)
+async def list_features(request: Request) -> Response:
+    # Same options and filters as /get_all_feature_metadata, as query string
+    return await _get_listing(request)
+
+
+# List one namespace (GET, cacheable)
+@app.get(
+    "/namespaces/{namespace}/features",
+    response_model=dict[str, Any],
+    response_class=FastJSONResponse,
+)
+async def list_namespace_features(namespace: str, request: Request) -> Response:
+    # A category ("fraud") or every version of a feature ("fraud:amount")
+    return await _get_listing(request, f"{namespace}:")
+
+
+# Group-by counts (POST with filters)
+@app.post("/aggregate_feature_metadata")
+async def aggregate_feature_metadata(request: dict) -> dict[str, Any]:
+    try:
+        ensure_service()
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        user_role = str(request.get("user_role") or "")
+        from app.utils.validation import FeatureValidator
+
+        if not FeatureValidator.validate_user_role(user_role):
+            raise HTTPException(status_code=400, detail="Invalid role")
+        where = request.get("where")
+        filters = {
+            k: v
+            for k, v in request.items()
+            if k not in AGGREGATE_OPTIONS and v is not None
+        }
+        if where is not None and filters:
+            raise ValueError("Use either where or field filters, not both")
+        return await run_in_threadpool(
+            feature_service.aggregate_feature_metadata,
+            user_role,
+            request.get("group_by"),
+            filters,
+            request.get("prefix"),
+            where,
+        )
+    except HTTPException as e:
+        raise e
+    except ValueError as e:
+        logger.error(f"Error aggregating metadata: {e}")
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Unexpected error aggregating metadata: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
 # Update feature metadata
 @app.post("/update_feature_metadata", response_model=UpdateFeatureMetadataResponse)
 async def update_feature_metadata(
@@ -220,10 +540,11 @@ async def update_feature_metadata(
 ) -> UpdateFeatureMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.update_feature_metadata(request.model_dump())
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.update_feature_metadata, request.model_dump()
+        )
         return UpdateFeatureMetadataResponse(
             message="Feature metadata updated successfully",
             metadata=metadata,
@@ -255,8 +576,9 @@ async def delete_feature_metadata(
                 )
         if not getattr(request, "deletion_reason", None):
             raise HTTPException(status_code=422, detail="deletion_reason is required")
-        with _service_lock:
-            metadata = feature_service.delete_feature_metadata(request.model_dump())
+        metadata = await run_in_threadpool(
+            feature_service.delete_feature_metadata, request.model_dump()
+        )
         return DeleteFeatureMetadataResponse(
             message="Feature metadata deleted successfully",
             metadata=metadata,
@@ -280,12 +602,11 @@ async def submit_test_feature_metadata(
 ) -> WorkflowMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.submit_test_feature_metadata(
-                request.model_dump()
-            )
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.submit_test_feature_metadata, request.model_dump()
+        )
         return WorkflowMetadataResponse(
             message="Feature submitted for testing",
             metadata=metadata,
@@ -309,10 +630,11 @@ async def test_feature_metadata(
 ) -> WorkflowMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.test_feature_metadata(request.model_dump())
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.test_feature_metadata, request.model_dump()
+        )
         return WorkflowMetadataResponse(
             message="Test results recorded",
             metadata=metadata,
@@ -336,10 +658,11 @@ async def approve_feature_metadata(
 ) -> WorkflowMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.approve_feature_metadata(request.model_dump())
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.approve_feature_metadata, request.model_dump()
+        )
         return WorkflowMetadataResponse(
             message="Feature approved and deployed",
             metadata=metadata,
@@ -363,10 +686,11 @@ async def reject_feature_metadata(
 ) -> WorkflowMetadataResponse:
     try:
         ensure_service()
-        with _service_lock:
-            if feature_service is None:
-                raise HTTPException(status_code=500, detail="Service not initialized")
-            metadata = feature_service.reject_feature_metadata(request.model_dump())
+        if feature_service is None:
+            raise HTTPException(status_code=500, detail="Service not initialized")
+        metadata = await run_in_threadpool(
+            feature_service.reject_feature_metadata, request.model_dump()
+        )
         return WorkflowMetadataResponse(
             message="Feature rejected",
             metadata=metadata,
@@ -34,6 +34,8 @@ class FeatureMetadata(BaseModel):
 class GetFeatureMetadataRequest(BaseModel):
     features: str | list[str]
     user_role: str
+    fields: list[str] | None = None
+    known_versions: dict[str, str] | None = None
 
     @validator("features")
     @classmethod
@@ -54,6 +56,14 @@ class GetFeatureMetadataRequest(BaseModel):
             raise ValueError("User role cannot be empty")
         return v
 
+    @validator("fields")
+    def validate_fields(cls, v: list[str] | None) -> list[str] | None:
+        if v is not None:
+            unknown = [f for f in v if f not in FeatureMetadata.model_fields]
+            if not v or unknown:
+                raise ValueError(f"Invalid fields {unknown}")
+        return v
+
 
 # Create metadata request
 class CreateFeatureMetadataRequest(BaseModel):
@@ -64,6 +74,7 @@ class CreateFeatureMetadataRequest(BaseModel):
     description: str = Field(..., min_length=1)
     created_by: str = Field(..., min_length=1)
     user_role: str = Field(..., min_length=1)
+    durability: str | None = None
 
 
 # Update metadata request
@@ -75,6 +86,7 @@ class UpdateFeatureMetadataRequest(BaseModel):
     description: str | None = None
     last_updated_by: str
     user_role: str
+    durability: str | None = None
 
 
 # Delete metadata request
@@ -83,6 +95,7 @@ class DeleteFeatureMetadataRequest(BaseModel):
     deleted_by: str
     user_role: str
     deletion_reason: str
+    durability: str | None = None
 
 
 # Submit for testing request
@@ -90,6 +103,7 @@ class SubmitTestFeatureMetadataRequest(BaseModel):
     feature_name: str
     submitted_by: str
     user_role: str
+    durability: str | None = None
 
 
 # Test metadata request
@@ -99,6 +113,7 @@ class TestFeatureMetadataRequest(BaseModel):
     tested_by: str
     test_notes: str | None = None
     user_role: str
+    durability: str | None = None
 
 
 # Approve metadata request
@@ -107,6 +122,7 @@ class ApproveFeatureMetadataRequest(BaseModel):
     approved_by: str
     approval_notes: str | None = None
     user_role: str
+    durability: str | None = None
 
 
 # Reject metadata request
@@ -115,3 +131,4 @@ class RejectFeatureMetadataRequest(BaseModel):
     rejected_by: str
     rejection_reason: str
     user_role: str
+    durability: str | None = None
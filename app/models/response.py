@@ -61,3 +61,7 @@ class HealthResponse(BaseResponse):
     version: str = Field("1.0.0")
     uptime_seconds: int = Field(0)
     dependencies: dict[str, str] = Field(default_factory=dict)
+    persistence: dict[str, Any] = Field(default_factory=dict)
+    checkpoints: dict[str, Any] = Field(default_factory=dict)
+    ready: bool = Field(True)
+    loading: dict[str, Any] = Field(default_factory=dict)
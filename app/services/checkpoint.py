@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from app.services.storage import FileBackend, StorageError
+from app.utils.config import env_int
+
+if TYPE_CHECKING:
+    from app.services.feature_service import FeatureMetadataService
+
+logger = logging.getLogger(__name__)
+
+
+# Background snapshot writer
+class SnapshotCheckpointer:
+    """Write point-in-time catalog snapshots off the write path."""
+
+    def __init__(
+        self,
+        service: "FeatureMetadataService",
+        interval_seconds: float = 60.0,
+        max_log_records: int = 10000,
+        max_log_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self.max_log_records = max_log_records
+        self.max_log_bytes = max_log_bytes
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.checkpoint_count = 0
+        self.error_count = 0
+        self.last_duration_ms = 0.0
+        self.last_bytes = 0
+        self.last_checkpoint_time: float | None = None
+
+    def start(self) -> None:
+        # Start background thread
+        if self._thread is not None:
+            return
+        # Compaction moves off the write path
+        if isinstance(self.service.backend, FileBackend):
+            self.service.backend.compact_threshold = 0
+        self.service.checkpointer = self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="snapshot-checkpointer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, final_checkpoint: bool = True) -> None:
+        # Stop thread, optionally flush snapshot
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        if self.service.checkpointer is self:
+            self.service.checkpointer = None
+        if final_checkpoint:
+            self.checkpoint()
+
+    def notify_write(self) -> None:
+        # Wake thread when log is large
+        backend = self.service.backend
+        wal = backend.wal if isinstance(backend, FileBackend) else None
+        if wal is None:
+            return
+        if (
+            wal.record_count >= self.max_log_records
+            or wal.byte_count >= self.max_log_bytes
+        ):
+            self._wake.set()
+
+    def _run(self) -> None:
+        # Checkpoint on interval or size trigger
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds or None)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        # Write one snapshot and record stats
+        if not self.service.is_ready():
+            # A partial catalog must never replace the snapshot
+            logger.info("Checkpoint skipped while catalog is loading")
+            return
+        started = time.perf_counter()
+        try:
+            size = self.service.backend.checkpoint(
+                self.service._lock, self.service.metadata
+            )
+        except (OSError, StorageError) as e:
+            self.error_count += 1
+            logger.error(f"Checkpoint failed: {e}")
+            return
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_bytes = size
+        self.last_checkpoint_time = time.time()
+        self.checkpoint_count += 1
+        logger.info(
+            f"Checkpoint written: {size} bytes in {self.last_duration_ms:.1f} ms"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        # Checkpoint sizing metrics
+        return {
+            "checkpoints": self.checkpoint_count,
+            "errors": self.error_count,
+            "last_duration_ms": round(self.last_duration_ms, 3),
+            "last_bytes": self.last_bytes,
+            "last_checkpoint_time": self.last_checkpoint_time,
+        }
+
+
+# Build checkpointer from environment
+def create_checkpointer(
+    service: "FeatureMetadataService",
+) -> SnapshotCheckpointer | None:
+    interval = env_int("FEATURE_METADATA_CHECKPOINT_INTERVAL", 0)
+    if interval <= 0:
+        return None
+    return SnapshotCheckpointer(
+        service,
+        interval_seconds=interval,
+        max_log_records=env_int("FEATURE_METADATA_CHECKPOINT_MAX_RECORDS", 10000),
+        max_log_bytes=env_int(
+            "FEATURE_METADATA_CHECKPOINT_MAX_BYTES", 64 * 1024 * 1024
+        ),
+    )
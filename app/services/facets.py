@@ -0,0 +1,37 @@
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from app.models.request import FeatureMetadata
+
+
+# Group-by field names, one name or a list, validated against the model
+def check_group_by(group_by: object) -> list[str]:
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    if (
+        not isinstance(group_by, list)
+        or not group_by
+        or not all(isinstance(field, str) for field in group_by)
+    ):
+        raise ValueError(f"Invalid group_by: {group_by!r}")
+    unknown = [field for field in group_by if field not in FeatureMetadata.model_fields]
+    if unknown:
+        raise ValueError(f"Invalid group_by fields {unknown}")
+    return list(dict.fromkeys(group_by))
+
+
+# Records per stringified value, None for records without the field, for
+# fields without an index
+def scan_counts(records: Iterable[dict[str, Any]], field: str) -> dict[str | None, int]:
+    return dict(
+        Counter(str(record[field]) if field in record else None for record in records)
+    )
+
+
+# Counts as buckets, largest first, ties by value with missing last
+def buckets(counts: dict[str | None, int]) -> list[dict[str, Any]]:
+    ordered = sorted(
+        counts.items(), key=lambda item: (-item[1], item[0] is None, item[0] or "")
+    )
+    return [{"value": value, "count": count} for value, count in ordered]
@@ -1,12 +1,49 @@
-import json
 import threading
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from app.models.request import FeatureMetadata
+from app.services.checkpoint import SnapshotCheckpointer
+from app.services.facets import buckets, check_group_by, scan_counts
+from app.services.flusher import AsyncFlusher
+from app.services.fuzzy import fuzzy_matches
+from app.services.indexes import (
+    CatalogIndex,
+    filter_keys,
+    in_range,
+    iter_bitmap,
+    range_bounds,
+)
+from app.services.json_cache import RecordJsonCache
+from app.services.loader import BackgroundLoader
+from app.services.ordering import sort_value, top_ids
+from app.services.pagination import check_page_size, cursor_position, encode_cursor
+from app.services.projection import check_fields, project
+from app.services.query import And, Compare, QueryPlan, compile_filter
+from app.services.storage import StorageBackend, StorageError, create_backend
+from app.services.versions import RecordVersions, etag_matches
+from app.services.wal import LogBatch
+from app.utils.config import env_int, env_str
+from app.utils.constants import (
+    DEFAULT_PAGE_SIZE,
+    DURABILITY_LEVELS,
+    FUZZY_THRESHOLD,
+    LOAD_MODES,
+)
+from app.utils.responses import encode_json
 from app.utils.timestamp import get_current_timestamp
 from app.utils.validation import FeatureValidator, RoleValidator
 
+T = TypeVar("T")
+
+# Record as a model, a projected dict, or JSON bytes of either
+RecordView = FeatureMetadata | dict[str, Any] | bytes
+
+# ETag and JSON bytes, no bytes when the caller's version is current
+Versioned = tuple[str, bytes | None]
+
 
 # Base service class
 class FeatureService:
@@ -19,35 +56,152 @@ class FeatureService:
 class FeatureMetadataService(FeatureService):
     """Manage feature metadata."""
 
-    def __init__(self, data_file: str = "data/feature_metadata.json"):
+    def __init__(
+        self,
+        data_file: str = "data/feature_metadata.json",
+        backend: StorageBackend | None = None,
+        default_durability: str | None = None,
+        load_mode: str | None = None,
+    ):
+        if default_durability is None:
+            default_durability = env_str("FEATURE_METADATA_DURABILITY", "sync").lower()
+        self.default_durability = self._check_durability(default_durability)
+        if load_mode is None:
+            load_mode = env_str("FEATURE_METADATA_LOAD_MODE", "blocking").lower()
+        if load_mode not in LOAD_MODES:
+            raise ValueError(
+                f"Invalid load mode {load_mode}. Must be one of: {LOAD_MODES}"
+            )
         self.data_file = Path(data_file)
         self.data_file.parent.mkdir(exist_ok=True)
         self._lock = threading.RLock()
         self.metadata: dict[str, dict[str, Any]] = {}
+        self.indexes = CatalogIndex()
+        self.json_cache = RecordJsonCache()
+        self.versions = RecordVersions()
         self.validator = FeatureValidator()
-        self._load_data()
+        self.backend = backend if backend is not None else create_backend(data_file)
+        self.checkpointer: SnapshotCheckpointer | None = None
+        self.flusher: AsyncFlusher | None = None
+        self.loader: BackgroundLoader | None = None
+        if load_mode == "background":
+            # Serve while records stream in
+            self.loader = BackgroundLoader(
+                self, env_int("FEATURE_METADATA_LOAD_BATCH_SIZE", 1000)
+            )
+            self.loader.start()
+        else:
+            self._load_data()
+
+    @staticmethod
+    def _check_durability(durability: str) -> str:
+        # Reject unknown durability level
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"Invalid durability level {durability}. "
+                f"Must be one of: {DURABILITY_LEVELS}"
+            )
+        return durability
+
+    def _durability(self, request_data: dict[str, Any]) -> str:
+        # Requested durability or service default
+        durability = request_data.get("durability") or self.default_durability
+        return self._check_durability(str(durability))
 
     def _load_data(self) -> None:
-        # Load metadata from file
+        # Load metadata from backend
         try:
-            if self.data_file.exists():
-                with open(self.data_file) as f:
-                    data = json.load(f)
-                    self.metadata = data if isinstance(data, dict) else {}
-            else:
-                self.metadata = {}
-        except (OSError, json.JSONDecodeError) as e:
+            self.metadata = self.backend.load()
+        except (OSError, ValueError, StorageError) as e:
             print(f"Error loading data: {e}")
             self.metadata = {}
+        self.indexes.sync(self.metadata)
+        self.json_cache.clear()
+        self.versions.clear()
+
+    def is_ready(self) -> bool:
+        # Whole catalog in memory
+        return self.loader is None or self.loader.state == "ready"
+
+    def _await_loaded(self) -> None:
+        # Writes and scans need the whole catalog
+        if self.loader is None or self.is_ready():
+            return
+        self.loader.wait()
+        if not self.is_ready():
+            raise Exception("Catalog load stopped")
+
+    def load_status(self) -> dict[str, Any]:
+        # Startup load progress
+        if self.loader is None:
+            return {
+                "state": "ready",
+                "loaded_records": len(self.metadata),
+                "fetched_records": 0,
+                "skipped_records": 0,
+                "elapsed_ms": 0.0,
+                "error": None,
+            }
+        return self.loader.stats()
+
+    def _persist(self, feature_name: str, durability: str = "sync") -> LogBatch | None:
+        # Index and persist one changed record, or queue it for async flush
+        record = self.metadata.get(feature_name)
+        if record is not None:
+            self.indexes.update(feature_name, record)
+        self.json_cache.invalidate(feature_name)
+        self.versions.invalidate(feature_name)
+        if durability == "async":
+            if self.flusher is None:
+                self.flusher = AsyncFlusher(
+                    self, env_int("FEATURE_METADATA_ASYNC_FLUSH_MS", 50)
+                )
+                self.flusher.start()
+            self.flusher.mark(feature_name)
+            return None
+        try:
+            batch = self.backend.put(feature_name, self.metadata, durability)
+        except (OSError, StorageError) as e:
+            raise Exception(f"Failed to save data: {e}") from e
+        if self.checkpointer is not None:
+            self.checkpointer.notify_write()
+        return batch
 
-    def _save_data(self) -> None:
-        # Save metadata to file
+    def _commit(self, batch: LogBatch | None) -> None:
+        # Wait for durable write
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(self.metadata, f, indent=2)
-        except OSError as e:
+            self.backend.wait(batch)
+        except (OSError, StorageError) as e:
             raise Exception(f"Failed to save data: {e}") from e
 
+    def persistence_lag(self) -> dict[str, Any]:
+        # Unpersisted async writes and their age
+        if self.flusher is None:
+            return {
+                "pending_writes": 0,
+                "lag_ms": 0.0,
+                "flushes": 0,
+                "flushed_records": 0,
+                "errors": 0,
+                "last_flush_time": None,
+            }
+        return self.flusher.stats()
+
+    def checkpoint_stats(self) -> dict[str, Any]:
+        # Background checkpoint duration and size, empty when not running
+        if self.checkpointer is None:
+            return {}
+        return self.checkpointer.stats()
+
+    def close(self) -> None:
+        # Stop loading, flush async writes, release backend
+        if self.loader is not None:
+            self.loader.stop()
+        if self.flusher is not None:
+            self.flusher.stop()
+            self.flusher = None
+        self.backend.close()
+
     def _convert_request_to_dict(
         self, request: dict[str, Any] | object
     ) -> dict[str, Any]:
@@ -77,7 +231,9 @@ class FeatureMetadataService(FeatureService):
 
     def create_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Create feature metadata
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = str(request_data.get("feature_name", ""))
             user_role = str(request_data.get("user_role", ""))
             can_create, error_msg = RoleValidator.can_perform_action(
@@ -107,70 +263,455 @@ class FeatureMetadataService(FeatureService):
                 "last_updated_by": None,
             }
             self.metadata[feature_name] = metadata_dict
-            self._save_data()
-            return FeatureMetadata(**metadata_dict)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata_dict)
+        self._commit(batch)
+        return result
+
+    def _build(
+        self, record: dict[str, Any], fields: list[str] | None = None
+    ) -> FeatureMetadata | dict[str, Any]:
+        # Full model, or only the requested fields without validation
+        if fields is None:
+            return FeatureMetadata(**record)
+        return project(record, fields)
+
+    def _encode(
+        self, feature_name: str, record: dict[str, Any], fields: list[str] | None
+    ) -> bytes:
+        # JSON bytes of the built record, full records from the byte cache
+        if fields is None:
+            return self.json_cache.get(feature_name, record)
+        return encode_json(project(record, fields))
+
+    def _versioned(
+        self,
+        feature_name: str,
+        record: dict[str, Any],
+        fields: list[str] | None,
+        condition: str | None,
+    ) -> Versioned:
+        # ETag, and bytes only when the condition does not match; caller
+        # holds lock
+        etag = self.versions.etag(feature_name, record, fields)
+        if etag_matches(condition, etag):
+            return etag, None
+        return etag, self._encode(feature_name, record, fields)
+
+    def _view(
+        self,
+        names: Iterable[str],
+        fields: list[str] | None = None,
+        encoded: bool = False,
+    ) -> dict[str, RecordView]:
+        # Built or encoded records by name; caller holds lock
+        metadata = self.metadata
+        if encoded:
+            return {name: self._encode(name, metadata[name], fields) for name in names}
+        return {name: self._build(metadata[name], fields) for name in names}
+
+    def _check_prefix(self, prefix: Any) -> None:
+        # Name prefix must be a string
+        if prefix is not None and not isinstance(prefix, str):
+            raise ValueError(f"Invalid prefix: {prefix!r}")
+
+    def _exact_matches(
+        self, filters: dict[str, Any], prefix: str | None = None
+    ) -> list[str]:
+        # Names equal to every filter, a list means any of, a dict a range;
+        # caller holds lock
+        self._check_prefix(prefix)
+        for value in filters.values():
+            if isinstance(value, dict):
+                range_bounds(value)
+        self.indexes.sync(self.metadata)
+        candidates = self.indexes.match(filters, prefix)
+        names: Iterable[str] = self.metadata if candidates is None else candidates
+        residual = [
+            (key, value if isinstance(value, dict) else filter_keys(value))
+            for key, value in filters.items()
+            if key != "query" and not self.indexes.is_indexed(key, value)
+        ]
+        if not residual:
+            return list(names)
+        matched = []
+        for feature_name in names:
+            meta = self.metadata[feature_name]
+            for key, accepted in residual:
+                if isinstance(accepted, dict):
+                    # Ranges need a numeric value
+                    if not in_range(meta.get(key), accepted):
+                        break
+                # Records without the field match any equality filter
+                elif key in meta and str(meta[key]) not in accepted:
+                    break
+            else:
+                matched.append(feature_name)
+        return matched
+
+    def count_feature_metadata(
+        self,
+        user_role: str,
+        filters: dict[str, Any] | None = None,
+        prefix: str | None = None,
+    ) -> int:
+        # Count listing matches, from index bit counts when fully indexed
+        self._await_loaded()
+        self._check_prefix(prefix)
+        filters = filters or {}
+        with self._lock:
+            if not filters and prefix is None:
+                return len(self.metadata)
+            self.indexes.sync(self.metadata)
+            if all(
+                key == "query" or self.indexes.is_indexed(key, value)
+                for key, value in filters.items()
+            ):
+                count = self.indexes.count(filters, prefix)
+            else:
+                count = len(self._exact_matches(filters, prefix))
+            if count or not filters:
+                return count or 0
+        # No exact match, count the fuzzy fallback
+        return len(
+            self.get_all_feature_metadata(user_role, filters, prefix, ["feature_name"])
+        )
 
     def get_all_feature_metadata(
-        self, user_role: str, filters: dict[str, Any] | None = None
-    ) -> dict[str, FeatureMetadata]:
-        # Get metadata with fuzzy filter
-        import difflib
-
-        def is_exact_match(meta: dict[str, Any], filters: dict[str, Any]) -> bool:
-            for key, value in filters.items():
-                if key == "query":
-                    continue
-                if key in meta and str(meta[key]) != str(value):
-                    return False
-            return True
-
-        def similarity(a: str, b: str) -> float:
-            return difflib.SequenceMatcher(None, a, b).ratio()
+        self,
+        user_role: str,
+        filters: dict[str, Any] | None = None,
+        prefix: str | None = None,
+        fields: list[str] | None = None,
+        encoded: bool = False,
+    ) -> dict[str, RecordView]:
+        # Get metadata with fuzzy filter, optionally projected to fields
+        fields = check_fields(fields)
+        self._await_loaded()
+        with self._lock:
+            if not filters and prefix is None:
+                names: Iterable[str] = self.metadata
+            else:
+                names = self._matching_names(filters or {}, prefix)
+            return self._view(names, fields, encoded)
+
+    def _matching_names(
+        self, filters: dict[str, Any], prefix: str | None = None
+    ) -> list[str]:
+        # Exact matches, else fuzzy ones, in catalog order; caller holds lock
+        matched = self._exact_matches(filters, prefix)
+        if matched or not filters:
+            return matched
+
+        # Fuzzy match if no exact, prefix and ranges still apply exactly
+        ranges = {k: v for k, v in filters.items() if isinstance(v, dict)}
+        names: Iterable[str] = self.metadata
+        if prefix is not None:
+            names = self.indexes.match({}, prefix) or []
+        records = (
+            (feature_name, self.metadata[feature_name])
+            for feature_name in names
+            if all(
+                in_range(self.metadata[feature_name].get(k), v)
+                for k, v in ranges.items()
+            )
+        )
+        fuzzy = {k: v for k, v in filters.items() if k != "query" and k not in ranges}
+        return list(fuzzy_matches(records, fuzzy, FUZZY_THRESHOLD))
 
+    def page_feature_metadata(
+        self,
+        user_role: str,
+        filters: dict[str, Any] | None = None,
+        prefix: str | None = None,
+        where: Any = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        include_total: bool = False,
+        order_by: str | None = None,
+        descending: bool = False,
+        fields: list[str] | None = None,
+        encoded: bool = False,
+    ) -> dict[str, Any]:
+        # One page of a listing after an opaque cursor, in catalog order or
+        # sorted by one field
+        check_page_size(limit)
+        fields = check_fields(fields)
+        if order_by is not None and order_by not in FeatureMetadata.model_fields:
+            raise ValueError(f"Invalid order_by field: {order_by!r}")
+        self._await_loaded()
+        self._check_prefix(prefix)
+        page: dict[str, Any] = {}
         with self._lock:
-            result: dict[str, FeatureMetadata] = {}
-            if not filters:
-                for feature_name, metadata_dict in self.metadata.items():
-                    result[feature_name] = FeatureMetadata(**metadata_dict)
-                return result
+            index = self.indexes
+            index.sync(self.metadata)
+            ids = index.ids
+            after = -1
+            sort_after: list[Any] = []
+            if cursor is not None:
+                after, sort_after = cursor_position(cursor, ids)
+                if len(sort_after) != (order_by is not None):
+                    raise ValueError("Cursor does not match the listing order")
+            matched: list[str] | None = None
+            if where is not None:
+                matched, page["plan"] = self._run_query(where, prefix)
+            elif filters or prefix is not None:
+                matched = self._matching_names(filters or {}, prefix)
+            if order_by is not None:
+                # Ordered index walk or bounded heap, limit + 1 records
+                picked = top_ids(
+                    index,
+                    self.metadata,
+                    order_by,
+                    descending,
+                    limit + 1,
+                    None if matched is None else {ids[name] for name in matched},
+                    (sort_after[0], after) if cursor is not None else None,
+                )
+                names = [index.names[record_id] for record_id in picked]
+            elif matched is None:
+                # Whole catalog, sliced straight from the id order
+                names = index.names[after + 1 : after + limit + 2]
+            else:
+                start = bisect_right(matched, after, key=ids.__getitem__)
+                names = matched[start : start + limit + 1]
+            if include_total:
+                page["total_count"] = len(self.metadata if matched is None else matched)
+            page["next_cursor"] = None
+            if len(names) > limit:
+                last = names[limit - 1]
+                if order_by is None:
+                    page["next_cursor"] = encode_cursor(last)
+                else:
+                    value = sort_value(index, self.metadata[last], order_by)
+                    page["next_cursor"] = encode_cursor(last, value)
+            page["metadata"] = self._view(names[:limit], fields, encoded)
+        return page
 
-            # Try exact match first
-            for feature_name, metadata_dict in self.metadata.items():
-                if is_exact_match(metadata_dict, filters):
-                    result[feature_name] = FeatureMetadata(**metadata_dict)
+    def _run_query(
+        self, where: Any, prefix: str | None = None
+    ) -> tuple[list[str], dict[str, Any]]:
+        # Plan and run a filter expression, names and explain output;
+        # caller holds lock
+        self._check_prefix(prefix)
+        expression = compile_filter(where)
+        if prefix is not None:
+            expression = And([expression, Compare("feature_name", "prefix", prefix)])
+        self.indexes.sync(self.metadata)
+        plan = QueryPlan(expression, self.indexes)
+        names = plan.execute(self.metadata)
+        return names, plan.explain(len(names))
 
-            if result:
-                return result
+    def query_feature_metadata(
+        self,
+        user_role: str,
+        where: Any,
+        prefix: str | None = None,
+        fields: list[str] | None = None,
+        encoded: bool = False,
+    ) -> tuple[dict[str, RecordView], dict[str, Any]]:
+        # Records matching a filter expression, with the plan used
+        fields = check_fields(fields)
+        self._await_loaded()
+        with self._lock:
+            names, plan = self._run_query(where, prefix)
+            result = self._view(names, fields, encoded)
+        return result, plan
+
+    def count_query_matches(
+        self, user_role: str, where: Any, prefix: str | None = None
+    ) -> tuple[int, dict[str, Any]]:
+        # Matches of a filter expression without building records
+        self._await_loaded()
+        with self._lock:
+            names, plan = self._run_query(where, prefix)
+        return len(names), plan
 
-            # Fuzzy match if no exact
-            threshold = 0.7
-            for feature_name, metadata_dict in self.metadata.items():
-                match_score = 0.0
-                match_fields = 0
-                for key, value in filters.items():
-                    if key == "query":
-                        continue
-                    if key in metadata_dict and metadata_dict[key] is not None:
-                        match_fields += 1
-                        score = similarity(str(metadata_dict[key]), str(value))
-                        match_score += score
-                if match_fields > 0 and (match_score / match_fields) >= threshold:
-                    result[feature_name] = FeatureMetadata(**metadata_dict)
-            return result
+    def _matched_ids(
+        self,
+        filters: dict[str, Any],
+        prefix: str | None = None,
+        where: Any = None,
+    ) -> set[int] | int | None:
+        # Listing matches as ids or a bitset, None for the whole catalog;
+        # caller holds lock
+        index = self.indexes
+        index.sync(self.metadata)
+        if where is not None:
+            names, _ = self._run_query(where, prefix)
+        elif not filters and prefix is None:
+            return None
+        else:
+            self._check_prefix(prefix)
+            if all(
+                key == "query" or index.is_indexed(key, value)
+                for key, value in filters.items()
+            ):
+                # Bitsets stay packed, no names listed
+                matched = index.evaluate(filters, prefix)
+                if matched:
+                    return matched
+            names = self._matching_names(filters, prefix)
+        return {index.ids[name] for name in names}
+
+    def aggregate_feature_metadata(
+        self,
+        user_role: str,
+        group_by: Any,
+        filters: dict[str, Any] | None = None,
+        prefix: str | None = None,
+        where: Any = None,
+    ) -> dict[str, Any]:
+        # Record counts per value of each group_by field, from index counters
+        # or popcounts; records are never built
+        fields = check_group_by(group_by)
+        self._await_loaded()
+        with self._lock:
+            index = self.indexes
+            matched = self._matched_ids(filters or {}, prefix, where)
+            if matched is None:
+                total = len(self.metadata)
+            elif isinstance(matched, int):
+                total = matched.bit_count()
+            else:
+                total = len(matched)
+            facets = {}
+            for field in fields:
+                counts = index.counts(field, matched)
+                if counts is None:
+                    # Unindexed field, count the matched records
+                    ids: Iterable[int]
+                    if matched is None:
+                        ids = range(len(index.names))
+                    elif isinstance(matched, int):
+                        ids = iter_bitmap(matched)
+                    else:
+                        ids = matched
+                    records = (self.metadata[index.names[i]] for i in ids)
+                    counts = scan_counts(records, field)
+                facets[field] = buckets(counts)
+        return {"total_count": total, "facets": facets}
+
+    def _read(self, feature_name: Any, build: Callable[[dict[str, Any]], T]) -> T:
+        # Build one record under the lock, loading it on demand during startup
+        if not isinstance(feature_name, str):
+            raise ValueError(f"Feature {feature_name} not found")
+        with self._lock:
+            metadata_dict = self.metadata.get(feature_name)
+            if metadata_dict is not None:
+                return build(metadata_dict)
+        loader = self.loader
+        if loader is not None:
+            fetched = loader.fetch(feature_name)
+            if fetched is not None:
+                with self._lock:
+                    return build(fetched)
+        raise ValueError(f"Feature {feature_name} not found")
 
     def get_feature_metadata(
-        self, feature_name: str, user_role: str = "developer"
-    ) -> FeatureMetadata:
+        self,
+        feature_name: str,
+        user_role: str = "developer",
+        fields: list[str] | None = None,
+    ) -> FeatureMetadata | dict[str, Any]:
         # Get single metadata
+        fields = check_fields(fields)
+        return self._read(feature_name, lambda record: self._build(record, fields))
+
+    def get_feature_json(
+        self,
+        feature_name: str,
+        user_role: str = "developer",
+        fields: list[str] | None = None,
+    ) -> bytes:
+        # Single metadata as JSON bytes; full records come from the byte cache
+        fields = check_fields(fields)
+        return self._read(
+            feature_name, lambda record: self._encode(feature_name, record, fields)
+        )
+
+    def get_versioned_json(
+        self,
+        feature_name: str,
+        user_role: str = "developer",
+        fields: list[str] | None = None,
+        if_none_match: str | None = None,
+    ) -> Versioned:
+        # Single metadata as ETag and JSON bytes, no bytes if still current
+        fields = check_fields(fields)
+        return self._read(
+            feature_name,
+            lambda record: self._versioned(feature_name, record, fields, if_none_match),
+        )
+
+    def catalog_etag(self, key: str) -> str:
+        # Listing tag for a request key, current until the next write; take
+        # it before listing so a racing write only causes a refetch
         with self._lock:
-            if not isinstance(feature_name, str) or feature_name not in self.metadata:
-                raise ValueError(f"Feature {feature_name} not found")
-            metadata_dict = self.metadata[feature_name].copy()
-            return FeatureMetadata(**metadata_dict)
+            return self.versions.catalog_etag(key)
+
+    def _read_many(
+        self,
+        feature_names: Iterable[str],
+        build: Callable[[str, dict[str, Any]], T],
+    ) -> dict[str, T | None]:
+        # Distinct names in request order under one lock acquisition, None
+        # for misses; records not loaded yet are read on demand at startup
+        found: dict[str, T | None] = dict.fromkeys(feature_names)
+        with self._lock:
+            metadata = self.metadata
+            for name in found:
+                record = metadata.get(name)
+                if record is not None:
+                    found[name] = build(name, record)
+        loader = self.loader
+        if loader is not None:
+            misses = [name for name, value in found.items() if value is None]
+            for name in misses:
+                fetched = loader.fetch(name)
+                if fetched is not None:
+                    with self._lock:
+                        found[name] = build(name, fetched)
+        return found
+
+    def get_many(
+        self,
+        feature_names: Iterable[str],
+        user_role: str = "developer",
+        fields: list[str] | None = None,
+        encoded: bool = False,
+    ) -> dict[str, RecordView | None]:
+        # Batch of records by name, None for misses
+        fields = check_fields(fields)
+
+        def build(name: str, record: dict[str, Any]) -> RecordView:
+            if encoded:
+                return self._encode(name, record, fields)
+            return self._build(record, fields)
+
+        return self._read_many(feature_names, build)
+
+    def get_many_versioned(
+        self,
+        feature_names: Iterable[str],
+        user_role: str = "developer",
+        fields: list[str] | None = None,
+        known_versions: dict[str, str] | None = None,
+    ) -> dict[str, Versioned | None]:
+        # Batch as ETags and JSON bytes, no bytes for names whose known
+        # version is current
+        fields = check_fields(fields)
+        known = known_versions or {}
+        return self._read_many(
+            feature_names,
+            lambda name, record: self._versioned(name, record, fields, known.get(name)),
+        )
 
     def update_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Update metadata, reset status
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             if feature_name not in self.metadata:
@@ -189,12 +730,16 @@ class FeatureMetadataService(FeatureService):
             metadata["status"] = "DRAFT"
             metadata["updated_time"] = int(get_current_timestamp())
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
 
     def delete_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Delete feature metadata
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             can_delete, error_msg = RoleValidator.can_perform_action(
@@ -211,14 +756,18 @@ class FeatureMetadataService(FeatureService):
             metadata["deleted_time"] = int(get_current_timestamp())
             metadata["deleted_by"] = request_data.get("deleted_by")
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
 
     def submit_test_feature_metadata(
         self, request_data: dict[str, Any]
     ) -> FeatureMetadata:
         # Mark ready for testing
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             can_submit, error_msg = RoleValidator.can_perform_action(
@@ -235,12 +784,16 @@ class FeatureMetadataService(FeatureService):
             metadata["updated_time"] = int(get_current_timestamp())
             metadata["submitted_by"] = request_data.get("submitted_by")
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
 
     def test_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Test feature metadata
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             can_test, error_msg = RoleValidator.can_perform_action(user_role, "test")
@@ -260,12 +813,16 @@ class FeatureMetadataService(FeatureService):
             metadata["test_result"] = test_result
             metadata["test_notes"] = request_data.get("test_notes")
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
 
     def approve_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Approve feature metadata
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             can_approve, error_msg = RoleValidator.can_perform_action(
@@ -284,12 +841,16 @@ class FeatureMetadataService(FeatureService):
             metadata["deployed_by"] = request_data.get("approved_by")
             metadata["deployed_time"] = int(get_current_timestamp())
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
 
     def reject_feature_metadata(self, request_data: dict[str, Any]) -> FeatureMetadata:
         # Reject feature metadata
+        self._await_loaded()
         with self._lock:
+            durability = self._durability(request_data)
             feature_name = request_data.get("feature_name")
             user_role = str(request_data.get("user_role", ""))
             can_reject, error_msg = RoleValidator.can_perform_action(
@@ -307,5 +868,7 @@ class FeatureMetadataService(FeatureService):
             metadata["rejection_reason"] = request_data.get("rejection_reason")
             metadata["updated_time"] = int(get_current_timestamp())
             self.metadata[feature_name] = metadata
-            self._save_data()
-            return FeatureMetadata(**metadata)
+            batch = self._persist(feature_name, durability)
+            result = FeatureMetadata(**metadata)
+        self._commit(batch)
+        return result
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from app.services.storage import StorageError
+
+if TYPE_CHECKING:
+    from app.services.feature_service import FeatureMetadataService
+
+logger = logging.getLogger(__name__)
+
+
+# Background writer for async durability
+class AsyncFlusher:
+    """Persist records acknowledged before they reached storage."""
+
+    def __init__(
+        self, service: "FeatureMetadataService", interval_ms: int = 50
+    ) -> None:
+        self.service = service
+        self.interval_seconds = max(interval_ms, 1) / 1000
+        # Record name -> monotonic time first left unpersisted
+        self._pending: dict[str, float] = {}
+        self._inflight: dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.flush_count = 0
+        self.error_count = 0
+        self.flushed_records = 0
+        self.last_flush_time: float | None = None
+
+    def start(self) -> None:
+        # Start background thread
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="async-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Stop thread and persist what is left
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def mark(self, feature_name: str) -> None:
+        # Queue record for the next flush
+        with self._pending_lock:
+            self._pending.setdefault(feature_name, time.monotonic())
+
+    def _run(self) -> None:
+        # Flush on interval until stopped
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.flush()
+
+    def flush(self) -> int:
+        # Persist queued records with one sync commit
+        service = self.service
+        with service._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                self._inflight = pending
+            if not pending:
+                return 0
+            try:
+                batch = service.backend.put_many(
+                    list(pending), service.metadata, durability="sync"
+                )
+            except (OSError, StorageError) as e:
+                self._requeue(pending, e)
+                return 0
+        try:
+            service.backend.wait(batch)
+        except (OSError, StorageError) as e:
+            self._requeue(pending, e)
+            return 0
+        with self._pending_lock:
+            self._inflight = {}
+        self.flush_count += 1
+        self.flushed_records += len(pending)
+        self.last_flush_time = time.time()
+        if service.checkpointer is not None:
+            service.checkpointer.notify_write()
+        return len(pending)
+
+    def _requeue(self, pending: dict[str, float], error: Exception) -> None:
+        # Put failed records back ahead of newer ones
+        with self._pending_lock:
+            for feature_name, since in self._pending.items():
+                pending.setdefault(feature_name, since)
+            self._pending = pending
+            self._inflight = {}
+        self.error_count += 1
+        logger.error(f"Async flush failed: {error}")
+
+    def stats(self) -> dict[str, Any]:
+        # Persistence lag metrics
+        with self._pending_lock:
+            oldest = [
+                next(iter(queue.values()))
+                for queue in (self._inflight, self._pending)
+                if queue
+            ]
+            pending_writes = len(self._pending.keys() | self._inflight.keys())
+        lag_ms = (time.monotonic() - min(oldest)) * 1000 if oldest else 0.0
+        return {
+            "pending_writes": pending_writes,
+            "lag_ms": round(lag_ms, 3),
+            "flushes": self.flush_count,
+            "flushed_records": self.flushed_records,
+            "errors": self.error_count,
+            "last_flush_time": self.last_flush_time,
+        }
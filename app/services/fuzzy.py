@@ -0,0 +1,65 @@
+import difflib
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+# Similarity of one filter value to record values
+class FuzzyScorer:
+    """Score record values against a filter value, memoised per distinct value."""
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.counts = Counter(target)
+        self.bounds: dict[str, float] = {}
+        self.scores: dict[str, float] = {}
+
+    def bound(self, value: str) -> float:
+        # Upper bound of score from shared character counts, as quick_ratio
+        bound = self.bounds.get(value)
+        if bound is None:
+            length = len(value) + len(self.target)
+            if length:
+                counts = self.counts
+                shared = sum(min(n, counts[c]) for c, n in Counter(value).items())
+                bound = 2.0 * shared / length
+            else:
+                bound = 1.0
+            self.bounds[value] = bound
+        return bound
+
+    def score(self, value: str) -> float:
+        # SequenceMatcher ratio, computed once per distinct value
+        score = self.scores.get(value)
+        if score is None:
+            score = difflib.SequenceMatcher(None, value, self.target).ratio()
+            self.scores[value] = score
+        return score
+
+
+# Names whose mean similarity over present filter fields reaches threshold
+def fuzzy_matches(
+    records: Iterable[tuple[str, dict[str, Any]]],
+    filters: dict[str, Any],
+    threshold: float,
+) -> Iterator[str]:
+    scorers = {key: FuzzyScorer(str(value)) for key, value in filters.items()}
+    for feature_name, record in records:
+        present = [
+            (scorer, str(record[key]))
+            for key, scorer in scorers.items()
+            if record.get(key) is not None
+        ]
+        if not present:
+            continue
+        # Bounds never undershoot scores, so this only drops sure misses
+        bound = 0.0
+        for scorer, value in present:
+            bound += scorer.bound(value)
+        if bound / len(present) < threshold:
+            continue
+        total = 0.0
+        for scorer, value in present:
+            total += scorer.score(value)
+        if total / len(present) >= threshold:
+            yield feature_name
@@ -0,0 +1,427 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from app.utils.constants import (
+    BITMAP_INDEXED_FIELDS,
+    INDEXED_FIELDS,
+    RANGE_OPERATORS,
+    TIME_INDEXED_FIELDS,
+)
+
+# Record id bits in an ordered index key
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+# Equality filter value as the set of accepted strings, a list means any of
+def filter_keys(value: Any) -> set[str]:
+    if isinstance(value, list):
+        return {str(item) for item in value}
+    return {str(value)}
+
+
+# Integer [lower, upper) bounds of a range filter like {"gte": a, "lt": b}
+def range_bounds(value: dict[str, Any]) -> tuple[int | None, int | None]:
+    lower: int | None = None
+    upper: int | None = None
+    for op, bound in value.items():
+        if (
+            op not in RANGE_OPERATORS
+            or isinstance(bound, bool)
+            or not isinstance(bound, int | float)
+            or not math.isfinite(bound)
+        ):
+            raise ValueError(
+                f"Invalid range filter {op}: {bound!r}. "
+                f"Must be a number under one of: {RANGE_OPERATORS}"
+            )
+        if op in ("gte", "gt"):
+            low = math.ceil(bound) if op == "gte" else math.floor(bound) + 1
+            lower = low if lower is None else max(lower, low)
+        else:
+            high = math.ceil(bound) if op == "lt" else math.floor(bound) + 1
+            upper = high if upper is None else min(upper, high)
+    return lower, upper
+
+
+# Integer value for range matching, integral floats (1700000000000.0) included,
+# so scans and the ordered index agree
+def integral(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
+
+
+# Integer value inside a validated range filter
+def in_range(value: Any, bounds: dict[str, Any]) -> bool:
+    value = integral(value)
+    if value is None:
+        return False
+    for op, bound in bounds.items():
+        if op == "gte" and not value >= bound:
+            return False
+        if op == "gt" and not value > bound:
+            return False
+        if op == "lte" and not value <= bound:
+            return False
+        if op == "lt" and not value < bound:
+            return False
+    return True
+
+
+# Pack record ids into a bitset
+def to_bitmap(record_ids: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for record_id in record_ids:
+        bits[record_id >> 3] |= 1 << (record_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+# Record ids of set bits, ascending
+def iter_bitmap(bitmap: int) -> Iterator[int]:
+    bits = bin(bitmap)[:1:-1]
+    record_id = bits.find("1")
+    while record_id >= 0:
+        yield record_id
+        record_id = bits.find("1", record_id + 1)
+
+
+# Equality index for one field
+class HashIndex:
+    """Map a field's stringified value to record ids."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        # Records without the field are kept under None
+        self.buckets: dict[str | None, set[int]] = {}
+        self.keys: dict[int, str | None] = {}
+
+    def update(self, record_id: int, record: dict[str, Any]) -> None:
+        # Move record to the bucket of its current value
+        key = str(record[self.field]) if self.field in record else None
+        if record_id in self.keys:
+            old = self.keys[record_id]
+            if old == key:
+                return
+            bucket = self.buckets[old]
+            bucket.discard(record_id)
+            if not bucket:
+                del self.buckets[old]
+        self.keys[record_id] = key
+        self.buckets.setdefault(key, set()).add(record_id)
+
+    def build(self, records: list[dict[str, Any]]) -> None:
+        # Index records with ids 0..n-1
+        for record_id, record in enumerate(records):
+            self.update(record_id, record)
+
+    def lookup(self, value: Any, missing: bool = True) -> set[int]:
+        # Ids whose value equals as strings, plus records without the field
+        # unless missing is False; may return an internal set, never mutate it
+        keys = filter_keys(value)
+        matched: set[int] = set()
+        if len(keys) == 1:
+            matched = self.buckets.get(next(iter(keys)), matched)
+        else:
+            for key in keys:
+                matched = matched | self.buckets.get(key, set())
+        absent = self.buckets.get(None) if missing else None
+        return matched | absent if absent else matched
+
+    def counts(self, within: set[int] | None = None) -> dict[str | None, int]:
+        # Records per value from bucket sizes, or their overlap with within
+        if within is None:
+            return {key: len(bucket) for key, bucket in self.buckets.items()}
+        counts = {}
+        for key, bucket in self.buckets.items():
+            count = len(within.intersection(bucket))
+            if count:
+                counts[key] = count
+        return counts
+
+
+# Bitset index for one low-cardinality field
+class BitmapIndex:
+    """Map each value of a small-domain field to a bitset over record ids."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        # Records without the field are kept under None
+        self.bitmaps: dict[str | None, int] = {}
+        self.keys: dict[int, str | None] = {}
+        # Set bits per value, kept in step with the bitsets
+        self.sizes: dict[str | None, int] = {}
+
+    def update(self, record_id: int, record: dict[str, Any]) -> None:
+        # Move record's bit to its current value
+        key = str(record[self.field]) if self.field in record else None
+        if record_id in self.keys:
+            old = self.keys[record_id]
+            if old == key:
+                return
+            bitmap = self.bitmaps[old] & ~(1 << record_id)
+            if bitmap:
+                self.bitmaps[old] = bitmap
+                self.sizes[old] -= 1
+            else:
+                del self.bitmaps[old]
+                del self.sizes[old]
+        self.keys[record_id] = key
+        self.bitmaps[key] = self.bitmaps.get(key, 0) | 1 << record_id
+        self.sizes[key] = self.sizes.get(key, 0) + 1
+
+    def build(self, records: list[dict[str, Any]]) -> None:
+        # Pack each value's ids once instead of growing ints per record
+        groups: dict[str | None, list[int]] = {}
+        for record_id, record in enumerate(records):
+            key = str(record[self.field]) if self.field in record else None
+            self.keys[record_id] = key
+            groups.setdefault(key, []).append(record_id)
+        self.bitmaps = {
+            key: to_bitmap(ids, len(records)) for key, ids in groups.items()
+        }
+        self.sizes = {key: len(ids) for key, ids in groups.items()}
+
+    def lookup(self, value: Any, missing: bool = True) -> int:
+        # OR of accepted values, plus records without the field unless
+        # missing is False
+        bitmap = self.bitmaps.get(None, 0) if missing else 0
+        for key in filter_keys(value):
+            bitmap |= self.bitmaps.get(key, 0)
+        return bitmap
+
+    def counts(self, within: int | None = None) -> dict[str | None, int]:
+        # Records per value from the counters, or popcounts within a bitset
+        if within is None:
+            return dict(self.sizes)
+        counts = {}
+        for key, bitmap in self.bitmaps.items():
+            count = (bitmap & within).bit_count()
+            if count:
+                counts[key] = count
+        return counts
+
+
+# Sorted index for one integer field
+class OrderedIndex:
+    """Keep value << 32 | record id keys sorted for range scans."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.keys: list[int] = []
+        # Indexed value per record, integers only
+        self.values: dict[int, int] = {}
+
+    def value(self, record: dict[str, Any]) -> int | None:
+        # Integer value of the field, None if absent or not integral
+        return integral(record.get(self.field))
+
+    def update(self, record_id: int, record: dict[str, Any]) -> None:
+        # Move record's key to its current value
+        value = self.value(record)
+        old = self.values.get(record_id)
+        if old == value:
+            return
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old << _ID_BITS | record_id)]
+            del self.values[record_id]
+        if value is not None:
+            insort(self.keys, value << _ID_BITS | record_id)
+            self.values[record_id] = value
+
+    def build(self, records: list[dict[str, Any]]) -> None:
+        # Sort all keys once
+        keys = []
+        for record_id, record in enumerate(records):
+            value = self.value(record)
+            if value is not None:
+                self.values[record_id] = value
+                keys.append(value << _ID_BITS | record_id)
+        keys.sort()
+        self.keys = keys
+
+    def span(self, bounds: dict[str, Any]) -> tuple[int, int]:
+        # Key positions [start, end) inside the bounds, O(log n)
+        lower, upper = range_bounds(bounds)
+        keys = self.keys
+        start = 0 if lower is None else bisect_left(keys, lower << _ID_BITS)
+        end = len(keys) if upper is None else bisect_left(keys, upper << _ID_BITS)
+        return start, max(start, end)
+
+    def walk(
+        self, descending: bool = False, after: tuple[int, int] | None = None
+    ) -> Iterator[int]:
+        # Ids by (value, id), or its reverse, strictly past an after key
+        keys = self.keys
+        if descending:
+            end = len(keys)
+            if after is not None:
+                end = bisect_left(keys, after[0] << _ID_BITS | after[1])
+            for position in range(end - 1, -1, -1):
+                yield keys[position] & _ID_MASK
+        else:
+            start = 0
+            if after is not None:
+                start = bisect_right(keys, after[0] << _ID_BITS | after[1])
+            for position in range(start, len(keys)):
+                yield keys[position] & _ID_MASK
+
+    def range(self, bounds: dict[str, Any]) -> set[int]:
+        # Ids with integer values inside the bounds, O(log n + k)
+        start, end = self.span(bounds)
+        return {key & _ID_MASK for key in self.keys[start:end]}
+
+
+# Secondary indexes over the service catalog
+class CatalogIndex:
+    """Indexes keyed by dense record ids in catalog order."""
+
+    def __init__(
+        self, fields: list[str] | None = None, time_fields: list[str] | None = None
+    ) -> None:
+        self.fields = list(INDEXED_FIELDS if fields is None else fields)
+        self.time_fields = list(
+            TIME_INDEXED_FIELDS if time_fields is None else time_fields
+        )
+        self._reset(None)
+
+    def _reset(self, source: dict[str, dict[str, Any]] | None) -> None:
+        # Drop all entries
+        self._source = source
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+        # Names in string order for prefix listing
+        self.sorted_names: list[str] = []
+        self.hash_indexes = {
+            field: HashIndex(field)
+            for field in self.fields
+            if field not in BITMAP_INDEXED_FIELDS
+        }
+        self.bitmap_indexes = {
+            field: BitmapIndex(field)
+            for field in self.fields
+            if field in BITMAP_INDEXED_FIELDS
+        }
+        self.ordered_indexes = {
+            field: OrderedIndex(field) for field in self.time_fields
+        }
+
+    def is_indexed(self, field: str, value: Any) -> bool:
+        # Filter answered by an index: ranges by ordered, equality by others
+        if isinstance(value, dict):
+            return field in self.ordered_indexes
+        return field in self.hash_indexes or field in self.bitmap_indexes
+
+    def update(self, feature_name: str, record: dict[str, Any]) -> None:
+        # Index new or changed record
+        record_id = self.ids.get(feature_name)
+        if record_id is None:
+            record_id = len(self.names)
+            self.ids[feature_name] = record_id
+            self.names.append(feature_name)
+            insort(self.sorted_names, feature_name)
+        for index in self.hash_indexes.values():
+            index.update(record_id, record)
+        for bitmap_index in self.bitmap_indexes.values():
+            bitmap_index.update(record_id, record)
+        for ordered_index in self.ordered_indexes.values():
+            ordered_index.update(record_id, record)
+
+    def sync(self, metadata: dict[str, dict[str, Any]]) -> None:
+        # Rebuild when records were replaced or added around update()
+        if (
+            metadata is self._source
+            and len(metadata) == len(self.names)
+            and (not metadata or next(reversed(metadata)) == self.names[-1])
+        ):
+            return
+        self._reset(metadata)
+        self.names = list(metadata)
+        self.ids = {name: record_id for record_id, name in enumerate(self.names)}
+        self.sorted_names = sorted(self.names)
+        records = list(metadata.values())
+        for index in self.hash_indexes.values():
+            index.build(records)
+        for bitmap_index in self.bitmap_indexes.values():
+            bitmap_index.build(records)
+        for ordered_index in self.ordered_indexes.values():
+            ordered_index.build(records)
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        # Names starting with prefix in string order, O(log n + k)
+        names = self.sorted_names
+        start = end = bisect_left(names, prefix)
+        while end < len(names) and names[end].startswith(prefix):
+            end += 1
+        return names[start:end]
+
+    def evaluate(
+        self, filters: dict[str, Any], prefix: str | None = None
+    ) -> set[int] | int | None:
+        # Matching ids as a set or bitset, None if nothing indexed
+        bitmap: int | None = None
+        sets: list[set[int]] = []
+        if prefix is not None:
+            sets.append({self.ids[name] for name in self.with_prefix(prefix)})
+        for field, value in filters.items():
+            if isinstance(value, dict):
+                if field in self.ordered_indexes:
+                    sets.append(self.ordered_indexes[field].range(value))
+            elif field in self.bitmap_indexes:
+                bits = self.bitmap_indexes[field].lookup(value)
+                bitmap = bits if bitmap is None else bitmap & bits
+            elif field in self.hash_indexes:
+                sets.append(self.hash_indexes[field].lookup(value))
+        if bitmap is not None:
+            # Equal-size bitsets make hash matches one more AND
+            for ids in sets:
+                bitmap &= to_bitmap(ids, len(self.names))
+            return bitmap
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            if not result:
+                break
+            result = result & other
+        return result
+
+    def match(
+        self, filters: dict[str, Any], prefix: str | None = None
+    ) -> list[str] | None:
+        # Names passing indexed filters and prefix, None if none indexed
+        result = self.evaluate(filters, prefix)
+        if result is None:
+            return None
+        record_ids = iter_bitmap(result) if isinstance(result, int) else sorted(result)
+        names = self.names
+        return [names[record_id] for record_id in record_ids]
+
+    def count(self, filters: dict[str, Any], prefix: str | None = None) -> int | None:
+        # Matches of indexed filters without listing them
+        result = self.evaluate(filters, prefix)
+        if result is None:
+            return None
+        return result.bit_count() if isinstance(result, int) else len(result)
+
+    def counts(
+        self, field: str, within: set[int] | int | None = None
+    ) -> dict[str | None, int] | None:
+        # Records per value of an indexed field, all or within matched ids as
+        # a set or bitset; None if the field has no equality index
+        if field in self.bitmap_indexes:
+            if isinstance(within, set):
+                within = to_bitmap(within, len(self.names))
+            return self.bitmap_indexes[field].counts(within)
+        if field in self.hash_indexes:
+            if isinstance(within, int):
+                within = set(iter_bitmap(within))
+            return self.hash_indexes[field].counts(within)
+        return None
@@ -0,0 +1,31 @@
+from typing import Any
+
+from app.models.request import FeatureMetadata
+from app.utils.responses import encode_json
+
+
+# Serialized records for read responses
+class RecordJsonCache:
+    """Model-dumped JSON bytes per record, dropped when the record changes."""
+
+    def __init__(self) -> None:
+        # Name to (record dict the bytes were encoded from, bytes)
+        self.entries: dict[str, tuple[dict[str, Any], bytes]] = {}
+
+    def get(self, feature_name: str, record: dict[str, Any]) -> bytes:
+        # Cached bytes, encoded on first read; a replaced record dict (reload,
+        # resync) misses instead of serving stale bytes
+        entry = self.entries.get(feature_name)
+        if entry is not None and entry[0] is record:
+            return entry[1]
+        encoded = encode_json(FeatureMetadata(**record).model_dump())
+        self.entries[feature_name] = (record, encoded)
+        return encoded
+
+    def invalidate(self, feature_name: str) -> None:
+        # Drop bytes of a record changed in place
+        self.entries.pop(feature_name, None)
+
+    def clear(self) -> None:
+        # Drop all entries
+        self.entries.clear()
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from app.services.storage import StorageError
+
+if TYPE_CHECKING:
+    from app.services.feature_service import FeatureMetadataService
+
+logger = logging.getLogger(__name__)
+
+
+# Background catalog loader
+class BackgroundLoader:
+    """Load the catalog behind a serving service, newest records first."""
+
+    def __init__(self, service: "FeatureMetadataService", batch_size: int = 1000):
+        self.service = service
+        self.batch_size = max(batch_size, 1)
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.state = "loading"
+        self.loaded_records = 0
+        self.fetched_records = 0
+        self.skipped_records = 0
+        self.error: str | None = None
+        self.started = time.perf_counter()
+        self.duration_ms: float | None = None
+
+    def start(self) -> None:
+        # Start background thread
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="catalog-loader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Abandon a running load
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        # Block until loaded or stopped
+        return self._done.wait(timeout)
+
+    def _finish(self, state: str) -> None:
+        # Record outcome, release waiters
+        self.state = state
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        self._done.set()
+
+    def _run(self) -> None:
+        # Stream records into the service in locked batches
+        batch: list[tuple[str, Any]] = []
+        try:
+            for item in self.service.backend.iter_recent():
+                if self._stop.is_set():
+                    self._finish("stopped")
+                    return
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._insert(batch)
+                    batch = []
+            self._insert(batch)
+        except (OSError, ValueError, StorageError) as e:
+            # Same outcome as a failed blocking load
+            logger.error(f"Error loading data: {e}")
+            self.error = str(e)
+            with self.service._lock:
+                self.service.metadata.clear()
+        self._finish("ready")
+        logger.info(
+            f"Catalog loaded: {self.loaded_records} records "
+            f"in {self.duration_ms:.1f} ms"
+        )
+
+    def _insert(self, items: list[tuple[str, Any]]) -> None:
+        # Add records not already fetched on demand
+        metadata = self.service.metadata
+        with self.service._lock:
+            for name, record in items:
+                if not isinstance(record, dict):
+                    self.skipped_records += 1
+                elif name not in metadata:
+                    metadata[name] = record
+                    self.loaded_records += 1
+
+    def fetch(self, feature_name: str) -> dict[str, Any] | None:
+        # Read one record ahead of the background pass
+        service = self.service
+        if not self._done.is_set():
+            if not service.backend.supports_point_reads():
+                # No point reads, wait for the full catalog
+                self.wait()
+            else:
+                try:
+                    record = service.backend.get(feature_name)
+                except (OSError, ValueError, StorageError) as e:
+                    logger.error(f"Error fetching {feature_name}: {e}")
+                else:
+                    if not isinstance(record, dict):
+                        return None
+                    with service._lock:
+                        if feature_name not in service.metadata:
+                            service.metadata[feature_name] = record
+                            self.fetched_records += 1
+                        return service.metadata[feature_name]
+        with service._lock:
+            return service.metadata.get(feature_name)
+
+    def stats(self) -> dict[str, Any]:
+        # Load progress for health reporting
+        elapsed = self.duration_ms
+        if elapsed is None:
+            elapsed = (time.perf_counter() - self.started) * 1000
+        return {
+            "state": self.state,
+            "loaded_records": self.loaded_records,
+            "fetched_records": self.fetched_records,
+            "skipped_records": self.skipped_records,
+            "elapsed_ms": round(elapsed, 3),
+            "error": self.error,
+        }
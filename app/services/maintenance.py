@@ -0,0 +1,143 @@
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO, TypeVar
+
+from pydantic import ValidationError
+
+from app.models.request import FeatureMetadata
+from app.services.storage import (
+    FileBackend,
+    ShardedFileBackend,
+    SqliteBackend,
+    StorageBackend,
+    StorageError,
+)
+
+T = TypeVar("T")
+
+# Problems listed in a verify report
+MAX_REPORTED_ERRORS = 100
+
+
+# Streaming throughput reporter
+class Progress:
+    """Count streamed records and report throughput."""
+
+    def __init__(
+        self, label: str, stream: TextIO | None = None, interval_seconds: float = 1.0
+    ) -> None:
+        self.label = label
+        self.stream = stream
+        self.interval_seconds = interval_seconds
+        self.count = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def track(self, items: Iterable[T]) -> Iterator[T]:
+        # Count items, report on interval
+        for item in items:
+            self.count += 1
+            if self.stream is not None:
+                now = time.perf_counter()
+                if now - self._last_report >= self.interval_seconds:
+                    self._last_report = now
+                    self.report()
+            yield item
+
+    def rate(self) -> float:
+        # Records per second so far
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def report(self) -> None:
+        # Print count and throughput
+        if self.stream is None:
+            return
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"{self.label}: {self.count} records in {elapsed:.1f}s "
+            f"({self.rate():.0f} records/s)",
+            file=self.stream,
+            flush=True,
+        )
+
+
+# Schema problem for one record, None if valid
+def check_record(feature_name: str, record: Any) -> str | None:
+    if not isinstance(record, dict):
+        return "record is not an object"
+    if record.get("feature_name") != feature_name:
+        return "feature_name does not match key"
+    try:
+        FeatureMetadata(**record)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        )
+    return None
+
+
+# Check checksums and record schema while streaming
+def verify_store(backend: StorageBackend, progress: Progress) -> dict[str, Any]:
+    errors: list[str] = []
+    invalid_records = 0
+    try:
+        for feature_name, record in progress.track(backend.iter_records()):
+            problem = check_record(feature_name, record)
+            if problem is None:
+                continue
+            invalid_records += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"{feature_name}: {problem}")
+    except (OSError, ValueError, StorageError) as e:
+        errors.append(f"Unreadable store after {progress.count} records: {e}")
+    log_invalid_bytes = 0
+    if isinstance(backend, FileBackend) and backend.wal is not None:
+        log_invalid_bytes = backend.wal.invalid_bytes
+        if log_invalid_bytes:
+            errors.append(f"Log has {log_invalid_bytes} unreadable trailing bytes")
+    progress.report()
+    return {
+        "ok": not errors,
+        "records": progress.count,
+        "invalid_records": invalid_records,
+        "log_invalid_bytes": log_invalid_bytes,
+        "records_per_second": round(progress.rate(), 1),
+        "errors": errors,
+    }
+
+
+# Fold logs into a fresh snapshot
+def compact_store(backend: StorageBackend, progress: Progress) -> int:
+    if isinstance(backend, SqliteBackend):
+        progress.count = backend.compact()
+    else:
+        backend.write_records(progress.track(backend.iter_records()))
+    progress.report()
+    return progress.count
+
+
+# Recompute derived index data; single-file stores have none
+def rebuild_store(backend: StorageBackend, progress: Progress) -> int:
+    if isinstance(backend, SqliteBackend):
+        progress.count = backend.rebuild_indexes()
+    elif isinstance(backend, ShardedFileBackend):
+        # Shard membership is derived from feature_name
+        backend.write_records(progress.track(backend.iter_records()))
+    else:
+        raise ValueError(
+            "rebuild needs a sqlite or sharded store; "
+            "single-file stores have no derived indexes"
+        )
+    progress.report()
+    return progress.count
+
+
+# Stream records from one store into another
+def convert_store(
+    source: StorageBackend, target: StorageBackend, progress: Progress
+) -> int:
+    target.write_records(progress.track(source.iter_records()))
+    progress.report()
+    return progress.count
@@ -0,0 +1,78 @@
+import heapq
+from collections.abc import Iterable
+from itertools import islice
+from typing import Any
+
+from app.services.indexes import CatalogIndex
+
+
+# Comparable form of a sort value: numbers before strings
+def sort_key(value: Any) -> tuple[int, Any]:
+    if isinstance(value, int | float):
+        return (0, value)
+    return (1, str(value))
+
+
+# Sort value of a record, None when it sorts in the missing tail
+def sort_value(index: CatalogIndex, record: dict[str, Any], field: str) -> Any:
+    ordered = index.ordered_indexes.get(field)
+    if ordered is not None:
+        # Indexed fields order integer values only
+        return ordered.value(record)
+    return record.get(field)
+
+
+# First ids of a listing ordered by one field, values first, missing last
+def top_ids(
+    index: CatalogIndex,
+    metadata: dict[str, dict[str, Any]],
+    field: str,
+    descending: bool,
+    limit: int,
+    candidates: set[int] | None = None,
+    after: tuple[Any, int] | None = None,
+) -> list[int]:
+    names = index.names
+    after_value, after_id = after if after is not None else (None, -1)
+    in_tail = after is not None and after_value is None
+    result: list[int] = []
+    if not in_tail:
+        ordered = index.ordered_indexes.get(field)
+        if ordered is not None:
+            # Walk the sorted keys, stopping after limit matches
+            start = None
+            if after is not None:
+                if isinstance(after_value, bool) or not isinstance(after_value, int):
+                    raise ValueError(f"Cursor does not match the order of {field}")
+                start = (after_value, after_id)
+            walked: Iterable[int] = ordered.walk(descending, start)
+            if candidates is not None:
+                walked = (rid for rid in walked if rid in candidates)
+            result = list(islice(walked, limit))
+        else:
+            # Bounded heap over candidate values
+            ids = range(len(names)) if candidates is None else candidates
+            keyed = (
+                (sort_key(value), rid)
+                for rid in ids
+                if (value := metadata[names[rid]].get(field)) is not None
+            )
+            if after is not None:
+                bound = (sort_key(after_value), after_id)
+                if descending:
+                    keyed = (item for item in keyed if item < bound)
+                else:
+                    keyed = (item for item in keyed if item > bound)
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            result = [rid for _, rid in pick(limit, keyed)]
+    if len(result) < limit:
+        # Records without a value, in catalog order
+        ids = range(after_id + 1 if in_tail else 0, len(names))
+        tail = (
+            rid
+            for rid in ids
+            if (candidates is None or rid in candidates)
+            and sort_value(index, metadata[names[rid]], field) is None
+        )
+        result.extend(islice(tail, limit - len(result)))
+    return result
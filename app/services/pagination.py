@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from app.utils.constants import MAX_PAGE_SIZE
+
+
+# Reject page sizes outside 1..MAX_PAGE_SIZE
+def check_page_size(limit: object) -> None:
+    if isinstance(limit, bool) or not isinstance(limit, int):
+        raise ValueError(f"Invalid limit: {limit!r}")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+
+
+# Opaque cursor naming the last record of a page, and its sort value
+def encode_cursor(feature_name: str, *sort_value: Any) -> str:
+    raw = json.dumps([feature_name, *sort_value], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# Current record id to resume after, and the sort value if any; records
+# keep their id, so inserts and soft deletes never shift a cursor
+def cursor_position(cursor: object, ids: dict[str, int]) -> tuple[int, list[Any]]:
+    try:
+        if not isinstance(cursor, str):
+            raise ValueError
+        padded = cursor + "=" * (-len(cursor) % 4)
+        feature_name, *sort_value = json.loads(base64.urlsafe_b64decode(padded))
+        record_id = ids.get(feature_name)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if record_id is None:
+        raise ValueError("Cursor no longer valid, restart the listing")
+    return record_id, sort_value
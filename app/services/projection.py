@@ -0,0 +1,25 @@
+from typing import Any
+
+from app.models.request import FeatureMetadata
+
+
+# Requested field names, validated against the model; feature_name is always
+# kept so listed records stay identifiable
+def check_fields(fields: object) -> list[str] | None:
+    if fields is None:
+        return None
+    if (
+        not isinstance(fields, list)
+        or not fields
+        or not all(isinstance(field, str) for field in fields)
+    ):
+        raise ValueError(f"Invalid fields: {fields!r}")
+    unknown = [field for field in fields if field not in FeatureMetadata.model_fields]
+    if unknown:
+        raise ValueError(f"Invalid fields {unknown}. Must be FeatureMetadata fields")
+    return list(dict.fromkeys(["feature_name", *fields]))
+
+
+# Record reduced to the requested fields, unset ones as None like the model
+def project(record: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    return dict(zip(fields, map(record.get, fields), strict=True))
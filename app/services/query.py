@@ -0,0 +1,286 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from app.services.indexes import (
+    CatalogIndex,
+    filter_keys,
+    in_range,
+    iter_bitmap,
+    range_bounds,
+)
+from app.utils.constants import FILTER_OPERATORS, MAX_FILTER_DEPTH, RANGE_OPERATORS
+
+Record = dict[str, Any]
+Test = Callable[[Record], bool]
+
+
+# Candidate ids read from indexes
+class Access:
+    """Index access path, its estimated rows and the checks left on candidates."""
+
+    def __init__(
+        self,
+        label: str,
+        estimate: int,
+        fetch: Callable[[], set[int]],
+        residual: Test | None = None,
+    ) -> None:
+        self.label = label
+        self.estimate = estimate
+        self.fetch = fetch
+        self.residual = residual
+
+
+# Node of a compiled filter expression
+class Expression(ABC):
+    """Predicate closure plus the index access paths that can answer it."""
+
+    def __init__(self, test: Test) -> None:
+        self.test = test
+
+    @abstractmethod
+    def access(self, index: CatalogIndex) -> Access | None:
+        # Cheapest index access path, None to scan
+        pass
+
+    @abstractmethod
+    def describe(self) -> str:
+        # Readable form for explain output
+        pass
+
+
+# Closure true when every test holds
+def _all(tests: list[Test]) -> Test:
+    def test(record: Record) -> bool:
+        for child_test in tests:
+            if not child_test(record):
+                return False
+        return True
+
+    return test
+
+
+# Closure true when any test holds
+def _any(tests: list[Test]) -> Test:
+    def test(record: Record) -> bool:
+        for child_test in tests:
+            if child_test(record):
+                return True
+        return False
+
+    return test
+
+
+# Build the closure for one leaf operator
+def _leaf_test(field: str, op: str, operand: Any) -> Test:
+    if op == "eq":
+        key = str(operand)
+        return lambda record: field in record and str(record[field]) == key
+    if op == "in":
+        keys = filter_keys(operand)
+        return lambda record: field in record and str(record[field]) in keys
+    if op == "prefix":
+        return lambda record: field in record and str(record[field]).startswith(operand)
+    if op == "contains":
+        return lambda record: field in record and operand in str(record[field])
+    return lambda record: in_range(record.get(field), operand)
+
+
+# Single field comparison
+class Compare(Expression):
+    """Field compared with one operator; ranges carry all their bounds."""
+
+    def __init__(self, field: str, op: str, operand: Any) -> None:
+        super().__init__(_leaf_test(field, op, operand))
+        self.field = field
+        self.op = op
+        self.operand = operand
+
+    def access(self, index: CatalogIndex) -> Access | None:
+        field, op, operand = self.field, self.op, self.operand
+        label = f"{op} index on {field}"
+        if op in ("eq", "in") and field in index.bitmap_indexes:
+            bits = index.bitmap_indexes[field].lookup(operand, missing=False)
+            return Access(label, bits.bit_count(), lambda: set(iter_bitmap(bits)))
+        if op in ("eq", "in") and field in index.hash_indexes:
+            ids = index.hash_indexes[field].lookup(operand, missing=False)
+            return Access(label, len(ids), lambda: ids)
+        if op == "range" and field in index.ordered_indexes:
+            ordered = index.ordered_indexes[field]
+            start, end = ordered.span(operand)
+            return Access(label, end - start, lambda: ordered.range(operand))
+        if op == "prefix" and field == "feature_name":
+            names = index.with_prefix(operand)
+            return Access(
+                label, len(names), lambda: {index.ids[name] for name in names}
+            )
+        return None
+
+    def describe(self) -> str:
+        if self.op == "range":
+            bounds = " ".join(f"{op} {value!r}" for op, value in self.operand.items())
+            return f"{self.field} {bounds}"
+        return f"{self.field} {self.op} {self.operand!r}"
+
+
+# Conjunction
+class And(Expression):
+    """All children hold; planned from the most selective indexed child."""
+
+    def __init__(self, children: list[Expression]) -> None:
+        super().__init__(_all([child.test for child in children]))
+        self.children = children
+
+    def access(self, index: CatalogIndex) -> Access | None:
+        best: Access | None = None
+        chosen = -1
+        for position, child in enumerate(self.children):
+            path = child.access(index)
+            if path is not None and (best is None or path.estimate < best.estimate):
+                best, chosen = path, position
+        if best is None:
+            return None
+        # Remaining children, and the chosen path's own leftovers
+        rest = [c.test for i, c in enumerate(self.children) if i != chosen]
+        if best.residual is not None:
+            rest.append(best.residual)
+        residual = _all(rest) if rest else None
+        return Access(best.label, best.estimate, best.fetch, residual)
+
+    def describe(self) -> str:
+        return "(" + " AND ".join(child.describe() for child in self.children) + ")"
+
+
+# Disjunction
+class Or(Expression):
+    """Any child holds; indexed only when every child is."""
+
+    def __init__(self, children: list[Expression]) -> None:
+        super().__init__(_any([child.test for child in children]))
+        self.children = children
+
+    def access(self, index: CatalogIndex) -> Access | None:
+        paths = []
+        for child in self.children:
+            path = child.access(index)
+            if path is None:
+                return None
+            paths.append(path)
+
+        def fetch() -> set[int]:
+            ids: set[int] = set()
+            for path in paths:
+                ids |= path.fetch()
+            return ids
+
+        # Branch leftovers only hold for their own candidates, recheck all
+        exact = all(path.residual is None for path in paths)
+        return Access(
+            "union of " + ", ".join(path.label for path in paths),
+            min(sum(path.estimate for path in paths), len(index.names)),
+            fetch,
+            None if exact else self.test,
+        )
+
+    def describe(self) -> str:
+        return "(" + " OR ".join(child.describe() for child in self.children) + ")"
+
+
+# Negation
+class Not(Expression):
+    """Child does not hold; always scanned."""
+
+    def __init__(self, child: Expression) -> None:
+        child_test = child.test
+        super().__init__(lambda record: not child_test(record))
+        self.child = child
+
+    def access(self, index: CatalogIndex) -> Access | None:
+        return None
+
+    def describe(self) -> str:
+        return f"NOT {self.child.describe()}"
+
+
+# Compile a JSON filter expression into predicate closures
+def compile_filter(expression: Any, depth: int = 0) -> Expression:
+    if depth > MAX_FILTER_DEPTH:
+        raise ValueError(f"Filter nested deeper than {MAX_FILTER_DEPTH} levels")
+    if not isinstance(expression, dict) or not expression:
+        raise ValueError(f"Invalid filter expression: {expression!r}")
+    for combinator in ("and", "or", "not"):
+        if combinator not in expression:
+            continue
+        if len(expression) != 1:
+            raise ValueError(f"'{combinator}' must be the only key of its object")
+        operand = expression[combinator]
+        if combinator == "not":
+            return Not(compile_filter(operand, depth + 1))
+        if not isinstance(operand, list) or not operand:
+            raise ValueError(f"'{combinator}' needs a non-empty list of filters")
+        children = [compile_filter(child, depth + 1) for child in operand]
+        return And(children) if combinator == "and" else Or(children)
+    field = expression.get("field")
+    if not isinstance(field, str):
+        raise ValueError(f"Filter needs a field name: {expression!r}")
+    ops = {op: value for op, value in expression.items() if op != "field"}
+    unknown = [op for op in ops if op not in FILTER_OPERATORS]
+    if unknown or not ops:
+        raise ValueError(
+            f"Invalid filter operators {unknown} for {field}. "
+            f"Must be one of: {FILTER_OPERATORS}"
+        )
+    parts: list[Expression] = []
+    for op, value in ops.items():
+        if op in RANGE_OPERATORS:
+            continue
+        if op == "in" and not isinstance(value, list):
+            raise ValueError(f"'in' on {field} needs a list")
+        if op in ("prefix", "contains") and not isinstance(value, str):
+            raise ValueError(f"'{op}' on {field} needs a string")
+        parts.append(Compare(field, op, value))
+    bounds = {op: value for op, value in ops.items() if op in RANGE_OPERATORS}
+    if bounds:
+        range_bounds(bounds)
+        parts.append(Compare(field, "range", bounds))
+    return parts[0] if len(parts) == 1 else And(parts)
+
+
+# Access path choice and execution for one expression
+class QueryPlan:
+    """Run an expression from its cheapest index path, or by a full scan."""
+
+    def __init__(self, expression: Expression, index: CatalogIndex) -> None:
+        self.expression = expression
+        self.index = index
+        self.access = expression.access(index)
+        self.candidates = 0
+
+    def execute(self, metadata: dict[str, Record]) -> list[str]:
+        # Matching names in catalog order
+        if self.access is None:
+            names: list[str] = list(metadata)
+            test: Test | None = self.expression.test
+        else:
+            index_names = self.index.names
+            names = [index_names[i] for i in sorted(self.access.fetch())]
+            test = self.access.residual
+        self.candidates = len(names)
+        if test is None:
+            return names
+        return [name for name in names if test(metadata[name])]
+
+    def explain(self, rows: int) -> dict[str, Any]:
+        # Chosen plan with estimated and actual rows
+        access = self.access
+        return {
+            "filter": self.expression.describe(),
+            "access": "full scan" if access is None else access.label,
+            "estimated_rows": (
+                len(self.index.names) if access is None else (access.estimate)
+            ),
+            "candidate_rows": self.candidates,
+            "residual": access is None or access.residual is not None,
+            "actual_rows": rows,
+        }
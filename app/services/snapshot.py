@@ -0,0 +1,431 @@
+import gc
+import json
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import repeat
+from pathlib import Path
+from typing import IO, Any
+
+# Binary snapshot identification
+SNAPSHOT_MAGIC = b"FMSNAP\r\n"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FORMATS = ["json", "binary"]
+
+# Read size for streaming JSON parser
+_JSON_CHUNK_SIZE = 1 << 20
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Top-level record end in json.dump(indent=2) output
+_JSON_RECORD_END = "\n  },"
+
+# magic, version, flags, section count
+_HEADER = struct.Struct("<8sHHI")
+# crc32, payload length
+_SECTION = struct.Struct("<IQ")
+_SECTION_COUNT = 6
+
+
+# Unreadable binary snapshot
+class SnapshotFormatError(ValueError):
+    """Corrupt or unsupported snapshot file."""
+
+    pass
+
+
+# Little-endian uint32 array bytes
+def _pack_indexes(values: array) -> bytes:
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    return values.tobytes()
+
+
+# Uint32 array from little-endian bytes
+def _unpack_indexes(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+# Compact JSON section bytes
+def _dump_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+# Encode records as binary snapshot
+def encode_snapshot(metadata: dict[str, dict[str, Any]]) -> bytes:
+    strings: dict[str, int] = {}
+    others: list[Any] = []
+    scalars: dict[tuple[type, Any], int] = {}
+    shapes: dict[tuple[str, ...], int] = {}
+    columns: list[list[int]] = []
+    counts: list[int] = []
+    names = array("I")
+    shape_ids = array("I")
+    string_slot = strings.setdefault
+
+    # Non-string values get negative slots until string count is known
+    def other_slot(value: Any) -> int:
+        if isinstance(value, dict | list):
+            others.append(value)
+            return -len(others)
+        key = (type(value), value)
+        slot = scalars.get(key)
+        if slot is None:
+            others.append(value)
+            slot = scalars[key] = -len(others)
+        return slot
+
+    for name, record in metadata.items():
+        keys = tuple(record)
+        shape_id = shapes.setdefault(keys, len(shapes))
+        if shape_id == len(columns):
+            columns.append([])
+            counts.append(0)
+        counts[shape_id] += 1
+        names.append(string_slot(name, len(strings)))
+        shape_ids.append(shape_id)
+        cells = columns[shape_id]
+        for value in record.values():
+            if isinstance(value, str):
+                cells.append(string_slot(value, len(strings)))
+            else:
+                cells.append(other_slot(value))
+
+    base = len(strings) - 1
+    values = array("I")
+    for cells in columns:
+        values.extend(slot if slot >= 0 else base - slot for slot in cells)
+    layout = [[list(keys), count] for keys, count in zip(shapes, counts, strict=True)]
+    sections = [
+        _dump_json(list(strings)),
+        _dump_json(others),
+        _dump_json(layout),
+        _pack_indexes(names),
+        _pack_indexes(shape_ids),
+        _pack_indexes(values),
+    ]
+    out = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(sections))]
+    for payload in sections:
+        out.append(_SECTION.pack(zlib.crc32(payload), len(payload)))
+        out.append(payload)
+    return b"".join(out)
+
+
+# Split and verify snapshot sections
+def _read_sections(data: bytes) -> list[bytes]:
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise SnapshotFormatError("Snapshot header truncated")
+    magic, version, _flags, count = _HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotFormatError("Not a binary snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotFormatError(f"Unsupported snapshot version {version}")
+    if count != _SECTION_COUNT:
+        raise SnapshotFormatError(f"Unexpected section count {count}")
+    offset = _HEADER.size
+    sections: list[bytes] = []
+    for _ in range(count):
+        if offset + _SECTION.size > len(view):
+            raise SnapshotFormatError("Snapshot section truncated")
+        crc, length = _SECTION.unpack_from(view, offset)
+        offset += _SECTION.size
+        payload = view[offset : offset + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            raise SnapshotFormatError("Snapshot checksum mismatch")
+        sections.append(payload.tobytes())
+        offset += length
+    return sections
+
+
+# Decode binary snapshot into records
+def decode_snapshot(data: bytes) -> dict[str, dict[str, Any]]:
+    sections = _read_sections(data)
+    table: list[Any] = json.loads(sections[0])
+    table.extend(json.loads(sections[1]))
+    layout = json.loads(sections[2])
+    names = _unpack_indexes(sections[3])
+    shape_ids = _unpack_indexes(sections[4])
+    values = _unpack_indexes(sections[5])
+    lookup = table.__getitem__
+
+    # One lazy record stream per shape, rows built in C
+    groups: list[Iterator[dict[str, Any]]] = []
+    offset = 0
+    for keys, count in layout:
+        if not keys:
+            groups.append(iter(dict, None))
+            continue
+        end = offset + len(keys) * count
+        cells = map(lookup, values[offset:end])
+        groups.append(
+            map(dict, map(zip, repeat(keys), zip(*[cells] * len(keys), strict=False)))
+        )
+        offset = end
+    if offset != len(values) or len(names) != len(shape_ids):
+        raise SnapshotFormatError("Snapshot record table corrupt")
+    # Every record is long-lived, skip collector passes while building
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        records = map(next, map(groups.__getitem__, shape_ids))
+        metadata = dict(zip(map(lookup, names), records, strict=True))
+    except (IndexError, TypeError, ValueError) as e:
+        raise SnapshotFormatError("Snapshot record table corrupt") from e
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if len(metadata) != len(names):
+        raise SnapshotFormatError("Snapshot record table corrupt")
+    return metadata
+
+
+# Check leading bytes for binary magic
+def is_binary_snapshot(head: bytes) -> bool:
+    return head[: len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC
+
+
+# Load snapshot file, detecting format
+def read_snapshot(path: str | Path) -> dict[str, dict[str, Any]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if is_binary_snapshot(data):
+        return decode_snapshot(data)
+    loaded = json.loads(data)
+    return loaded if isinstance(loaded, dict) else {}
+
+
+# Reject unknown snapshot format
+def check_snapshot_format(snapshot_format: str) -> None:
+    if snapshot_format not in SNAPSHOT_FORMATS:
+        raise ValueError(
+            f"Invalid snapshot format {snapshot_format}. "
+            f"Must be one of: {SNAPSHOT_FORMATS}"
+        )
+
+
+# Write snapshot via temp file and rename
+def write_snapshot(
+    path: str | Path,
+    metadata: dict[str, dict[str, Any]],
+    snapshot_format: str = "json",
+    fsync: bool = True,
+) -> int:
+    check_snapshot_format(snapshot_format)
+    path = Path(path)
+    tmp_file = path.with_name(f"{path.name}.tmp")
+    if snapshot_format == "binary":
+        with open(tmp_file, "wb") as fb:
+            fb.write(encode_snapshot(metadata))
+            fb.flush()
+            if fsync:
+                os.fsync(fb.fileno())
+            size = fb.tell()
+    else:
+        with open(tmp_file, "w") as f:
+            json.dump(metadata, f, indent=2)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+            size = f.tell()
+    os.replace(tmp_file, path)
+    return size
+
+
+# Stream top-level records from JSON snapshot
+def iter_json_snapshot(
+    path: str | Path, chunk_size: int = _JSON_CHUNK_SIZE
+) -> Iterator[tuple[str, Any]]:
+    decoder = json.JSONDecoder()
+    skip_ws = _JSON_WHITESPACE.match
+    # One string per field name, as json.load shares them
+    field_names: dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            # Append next chunk, drop consumed prefix
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip() -> str:
+            # Next non-space char, "" at end
+            nonlocal pos
+            while True:
+                pos = skip_ws(buf, pos).end()  # type: ignore[union-attr]
+                if pos < len(buf) or not fill():
+                    return buf[pos : pos + 1]
+
+        def decode() -> Any:
+            # Decode one complete value at pos
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if fill():
+                        continue
+                    raise
+                # Value may continue past buffer end
+                if end == len(buf) and fill():
+                    continue
+                pos = end
+                return value
+
+        if skip() != "{":
+            # Non-object snapshot holds no records
+            json.loads(buf[pos:] + f.read())
+            return
+        pos += 1
+        if skip() == "}":
+            pos += 1
+        else:
+            batched = True
+            while True:
+                if batched:
+                    # Whole records up to the last record end, parsed in C
+                    cut = buf.rfind(_JSON_RECORD_END, pos)
+                    if cut < 0 and len(buf) - pos < chunk_size and fill():
+                        cut = buf.rfind(_JSON_RECORD_END, pos)
+                    if cut >= 0:
+                        try:
+                            batch = json.loads("{" + buf[pos : cut + 4] + "}")
+                        except json.JSONDecodeError:
+                            # Other layout, a wrong cut never parses
+                            batched = False
+                        else:
+                            yield from batch.items()
+                            pos = cut + len(_JSON_RECORD_END)
+                            if skip() != '"':
+                                raise json.JSONDecodeError(
+                                    "Expecting property name", buf, pos
+                                )
+                            continue
+                    elif not eof:
+                        batched = False
+                key = decode()
+                if not isinstance(key, str) or skip() != ":":
+                    raise json.JSONDecodeError("Expecting property", buf, pos)
+                pos += 1
+                skip()
+                record = decode()
+                if isinstance(record, dict):
+                    record = dict(
+                        zip(
+                            map(field_names.setdefault, record, record),
+                            record.values(),
+                            strict=True,
+                        )
+                    )
+                yield key, record
+                sep = skip()
+                pos += 1
+                if sep == "}":
+                    break
+                if sep != "," or skip() != '"':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        if skip():
+            raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+# Stream records from snapshot, detecting format
+def iter_snapshot(path: str | Path) -> Iterator[tuple[str, Any]]:
+    with open(path, "rb") as f:
+        head = f.read(len(SNAPSHOT_MAGIC))
+    if is_binary_snapshot(head):
+        # Sections are checksummed whole, decode in one pass
+        yield from read_snapshot(path).items()
+    else:
+        yield from iter_json_snapshot(path)
+
+
+# Incremental JSON snapshot writer
+class JsonSnapshotWriter:
+    """Write records one at a time, matching json.dump(indent=2)."""
+
+    def __init__(self, path: str | Path, fsync: bool = True) -> None:
+        self.path = Path(path)
+        self.tmp_file = self.path.with_name(f"{self.path.name}.tmp")
+        self.fsync = fsync
+        self.count = 0
+        self._f: IO[str] | None = open(self.tmp_file, "w")
+        self._f.write("{")
+
+    def _file(self) -> IO[str]:
+        # Open handle, reopened for appending after suspend
+        if self._f is None:
+            self._f = open(self.tmp_file, "a")
+        return self._f
+
+    def write(self, feature_name: str, record: Any) -> None:
+        # Append one record
+        entry = json.dumps({feature_name: record}, indent=2)
+        self._file().write(("," if self.count else "") + entry[1:-2])
+        self.count += 1
+
+    def suspend(self) -> None:
+        # Release the file handle, the next write reopens it
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def close(self) -> int:
+        # Finish file and rename into place
+        f = self._file()
+        f.write("\n}" if self.count else "}")
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+        size = f.tell()
+        f.close()
+        os.replace(self.tmp_file, self.path)
+        return size
+
+    def abort(self) -> None:
+        # Drop partial file
+        self.suspend()
+        self.tmp_file.unlink(missing_ok=True)
+
+    def __enter__(self) -> "JsonSnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+# Write streamed records in given format, return count
+def write_snapshot_records(
+    path: str | Path,
+    records: Iterable[tuple[str, dict[str, Any]]],
+    snapshot_format: str = "json",
+) -> int:
+    check_snapshot_format(snapshot_format)
+    if snapshot_format == "binary":
+        # Binary encoder needs the whole record table
+        metadata = dict(records)
+        write_snapshot(path, metadata, "binary")
+        return len(metadata)
+    writer = JsonSnapshotWriter(path)
+    with writer:
+        for feature_name, record in records:
+            writer.write(feature_name, record)
+    return writer.count
@@ -0,0 +1,846 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from app.services.snapshot import (
+    JsonSnapshotWriter,
+    check_snapshot_format,
+    iter_snapshot,
+    write_snapshot,
+    write_snapshot_records,
+)
+from app.services.wal import LogBatch, WriteAheadLog
+from app.utils.config import env_flag, env_int, env_str
+
+# Backend names
+STORAGE_BACKENDS = ["json", "sqlite", "sharded"]
+
+
+# Storage layer failure
+class StorageError(Exception):
+    """Storage backend failure."""
+
+    pass
+
+
+# Stream snapshot one record at a time, skip non-object records
+def load_records(path: str | Path) -> dict[str, dict[str, Any]]:
+    metadata: dict[str, dict[str, Any]] = {}
+    skipped = 0
+    for name, record in iter_snapshot(path):
+        if isinstance(record, dict):
+            metadata[name] = record
+        else:
+            skipped += 1
+    if skipped:
+        print(f"Skipped {skipped} invalid records in {path}")
+    return metadata
+
+
+# Storage backend interface
+class StorageBackend(ABC):
+    """Persistence layer for feature metadata records."""
+
+    @abstractmethod
+    def load(self) -> dict[str, dict[str, Any]]:
+        # Load all records
+        pass
+
+    @abstractmethod
+    def save_all(self, metadata: dict[str, dict[str, Any]]) -> None:
+        # Replace stored records
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        feature_name: str,
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Persist one changed record, fsync only for sync
+        pass
+
+    def put_many(
+        self,
+        feature_names: list[str],
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Persist several changed records, return last batch
+        batch = None
+        for feature_name in feature_names:
+            if feature_name in metadata:
+                batch = self.put(feature_name, metadata, durability) or batch
+        return batch
+
+    def wait(self, batch: LogBatch | None) -> None:
+        # Block until batch durable
+        return None
+
+    @abstractmethod
+    def checkpoint(
+        self, lock: AbstractContextManager[Any], metadata: dict[str, dict[str, Any]]
+    ) -> int:
+        # Persist point-in-time view, return bytes written
+        pass
+
+    def iter_records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        # Stream stored records in load order
+        yield from self.load().items()
+
+    def iter_recent(self) -> Iterator[tuple[str, Any]]:
+        # Stream records for a background load, newest first where known;
+        # once exhausted the backend is ready for writes, as after load()
+        yield from self.load().items()
+
+    def supports_point_reads(self) -> bool:
+        # Whether get() reads single records without a full load
+        return False
+
+    def get(self, feature_name: str) -> Any:
+        # Read one stored record, None if missing or without point reads
+        return None
+
+    def write_records(self, records: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        # Replace stored records from stream, return count
+        metadata = dict(records)
+        self.save_all(metadata)
+        return len(metadata)
+
+    def close(self) -> None:
+        # Release backend resources
+        return None
+
+
+# JSON snapshot plus optional log
+class FileBackend(StorageBackend):
+    """JSON snapshot file with optional write-ahead log."""
+
+    def __init__(
+        self,
+        data_file: str | Path,
+        wal_enabled: bool = False,
+        compact_threshold: int = 1000,
+        group_commit: bool = False,
+        group_commit_window_ms: int = 0,
+        snapshot_format: str = "json",
+    ) -> None:
+        check_snapshot_format(snapshot_format)
+        self.data_file = Path(data_file)
+        self.snapshot_format = snapshot_format
+        # Binary snapshots live beside the JSON file
+        self.snapshot_file = (
+            self.data_file.with_suffix(".snap")
+            if snapshot_format == "binary"
+            else self.data_file
+        )
+        self.compact_threshold = compact_threshold
+        self.group_commit = group_commit
+        self._snapshot_lock = threading.Lock()
+        self.wal = (
+            WriteAheadLog(f"{self.data_file}.wal", group_commit_window_ms)
+            if wal_enabled
+            else None
+        )
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        # Load snapshot, import JSON if none, replay log
+        metadata: dict[str, dict[str, Any]] = {}
+        for source in (self.snapshot_file, self.data_file):
+            if source.exists():
+                metadata = load_records(source)
+                break
+        if self.wal is not None:
+            try:
+                for record in self.wal.replay():
+                    self.apply_log_record(metadata, record)
+            except OSError as e:
+                print(f"Error replaying log: {e}")
+        return metadata
+
+    @staticmethod
+    def apply_log_record(
+        metadata: dict[str, dict[str, Any]], record: dict[str, Any]
+    ) -> None:
+        # Apply replayed mutation
+        key = record.get("key")
+        if not isinstance(key, str):
+            return
+        if record.get("op") == "delete":
+            metadata.pop(key, None)
+        elif isinstance(record.get("value"), dict):
+            metadata[key] = record["value"]
+
+    def iter_records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        # Stream snapshot with log applied, holding only the log in memory
+        overlay: dict[str, dict[str, Any] | None] = {}
+        moved: set[str] = set()
+        if self.wal is not None:
+            for record in self.wal.scan():
+                key = record.get("key")
+                if not isinstance(key, str):
+                    continue
+                if record.get("op") == "delete":
+                    overlay[key] = None
+                    moved.add(key)
+                elif isinstance(record.get("value"), dict):
+                    overlay[key] = record["value"]
+        for source in (self.snapshot_file, self.data_file):
+            if source.exists():
+                for name, record in iter_snapshot(source):
+                    if name in moved:
+                        continue
+                    logged = overlay.pop(name, None)
+                    yield name, record if logged is None else logged
+                break
+        for name, value in overlay.items():
+            if value is not None:
+                yield name, value
+
+    def iter_recent(self) -> Iterator[tuple[str, Any]]:
+        # Logged changes newest first, then the snapshot
+        logged: dict[str, dict[str, Any] | None] = {}
+        if self.wal is not None:
+            try:
+                for record in self.wal.replay():
+                    key = record.get("key")
+                    if not isinstance(key, str):
+                        continue
+                    if record.get("op") == "delete":
+                        logged.pop(key, None)
+                        logged[key] = None
+                    elif isinstance(record.get("value"), dict):
+                        logged.pop(key, None)
+                        logged[key] = record["value"]
+            except OSError as e:
+                print(f"Error replaying log: {e}")
+        for name in reversed(logged):
+            value = logged[name]
+            if value is not None:
+                yield name, value
+        for source in (self.snapshot_file, self.data_file):
+            if source.exists():
+                for name, record in iter_snapshot(source):
+                    if name not in logged:
+                        yield name, record
+                break
+
+    def write_records(self, records: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        # Stream records into new snapshot, truncate log
+        with self._snapshot_lock:
+            count = write_snapshot_records(
+                self.snapshot_file, records, self.snapshot_format
+            )
+            if self.wal is not None:
+                self.wal.reset()
+        return count
+
+    def write_snapshot(
+        self, metadata: dict[str, dict[str, Any]], fsync: bool = True
+    ) -> int:
+        # Write snapshot in configured format
+        return write_snapshot(
+            self.snapshot_file, metadata, self.snapshot_format, fsync=fsync
+        )
+
+    def _write_all(
+        self, metadata: dict[str, dict[str, Any]], fsync: bool = True
+    ) -> None:
+        # Save snapshot atomically, truncate log
+        with self._snapshot_lock:
+            self.write_snapshot(metadata, fsync=fsync)
+            if self.wal is not None:
+                self.wal.reset()
+
+    def save_all(self, metadata: dict[str, dict[str, Any]]) -> None:
+        # Replace stored records with a synced snapshot
+        self._write_all(metadata)
+
+    def checkpoint(
+        self, lock: AbstractContextManager[Any], metadata: dict[str, dict[str, Any]]
+    ) -> int:
+        # Copy view under lock, write it outside
+        with lock:
+            self._snapshot_lock.acquire()
+            try:
+                view = {name: dict(record) for name, record in metadata.items()}
+                if self.wal is not None:
+                    self.wal.rotate()
+            except BaseException:
+                self._snapshot_lock.release()
+                raise
+        try:
+            size = self.write_snapshot(view)
+            if self.wal is not None:
+                self.wal.drop_rotated()
+            return size
+        finally:
+            self._snapshot_lock.release()
+
+    def put(
+        self,
+        feature_name: str,
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Append log record, compact log
+        if self.wal is None:
+            self._write_all(metadata, fsync=durability == "sync")
+            return None
+        record = {"op": "put", "key": feature_name, "value": metadata[feature_name]}
+        batch = self.wal.submit(record, sync=durability == "sync")
+        if not self.group_commit:
+            self.wal.wait(batch)
+        if self.compact_threshold and self.wal.record_count >= self.compact_threshold:
+            self.save_all(metadata)
+        return batch
+
+    def put_many(
+        self,
+        feature_names: list[str],
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # One snapshot rewrite or one log commit for all records
+        if self.wal is None:
+            self._write_all(metadata, fsync=durability == "sync")
+            return None
+        batch = None
+        for feature_name in feature_names:
+            if feature_name in metadata:
+                record = {
+                    "op": "put",
+                    "key": feature_name,
+                    "value": metadata[feature_name],
+                }
+                batch = self.wal.submit(record, sync=durability == "sync")
+        if self.compact_threshold and self.wal.record_count >= self.compact_threshold:
+            self.save_all(metadata)
+        return batch
+
+    def wait(self, batch: LogBatch | None) -> None:
+        # Block until batch durable
+        if self.wal is not None and batch is not None:
+            self.wal.wait(batch)
+
+    def close(self) -> None:
+        # Close log handle
+        if self.wal is not None:
+            self.wal.close()
+
+
+# One snapshot file per namespace
+class ShardedFileBackend(StorageBackend):
+    """Per-category snapshot files rewritten independently."""
+
+    # Shard files kept open at once when streaming, least recently used suspended
+    MAX_OPEN_SHARDS = 64
+
+    def __init__(
+        self,
+        data_file: str | Path,
+        snapshot_format: str = "json",
+        load_workers: int = 0,
+    ) -> None:
+        check_snapshot_format(snapshot_format)
+        self.data_file = Path(data_file)
+        self.shard_dir = self.data_file.with_suffix(".shards")
+        self.snapshot_format = snapshot_format
+        self.suffix = ".snap" if snapshot_format == "binary" else ".json"
+        self.load_workers = load_workers
+        # Ordered record names per category
+        self._members: dict[str, dict[str, None]] = {}
+
+    @staticmethod
+    def shard_key(feature_name: str) -> str:
+        # Category part of category:name:version
+        return feature_name.split(":", 1)[0]
+
+    def shard_path(self, category: str) -> Path:
+        # Filesystem-safe shard file for category
+        stem = quote(category, safe="-_.") if category else "%"
+        return self.shard_dir / f"{stem}{self.suffix}"
+
+    def _shard_files(self) -> list[Path]:
+        # Existing shard files, sorted
+        if not self.shard_dir.is_dir():
+            return []
+        return sorted(self.shard_dir.glob(f"*{self.suffix}"))
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        # Read shards in parallel, import legacy file if none
+        files = self._shard_files()
+        metadata: dict[str, dict[str, Any]] = {}
+        if not files:
+            if self.data_file.exists():
+                metadata = load_records(self.data_file)
+            self._members = {}
+            for name in metadata:
+                self._members.setdefault(self.shard_key(name), {})[name] = None
+            return metadata
+        workers = self.load_workers or None
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(load_records, files))
+        self._members = {}
+        for shard in shards:
+            metadata.update(shard)
+            for name in shard:
+                self._members.setdefault(self.shard_key(name), {})[name] = None
+        return metadata
+
+    def _write_shard(
+        self, category: str, metadata: dict[str, dict[str, Any]], fsync: bool = True
+    ) -> int:
+        # Rewrite one category file, drop it when empty
+        members = self._members.get(category, {})
+        records = {name: metadata[name] for name in members if name in metadata}
+        path = self.shard_path(category)
+        if not records:
+            self._members.pop(category, None)
+            path.unlink(missing_ok=True)
+            return 0
+        self._members[category] = dict.fromkeys(records)
+        return write_snapshot(path, records, self.snapshot_format, fsync=fsync)
+
+    def save_all(self, metadata: dict[str, dict[str, Any]]) -> None:
+        # Rewrite every shard, remove stale ones
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self._members = {}
+        for name in metadata:
+            self._members.setdefault(self.shard_key(name), {})[name] = None
+        keep = set()
+        for category in list(self._members):
+            self._write_shard(category, metadata)
+            keep.add(self.shard_path(category))
+        for path in self._shard_files():
+            if path not in keep:
+                path.unlink()
+
+    def put(
+        self,
+        feature_name: str,
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Rewrite only the record's shard
+        return self.put_many([feature_name], metadata, durability)
+
+    def put_many(
+        self,
+        feature_names: list[str],
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Rewrite each touched shard once
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        touched: dict[str, None] = {}
+        for feature_name in feature_names:
+            category = self.shard_key(feature_name)
+            self._members.setdefault(category, {})[feature_name] = None
+            touched[category] = None
+        for category in touched:
+            self._write_shard(category, metadata, fsync=durability == "sync")
+        return None
+
+    def iter_records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        # Stream shard by shard, or legacy file if none
+        files = self._shard_files()
+        if not files and self.data_file.exists():
+            files = [self.data_file]
+        for path in files:
+            yield from iter_snapshot(path)
+
+    def iter_recent(self) -> Iterator[tuple[str, Any]]:
+        # Most recently written shard first, tracking membership
+        files = self._shard_files()
+        if not files and self.data_file.exists():
+            files = [self.data_file]
+        files.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        self._members = {}
+        for path in files:
+            for name, record in iter_snapshot(path):
+                self._members.setdefault(self.shard_key(name), {})[name] = None
+                yield name, record
+
+    def supports_point_reads(self) -> bool:
+        # Legacy single file has no point reads until split into shards
+        return bool(self._shard_files()) or not self.data_file.exists()
+
+    def get(self, feature_name: str) -> Any:
+        # Scan the record's shard
+        if not self._shard_files():
+            return None
+        path = self.shard_path(self.shard_key(feature_name))
+        if not path.exists():
+            return None
+        found = None
+        for name, record in iter_snapshot(path):
+            if name == feature_name:
+                found = record
+        return found
+
+    def write_records(self, records: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        # Stream records into per-category shards
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        members: dict[str, dict[str, None]] = {}
+        if self.snapshot_format == "binary":
+            # Binary encoder needs each shard whole
+            groups: dict[str, dict[str, dict[str, Any]]] = {}
+            for name, record in records:
+                groups.setdefault(self.shard_key(name), {})[name] = record
+            for category, shard in groups.items():
+                write_snapshot(self.shard_path(category), shard, "binary")
+                members[category] = dict.fromkeys(shard)
+        else:
+            writers: dict[str, JsonSnapshotWriter] = {}
+            # Categories with an open handle, least recently written first
+            open_shards: dict[str, None] = {}
+            try:
+                for name, record in records:
+                    category = self.shard_key(name)
+                    if (
+                        category not in open_shards
+                        and len(open_shards) >= self.MAX_OPEN_SHARDS
+                    ):
+                        oldest = next(iter(open_shards))
+                        writers[oldest].suspend()
+                        del open_shards[oldest]
+                    writer = writers.get(category)
+                    if writer is None:
+                        writer = JsonSnapshotWriter(self.shard_path(category))
+                        writers[category] = writer
+                    open_shards.pop(category, None)
+                    open_shards[category] = None
+                    writer.write(name, record)
+                    members.setdefault(category, {})[name] = None
+            except BaseException:
+                for writer in writers.values():
+                    writer.abort()
+                raise
+            # Open shards first, so reopened ones stay under the cap
+            for category in sorted(writers, key=lambda c: c not in open_shards):
+                writers[category].close()
+        keep = {self.shard_path(category) for category in members}
+        for path in self._shard_files():
+            if path not in keep:
+                path.unlink()
+        self._members = members
+        return sum(len(names) for names in members.values())
+
+    def checkpoint(
+        self, lock: AbstractContextManager[Any], metadata: dict[str, dict[str, Any]]
+    ) -> int:
+        # Shards are current after every put, report size
+        return sum(path.stat().st_size for path in self._shard_files())
+
+
+# Embedded SQLite store
+class SqliteBackend(StorageBackend):
+    """SQLite store with row-level writes and indexed columns."""
+
+    INDEXED_COLUMNS = ["status", "feature_type", "feature_data_type", "created_by"]
+
+    # Rows fetched per page when streaming
+    PAGE_SIZE = 1000
+
+    _UPSERT_SQL = (
+        "INSERT INTO feature_metadata "
+        "(feature_name, status, feature_type, feature_data_type, created_by, "
+        "updated_time, record) VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(feature_name) DO UPDATE SET status=excluded.status, "
+        "feature_type=excluded.feature_type, "
+        "feature_data_type=excluded.feature_data_type, "
+        "created_by=excluded.created_by, updated_time=excluded.updated_time, "
+        "record=excluded.record"
+    )
+
+    def __init__(self, db_file: str | Path) -> None:
+        self.db_file = Path(db_file)
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(
+                self.db_file, check_same_thread=False, isolation_level=None
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_metadata ("
+                "feature_name TEXT PRIMARY KEY, status TEXT, feature_type TEXT, "
+                "feature_data_type TEXT, created_by TEXT, updated_time INTEGER, "
+                "record TEXT NOT NULL)"
+            )
+            for column in self.INDEXED_COLUMNS + ["updated_time"]:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_feature_metadata_{column} "
+                    f"ON feature_metadata({column})"
+                )
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open {self.db_file}: {e}") from e
+
+    @staticmethod
+    def _row(feature_name: str, record: dict[str, Any]) -> tuple[Any, ...]:
+        # Build upsert parameters
+        def scalar(value: Any) -> Any:
+            return value if isinstance(value, str | int | float) else None
+
+        return (
+            feature_name,
+            scalar(record.get("status")),
+            scalar(record.get("feature_type")),
+            scalar(record.get("feature_data_type")),
+            scalar(record.get("created_by")),
+            scalar(record.get("updated_time")),
+            json.dumps(record, separators=(",", ":")),
+        )
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        # Load all rows in insertion order
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT feature_name, record FROM feature_metadata ORDER BY rowid"
+                )
+                return {name: json.loads(record) for name, record in rows}
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to load data: {e}") from e
+
+    def save_all(self, metadata: dict[str, dict[str, Any]]) -> None:
+        # Replace table contents in one transaction
+        self.write_records(metadata.items())
+
+    def iter_records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        # Page through rows in insertion order
+        last_rowid = 0
+        while True:
+            with self._lock:
+                try:
+                    rows = self._conn.execute(
+                        "SELECT rowid, feature_name, record FROM feature_metadata "
+                        "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                        (last_rowid, self.PAGE_SIZE),
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    raise StorageError(f"Failed to load data: {e}") from e
+            if not rows:
+                return
+            for _, name, record in rows:
+                yield name, json.loads(record)
+            last_rowid = rows[-1][0]
+
+    def iter_recent(self) -> Iterator[tuple[str, Any]]:
+        # Page through rows by updated_time, newest first
+        with self._lock:
+            try:
+                rowids = [
+                    rowid
+                    for (rowid,) in self._conn.execute(
+                        "SELECT rowid FROM feature_metadata "
+                        "ORDER BY updated_time DESC, rowid DESC"
+                    )
+                ]
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to load data: {e}") from e
+        for start in range(0, len(rowids), self.PAGE_SIZE):
+            page = rowids[start : start + self.PAGE_SIZE]
+            with self._lock:
+                try:
+                    rows = self._conn.execute(
+                        "SELECT rowid, feature_name, record FROM feature_metadata "
+                        f"WHERE rowid IN ({','.join('?' * len(page))})",
+                        page,
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    raise StorageError(f"Failed to load data: {e}") from e
+            by_rowid = {rowid: (name, record) for rowid, name, record in rows}
+            for rowid in page:
+                if rowid in by_rowid:
+                    name, record = by_rowid[rowid]
+                    yield name, json.loads(record)
+
+    def supports_point_reads(self) -> bool:
+        # Primary key lookups
+        return True
+
+    def get(self, feature_name: str) -> Any:
+        # Primary key lookup
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT record FROM feature_metadata WHERE feature_name = ?",
+                    (feature_name,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to load data: {e}") from e
+        return json.loads(row[0]) if row is not None else None
+
+    def write_records(self, records: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        # Replace table contents from stream in one transaction
+        count = 0
+
+        def rows() -> Iterator[tuple[Any, ...]]:
+            nonlocal count
+            for name, record in records:
+                count += 1
+                yield self._row(name, record)
+
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute("DELETE FROM feature_metadata")
+                    self._conn.executemany(self._UPSERT_SQL, rows())
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                raise StorageError(f"Failed to save data: {e}") from e
+        return count
+
+    def compact(self) -> int:
+        # Fold SQLite WAL and reclaim free pages
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("VACUUM")
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM feature_metadata"
+                ).fetchone()
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to compact: {e}") from e
+        return int(count)
+
+    def rebuild_indexes(self) -> int:
+        # Recompute indexed columns from stored records, then reindex
+        count = 0
+        last_rowid = 0
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    while True:
+                        rows = self._conn.execute(
+                            "SELECT rowid, feature_name, record FROM feature_metadata "
+                            "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                            (last_rowid, self.PAGE_SIZE),
+                        ).fetchall()
+                        if not rows:
+                            break
+                        self._conn.executemany(
+                            "UPDATE feature_metadata SET status=?, feature_type=?, "
+                            "feature_data_type=?, created_by=?, updated_time=? "
+                            "WHERE rowid=?",
+                            (
+                                self._row(name, json.loads(record))[1:6] + (rowid,)
+                                for rowid, name, record in rows
+                            ),
+                        )
+                        count += len(rows)
+                        last_rowid = rows[-1][0]
+                    self._conn.execute("REINDEX feature_metadata")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+            except (sqlite3.Error, ValueError) as e:
+                raise StorageError(f"Failed to rebuild indexes: {e}") from e
+        return count
+
+    def put(
+        self,
+        feature_name: str,
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Upsert one row
+        return self.put_many([feature_name], metadata, durability)
+
+    def put_many(
+        self,
+        feature_names: list[str],
+        metadata: dict[str, dict[str, Any]],
+        durability: str = "sync",
+    ) -> LogBatch | None:
+        # Upsert rows in one transaction, relax fsync unless sync
+        rows = (
+            self._row(name, metadata[name])
+            for name in feature_names
+            if name in metadata
+        )
+        with self._lock:
+            try:
+                if durability != "sync":
+                    self._conn.execute("PRAGMA synchronous=NORMAL")
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        self._conn.executemany(self._UPSERT_SQL, rows)
+                    except BaseException:
+                        self._conn.execute("ROLLBACK")
+                        raise
+                    self._conn.execute("COMMIT")
+                finally:
+                    if durability != "sync":
+                        self._conn.execute("PRAGMA synchronous=FULL")
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                raise StorageError(f"Failed to save data: {e}") from e
+        return None
+
+    def checkpoint(
+        self, lock: AbstractContextManager[Any], metadata: dict[str, dict[str, Any]]
+    ) -> int:
+        # Fold SQLite WAL into database file
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except sqlite3.Error as e:
+                raise StorageError(f"Failed to checkpoint: {e}") from e
+        return self.db_file.stat().st_size
+
+    def close(self) -> None:
+        # Close connection
+        with self._lock:
+            self._conn.close()
+
+
+# Build backend from environment
+def create_backend(
+    data_file: str | Path,
+    kind: str | None = None,
+    snapshot_format: str | None = None,
+    wal_enabled: bool | None = None,
+) -> StorageBackend:
+    if kind is None:
+        kind = env_str("FEATURE_METADATA_BACKEND", "json").lower()
+    if kind not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Invalid storage backend {kind}. Must be one of: {STORAGE_BACKENDS}"
+        )
+    if snapshot_format is None:
+        snapshot_format = env_str("FEATURE_METADATA_SNAPSHOT_FORMAT", "json").lower()
+    if wal_enabled is None:
+        wal_enabled = env_flag("FEATURE_METADATA_WAL")
+    if kind == "sqlite":
+        return SqliteBackend(Path(data_file).with_suffix(".db"))
+    if kind == "sharded":
+        return ShardedFileBackend(
+            data_file,
+            snapshot_format=snapshot_format,
+            load_workers=env_int("FEATURE_METADATA_SHARD_LOAD_WORKERS", 0),
+        )
+    return FileBackend(
+        data_file,
+        wal_enabled=wal_enabled,
+        compact_threshold=env_int("FEATURE_METADATA_COMPACT_THRESHOLD", 1000),
+        group_commit=env_flag("FEATURE_METADATA_GROUP_COMMIT"),
+        group_commit_window_ms=env_int("FEATURE_METADATA_GROUP_COMMIT_MS", 2),
+        snapshot_format=snapshot_format,
+    )
@@ -0,0 +1,85 @@
+import time
+import zlib
+from typing import Any
+
+
+# Entity tag without the weak prefix and quotes
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.strip('"')
+
+
+# If-None-Match value (one tag, a comma list or "*") matches the current tag
+def etag_matches(condition: str | None, etag: str) -> bool:
+    if not condition:
+        return False
+    if condition == etag:
+        return True
+    current = _opaque(etag)
+    return any(
+        tag.strip() == "*" or _opaque(tag) == current for tag in condition.split(",")
+    )
+
+
+# Record versions for conditional reads
+class RecordVersions:
+    """Per-record versions from one increasing clock, exposed as ETags."""
+
+    def __init__(self) -> None:
+        self.epoch = self._new_epoch()
+        self.clock = 0
+        # Bumped on every write and reload, for listing tags
+        self.generation = 0
+        # Name to (record dict the version was assigned to, version, tag)
+        self.entries: dict[str, tuple[dict[str, Any], int, str]] = {}
+
+    @staticmethod
+    def _new_epoch() -> str:
+        # Load token, so tags handed out before a reload or restart never match
+        return f"{time.time_ns():x}"
+
+    def _entry(
+        self, feature_name: str, record: dict[str, Any]
+    ) -> tuple[dict[str, Any], int, str]:
+        # Current entry, assigned on first read; a replaced record dict
+        # (reload, resync) gets a new version
+        entry = self.entries.get(feature_name)
+        if entry is not None and entry[0] is record:
+            return entry
+        self.clock += 1
+        entry = (record, self.clock, f'"{self.epoch}-{self.clock}"')
+        self.entries[feature_name] = entry
+        return entry
+
+    def get(self, feature_name: str, record: dict[str, Any]) -> int:
+        # Current version of the record
+        return self._entry(feature_name, record)[1]
+
+    def etag(
+        self,
+        feature_name: str,
+        record: dict[str, Any],
+        fields: list[str] | None = None,
+    ) -> str:
+        # Quoted tag; projections are separate representations
+        tag = self._entry(feature_name, record)[2]
+        if fields is not None:
+            tag = f"{tag[:-1]}-{zlib.crc32(','.join(fields).encode()):x}\""
+        return tag
+
+    def catalog_etag(self, key: str) -> str:
+        # Tag of one listing request key, changed by any write or reload
+        return f'"{self.epoch}-g{self.generation}-{zlib.crc32(key.encode()):x}"'
+
+    def invalidate(self, feature_name: str) -> None:
+        # Next read of a record changed in place gets a newer version
+        self.entries.pop(feature_name, None)
+        self.generation += 1
+
+    def clear(self) -> None:
+        # Drop all versions and start a new epoch
+        self.entries.clear()
+        self.generation += 1
+        self.epoch = self._new_epoch()
@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+
+# Records made durable by one write
+class LogBatch:
+    """Group of log records committed together."""
+
+    def __init__(self) -> None:
+        self.lines: list[bytes] = []
+        self.sync = False
+        self.done = False
+        self.error: OSError | None = None
+
+
+# Append-only mutation log
+class WriteAheadLog:
+    """Append-only log of feature metadata mutations."""
+
+    def __init__(self, log_file: str | Path, group_commit_window_ms: int = 0) -> None:
+        self.log_file = Path(log_file)
+        self.rotated_file = Path(f"{self.log_file}.1")
+        self.group_commit_window = max(group_commit_window_ms, 0) / 1000
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._fp: IO[bytes] | None = None
+        self._batch = LogBatch()
+        self._flushing = False
+        self.record_count = 0
+        self.byte_count = 0
+        self.commit_count = 0
+        self.invalid_bytes = 0
+
+    @staticmethod
+    def encode_record(record: dict[str, Any]) -> bytes:
+        # Encode record as checksummed line
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        return b"%08x\t%s\n" % (zlib.crc32(payload), payload)
+
+    @staticmethod
+    def decode_record(line: bytes) -> dict[str, Any] | None:
+        # Decode line, None if torn or corrupt
+        if not line.endswith(b"\n"):
+            return None
+        checksum, _, payload = line[:-1].partition(b"\t")
+        try:
+            if int(checksum, 16) != zlib.crc32(payload):
+                return None
+            record = json.loads(payload)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+
+    def replay(self) -> Iterator[dict[str, Any]]:
+        # Yield valid records, drop torn tails
+        with self._lock:
+            self.record_count = 0
+            self.byte_count = 0
+            for segment in (self.rotated_file, self.log_file):
+                if not segment.exists():
+                    continue
+                valid_bytes = 0
+                with open(segment, "rb") as f:
+                    for line in f:
+                        record = self.decode_record(line)
+                        if record is None:
+                            break
+                        valid_bytes += len(line)
+                        self.record_count += 1
+                        yield record
+                if valid_bytes < segment.stat().st_size:
+                    os.truncate(segment, valid_bytes)
+                self.byte_count += valid_bytes
+
+    def scan(self) -> Iterator[dict[str, Any]]:
+        # Yield valid records without repairing, count bad tail bytes
+        self.invalid_bytes = 0
+        for segment in (self.rotated_file, self.log_file):
+            if not segment.exists():
+                continue
+            valid_bytes = 0
+            with open(segment, "rb") as f:
+                for line in f:
+                    record = self.decode_record(line)
+                    if record is None:
+                        break
+                    valid_bytes += len(line)
+                    yield record
+            self.invalid_bytes += segment.stat().st_size - valid_bytes
+
+    def _open(self) -> IO[bytes]:
+        # Open log for appending
+        if self._fp is None:
+            self._fp = open(self.log_file, "ab")
+        return self._fp
+
+    def submit(self, record: dict[str, Any], sync: bool = True) -> LogBatch:
+        # Buffer record for next group commit
+        line = self.encode_record(record)
+        with self._cond:
+            self._batch.lines.append(line)
+            self._batch.sync = self._batch.sync or sync
+            self.record_count += 1
+            return self._batch
+
+    def wait(self, batch: LogBatch) -> None:
+        # Block until batch is durable
+        with self._cond:
+            while not batch.done:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                self._flushing = True
+                if self.group_commit_window:
+                    self._cond.wait(self.group_commit_window)
+                current, self._batch = self._batch, LogBatch()
+                self._cond.release()
+                try:
+                    self._write_batch(current)
+                finally:
+                    self._cond.acquire()
+                    current.done = True
+                    self._flushing = False
+                    self._cond.notify_all()
+            if batch.error is not None:
+                raise batch.error
+
+    def _write_batch(self, batch: LogBatch) -> None:
+        # Write one batch, fsync if any writer asked
+        try:
+            fp = self._open()
+            data = b"".join(batch.lines)
+            fp.write(data)
+            fp.flush()
+            if batch.sync:
+                os.fsync(fp.fileno())
+            self.byte_count += len(data)
+            self.commit_count += 1
+        except OSError as e:
+            batch.error = e
+            self.close_file()
+
+    def append(self, record: dict[str, Any]) -> None:
+        # Append record durably
+        self.wait(self.submit(record))
+
+    def reset(self) -> None:
+        # Truncate log after snapshot
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self.close_file()
+            with open(self.log_file, "wb") as f:
+                os.fsync(f.fileno())
+            self.rotated_file.unlink(missing_ok=True)
+            self._batch.done = True
+            self._batch = LogBatch()
+            self.record_count = 0
+            self.byte_count = 0
+            self._cond.notify_all()
+
+    def rotate(self) -> None:
+        # Seal current segment for checkpoint
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self.close_file()
+            if self.log_file.exists():
+                if self.rotated_file.exists():
+                    with open(self.rotated_file, "ab") as out:
+                        out.write(self.log_file.read_bytes())
+                        out.flush()
+                        os.fsync(out.fileno())
+                    self.log_file.unlink()
+                else:
+                    os.replace(self.log_file, self.rotated_file)
+            self.record_count = len(self._batch.lines)
+            self.byte_count = 0
+
+    def drop_rotated(self) -> None:
+        # Remove segment covered by snapshot
+        with self._cond:
+            self.rotated_file.unlink(missing_ok=True)
+
+    def close_file(self) -> None:
+        # Drop open file handle
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def close(self) -> None:
+        # Close log file handle
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self.close_file()
@@ -88,3 +88,72 @@ STATUS_TRANSITIONS = {
 
 # Critical fields
 CRITICAL_FIELDS = ["query", "feature_type", "feature_data_type"]
+
+# Write durability levels
+DURABILITY_LEVELS = ["sync", "flushed", "async"]
+
+# Fields with secondary indexes for listing filters
+INDEXED_FIELDS = [
+    "status",
+    "feature_type",
+    "feature_data_type",
+    "created_by",
+    "approved_by",
+    "tested_by",
+]
+
+# Indexed fields with small value domains, kept as bitsets
+BITMAP_INDEXED_FIELDS = ["status", "feature_type", "feature_data_type"]
+
+# Integer timestamp fields with ordered indexes for range filters
+TIME_INDEXED_FIELDS = [
+    "created_time",
+    "updated_time",
+    "tested_time",
+    "approved_time",
+    "deployed_time",
+    "deleted_time",
+]
+
+# Mean similarity a fuzzy filter match needs
+FUZZY_THRESHOLD = 0.7
+
+# Range filter operators
+RANGE_OPERATORS = ["gte", "gt", "lte", "lt"]
+
+# Leaf operators of the listing filter language
+FILTER_OPERATORS = ["eq", "in", "prefix", "contains", *RANGE_OPERATORS]
+
+# Deepest and/or/not nesting accepted in a filter expression
+MAX_FILTER_DEPTH = 32
+
+# Listing page sizes
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Listing request keys that are options, not field filters
+LISTING_OPTIONS = [
+    "user_role",
+    "count_only",
+    "prefix",
+    "where",
+    "explain",
+    "limit",
+    "cursor",
+    "include_total",
+    "order_by",
+    "order",
+    "fields",
+]
+
+# Aggregation request keys that are not field filters
+AGGREGATE_OPTIONS = ["user_role", "group_by", "prefix", "where"]
+
+# Listing query string keys read as true/false flags
+QUERY_FLAG_OPTIONS = ["count_only", "explain", "include_total"]
+
+# Listing sort directions
+SORT_ORDERS = ["asc", "desc"]
+
+# Startup load modes
+LOAD_MODES = ["blocking", "background"]
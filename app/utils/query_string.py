@@ -0,0 +1,70 @@
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from app.utils.constants import LISTING_OPTIONS, QUERY_FLAG_OPTIONS
+
+
+# True/false query string flag
+def parse_flag(name: str, value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("", "0", "false", "no"):
+        return False
+    raise ValueError(f"Invalid {name}: {value!r}")
+
+
+# Comma separated field names, e.g. "status,description"
+def parse_fields(value: str) -> list[str]:
+    return [field.strip() for field in value.split(",") if field.strip()]
+
+
+# Number if the text is one, else the text for validation to reject
+def _number(value: str) -> int | float | str:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+# Listing body from query string pairs, shaped like the POST body: repeated
+# filters mean any of, "field.gte=..." style keys build range filters
+def listing_request(params: Iterable[tuple[str, str]]) -> dict[str, Any]:
+    request: dict[str, Any] = {}
+    for key, value in params:
+        if key in QUERY_FLAG_OPTIONS:
+            request[key] = parse_flag(key, value)
+        elif key == "limit":
+            request[key] = _number(value)
+        elif key == "fields":
+            request.setdefault(key, []).extend(parse_fields(value))
+        elif key == "where":
+            try:
+                request[key] = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid where: {e}") from e
+        elif key in LISTING_OPTIONS:
+            request[key] = value
+        else:
+            field, _, op = key.partition(".")
+            existing = request.get(field)
+            if op:
+                if existing is None:
+                    existing = request[field] = {}
+                if not isinstance(existing, dict):
+                    raise ValueError(f"Use either values or a range for {field}")
+                existing[op] = _number(value)
+            elif existing is None:
+                request[field] = value
+            elif isinstance(existing, dict):
+                raise ValueError(f"Use either values or a range for {field}")
+            elif isinstance(existing, list):
+                existing.append(value)
+            else:
+                request[field] = [existing, value]
+    return request
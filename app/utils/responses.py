@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+
+# Compact JSON bytes, as Starlette's JSONResponse renders them
+def encode_json(value: Any) -> bytes:
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+# Body bytes; bytes values are spliced in as already encoded JSON, the rest
+# is encoded in one json.dumps call per plain subtree
+def render_json(content: Any) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, dict):
+        return (
+            b"{"
+            + b",".join(
+                encode_json(str(key)) + b":" + render_json(value)
+                for key, value in content.items()
+            )
+            + b"}"
+        )
+    if isinstance(content, list) and any(isinstance(item, bytes) for item in content):
+        return b"[" + b",".join(render_json(item) for item in content) + b"]"
+    return encode_json(content)
+
+
+# Read route response without jsonable_encoder; a JSONResponse, so routes
+# keep their documented schemas
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered from plain values and pre-encoded fragments."""
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
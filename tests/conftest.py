@@ -7,6 +7,7 @@ from typing import Any
 import pytest
 
 from app.services.feature_service import FeatureMetadataService
+from app.services.storage import FileBackend
 from app.utils.timestamp import get_current_timestamp
 
 
@@ -32,6 +33,36 @@ def sample_feature_metadata(sample_timestamp):
     }
 
 
+# Stored record builder fixture, fields overridable per record
+@pytest.fixture
+def make_record():
+    def build(name, **overrides):
+        record = {
+            "feature_name": name,
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "status": "DRAFT",
+            "created_time": 1,
+            "updated_time": 1,
+            "created_by": "dev",
+        }
+        record.update(overrides)
+        return record
+
+    return build
+
+
+# Catalog over namespaces a and b with increasing update times
+@pytest.fixture
+def catalog(make_record):
+    return {
+        name: make_record(name, updated_time=i)
+        for i, name in enumerate(["a:x:v1", "b:y:v1", "a:z:v1"])
+    }
+
+
 # Sample create request fixture
 @pytest.fixture
 def sample_create_request():
@@ -87,13 +118,57 @@ def temp_service():
         temp_path.unlink()
 
 
+# WAL-enabled service builder fixture
+@pytest.fixture
+def make_service():
+    def build(data_file, **kwargs):
+        backend = FileBackend(data_file, wal_enabled=True, **kwargs)
+        return FeatureMetadataService(str(data_file), backend=backend)
+
+    return build
+
+
+# WAL-enabled service fixture, compaction left to the test
+@pytest.fixture
+def wal_service(tmp_path, make_service):
+    service = make_service(tmp_path / "metadata.json", compact_threshold=0)
+    yield service
+    service.close()
+
+
+# Create request builder fixture
+@pytest.fixture
+def create_request(sample_create_request):
+    def build(name, durability=None):
+        return dict(sample_create_request, feature_name=name, durability=durability)
+
+    return build
+
+
+# Service with eight created features in namespaces a and b
+@pytest.fixture
+def populated_service(tmp_path, sample_create_request):
+    service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+    for i in range(1, 9):
+        service.create_feature_metadata(
+            dict(
+                sample_create_request,
+                feature_name=f"{'ab'[i % 2]}:feature:v{i}",
+                feature_type=["batch", "real-time"][i % 2],
+                created_by=f"user{i % 3}",
+                description=f"desc {i % 2}",
+            )
+        )
+    return service
+
+
 # Service with test data fixture
 @pytest.fixture
 def service_with_data(temp_service, sample_feature_metadata):
     temp_service.metadata = {
         sample_feature_metadata["feature_name"]: sample_feature_metadata
     }
-    temp_service._save_data()
+    temp_service.backend.save_all(temp_service.metadata)
     return temp_service
 
 
@@ -102,7 +177,7 @@ def service_with_data(temp_service, sample_feature_metadata):
 def service_with_multiple_features(temp_service, multiple_feature_data):
     for feature_data in multiple_feature_data:
         temp_service.metadata[feature_data["feature_name"]] = feature_data
-    temp_service._save_data()
+    temp_service.backend.save_all(temp_service.metadata)
     return temp_service
 
 
@@ -339,6 +414,31 @@ def performance_test_data():
     return features
 
 
+# Synthetic catalog builder fixture, repeat widens query and description
+@pytest.fixture
+def build_catalog():
+    statuses = ["DRAFT", "READY_FOR_TESTING", "TEST_SUCCEEDED", "DEPLOYED"]
+
+    def build(count: int, repeat: int = 1) -> dict[str, dict[str, Any]]:
+        return {
+            f"team{i % 50}:feature_{i}:v1": {
+                "feature_name": f"team{i % 50}:feature_{i}:v1",
+                "feature_type": ["batch", "real-time", "compute-first"][i % 3],
+                "feature_data_type": ["float", "int", "string"][i % 3],
+                "query": f"SELECT value_{i} FROM table_{i % 100}" * repeat,
+                "description": f"Feature number {i}" * repeat,
+                "status": statuses[i % 4],
+                "created_time": 1700000000000 + i,
+                "updated_time": 1700000000000 + i,
+                "created_by": f"user{i % 20}",
+                "last_updated_by": None,
+            }
+            for i in range(count)
+        }
+
+    return build
+
+
 # Security test cases fixture
 @pytest.fixture
 def security_test_cases():
@@ -93,7 +93,7 @@ class TestErrorScenarios:
 
     def test_service_dependency_failures(self, test_client):
         with patch(
-            "app.services.feature_service.FeatureMetadataService._save_data",
+            "app.services.feature_service.FeatureMetadataService._persist",
             side_effect=Exception("Service unavailable"),
         ):
             resp = test_client.post(
@@ -279,7 +279,7 @@ class TestErrorScenarios:
 class TestErrorRecovery:
     def test_transaction_rollback_simulation(self, test_client):
         with patch(
-            "app.services.feature_service.FeatureMetadataService._save_data",
+            "app.services.feature_service.FeatureMetadataService._persist",
             side_effect=Exception("Save failed"),
         ):
             resp = test_client.post(
@@ -143,3 +143,40 @@ class TestDataPersistence:
             stored_data = json.load(f)
         assert stored_data["persistence:delete:v1"]["status"] == "DELETED"
         assert "deleted_by" in stored_data["persistence:delete:v1"]
+
+
+class TestCheckpointPersistence:
+    # Shutdown checkpoint folds log into snapshot
+    def test_checkpoint_on_shutdown(self, temp_data_dir, monkeypatch):
+        from app.services import feature_service
+
+        orig_init = feature_service.FeatureMetadataService.__init__
+
+        def custom_init(self, metadata_file=None):
+            orig_init(self, str(temp_data_dir / "test_metadata.json"))
+
+        monkeypatch.setattr(
+            feature_service.FeatureMetadataService, "__init__", custom_init
+        )
+        monkeypatch.setenv("FEATURE_METADATA_WAL", "true")
+        monkeypatch.setenv("FEATURE_METADATA_CHECKPOINT_INTERVAL", "3600")
+        metadata_file = temp_data_dir / "test_metadata.json"
+        with TestClient(app) as client:
+            response = client.post(
+                "/create_feature_metadata",
+                json={
+                    "feature_name": "persistence:checkpoint:v1",
+                    "feature_type": "batch",
+                    "feature_data_type": "float",
+                    "query": "SELECT value FROM table",
+                    "description": "Checkpoint test feature",
+                    "created_by": "test_user",
+                    "user_role": "developer",
+                },
+            )
+            assert response.status_code == 201
+            assert not metadata_file.exists()
+        with open(metadata_file) as f:
+            stored_data = json.load(f)
+        assert "persistence:checkpoint:v1" in stored_data
+        assert not Path(f"{metadata_file}.wal.1").exists()
@@ -0,0 +1,284 @@
+import difflib
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.fuzzy import fuzzy_matches
+from app.services.query import QueryPlan, compile_filter
+
+# Timing ratios, run apart from the coverage job
+pytestmark = pytest.mark.slow
+
+
+# Best of several listing timings
+def best_listing_time(service, filters, rounds=5):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        service.get_all_feature_metadata("developer", filters)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class TestFilterIndexes:
+    # Selective filter skips the full scan
+    def test_indexed_vs_scan(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        filters = {"feature_type": "batch", "created_by": "user3"}
+        expected = [
+            name
+            for name, meta in service.metadata.items()
+            if meta["feature_type"] == "batch" and meta["created_by"] == "user3"
+        ]
+        result = service.get_all_feature_metadata("developer", filters)
+        assert list(result) == expected
+        indexed = best_listing_time(service, filters)
+        with (
+            patch.object(service.indexes, "match", return_value=None),
+            patch.object(service.indexes, "is_indexed", return_value=False),
+        ):
+            assert list(service.get_all_feature_metadata("developer", filters)) == (
+                expected
+            )
+            scan = best_listing_time(service, filters)
+        print(f"indexed {indexed * 1000:.2f} ms, scan {scan * 1000:.2f} ms")
+        assert indexed * 3 < scan
+
+    # Counts of low-cardinality combinations come from popcount
+    def test_bitmap_count(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        filters = {"feature_type": "real-time", "status": ["DEPLOYED", "DRAFT"]}
+        expected = sum(
+            1
+            for meta in service.metadata.values()
+            if meta["feature_type"] == "real-time"
+            and meta["status"] in ("DEPLOYED", "DRAFT")
+        )
+        assert service.count_feature_metadata("developer", filters) == expected
+        start = time.perf_counter()
+        for _ in range(100):
+            service.count_feature_metadata("developer", filters)
+        per_count = (time.perf_counter() - start) / 100
+        listing = best_listing_time(service, filters, rounds=1)
+        print(f"count {per_count * 1e6:.1f} us, listing {listing * 1000:.2f} ms")
+        assert per_count * 100 < listing
+
+    # Time window read from the ordered index
+    def test_range_vs_scan(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        window = {"gte": 1700000010000, "lt": 1700000010200}
+        filters = {"updated_time": window}
+        expected = [
+            name
+            for name, meta in service.metadata.items()
+            if window["gte"] <= meta["updated_time"] < window["lt"]
+        ]
+        assert list(service.get_all_feature_metadata("developer", filters)) == (
+            expected
+        )
+        assert service.count_feature_metadata("developer", filters) == 200
+        indexed = best_listing_time(service, filters)
+        with (
+            patch.object(service.indexes, "match", return_value=None),
+            patch.object(service.indexes, "is_indexed", return_value=False),
+        ):
+            assert list(service.get_all_feature_metadata("developer", filters)) == (
+                expected
+            )
+            scan = best_listing_time(service, filters)
+        print(f"range {indexed * 1000:.2f} ms, scan {scan * 1000:.2f} ms")
+        assert indexed * 3 < scan
+
+    # Namespace listing proportional to the namespace
+    def test_prefix_vs_scan(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        expected = [name for name in service.metadata if name.startswith("team7:")]
+        listing = service.get_all_feature_metadata("developer", prefix="team7:")
+        assert list(listing) == expected
+        start = time.perf_counter()
+        for _ in range(20):
+            service.indexes.match({}, "team7:")
+        indexed = (time.perf_counter() - start) / 20
+        start = time.perf_counter()
+        for _ in range(20):
+            [name for name in service.metadata if name.startswith("team7:")]
+        scan = (time.perf_counter() - start) / 20
+        print(f"prefix {indexed * 1000:.3f} ms, scan {scan * 1000:.3f} ms")
+        assert indexed * 3 < scan
+
+    # Typo'd filter scored once per distinct value, not per record
+    def test_fuzzy_vs_difflib_scan(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(20000)
+        filters = {"created_by": "usr3", "feature_type": "batc"}
+        start = time.perf_counter()
+        expected = [
+            name
+            for name, meta in service.metadata.items()
+            if sum(
+                difflib.SequenceMatcher(None, str(meta[key]), value).ratio()
+                for key, value in filters.items()
+            )
+            / len(filters)
+            >= 0.7
+        ]
+        scan = time.perf_counter() - start
+        assert expected
+        result = service.get_all_feature_metadata("developer", filters)
+        assert list(result) == expected
+        # Matching only, the listing also builds every result model
+        start = time.perf_counter()
+        assert list(fuzzy_matches(service.metadata.items(), filters, 0.7)) == (expected)
+        fuzzy = time.perf_counter() - start
+        print(f"fuzzy {fuzzy * 1000:.2f} ms, difflib scan {scan * 1000:.2f} ms")
+        assert fuzzy * 5 < scan
+
+    # Planner reads the most selective index, not the whole catalog
+    def test_planned_vs_scan(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        expression = compile_filter(
+            {
+                "and": [
+                    {"field": "status", "in": ["DRAFT", "DEPLOYED"]},
+                    {"field": "updated_time", "gte": 1700000030000},
+                    {"field": "created_by", "eq": "user4"},
+                    {"not": {"field": "description", "contains": "9"}},
+                ]
+            }
+        )
+        service.indexes.sync(service.metadata)
+        metadata = service.metadata
+        expected = [name for name, meta in metadata.items() if expression.test(meta)]
+        plan = QueryPlan(expression, service.indexes)
+        assert plan.execute(metadata) == expected
+        assert plan.explain(len(expected))["access"] == "eq index on created_by"
+        start = time.perf_counter()
+        for _ in range(5):
+            QueryPlan(expression, service.indexes).execute(metadata)
+        planned = (time.perf_counter() - start) / 5
+        start = time.perf_counter()
+        for _ in range(5):
+            [name for name, meta in metadata.items() if expression.test(meta)]
+        scan = (time.perf_counter() - start) / 5
+        print(f"planned {planned * 1000:.2f} ms, scan {scan * 1000:.2f} ms")
+        assert planned * 3 < scan
+
+    # Deep pages cost the same as the first one
+    def test_page_depth(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        first = service.page_feature_metadata("developer", limit=100)
+        names = list(service.metadata)
+        deep_cursor = first["next_cursor"]
+        for _ in range(3):
+            deep_cursor = service.page_feature_metadata(
+                "developer", limit=1000, cursor=deep_cursor
+            )["next_cursor"]
+        timings = {}
+        for label, cursor in [("first", None), ("deep", deep_cursor)]:
+            start = time.perf_counter()
+            for _ in range(20):
+                page = service.page_feature_metadata(
+                    "developer", limit=100, cursor=cursor
+                )
+            timings[label] = (time.perf_counter() - start) / 20
+        assert list(page["metadata"]) == names[3100:3200]
+        full = best_listing_time(service, None, rounds=1)
+        print(
+            f"first {timings['first'] * 1000:.2f} ms, "
+            f"deep {timings['deep'] * 1000:.2f} ms, full {full * 1000:.2f} ms"
+        )
+        assert timings["deep"] < timings["first"] * 3
+        assert timings["deep"] * 20 < full
+
+    # Top-N reads limit keys from the ordered index, or keeps a bounded heap
+    def test_top_n(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        records = service.metadata
+        service.indexes.sync(records)
+        # Index walk reads ~limit keys; the heap still visits every match
+        for field, speedup in [("updated_time", 3), ("description", 1)]:
+            expected = sorted(
+                (name for name in records if records[name]["status"] == "DEPLOYED"),
+                key=lambda name: (records[name][field], service.indexes.ids[name]),
+                reverse=True,
+            )[:20]
+            start = time.perf_counter()
+            for _ in range(5):
+                page = service.page_feature_metadata(
+                    "developer",
+                    {"status": "DEPLOYED"},
+                    order_by=field,
+                    descending=True,
+                    limit=20,
+                )
+            top_n = (time.perf_counter() - start) / 5
+            assert list(page["metadata"]) == expected
+            full = best_listing_time(service, {"status": "DEPLOYED"}, rounds=1)
+            print(f"{field} top 20 {top_n * 1000:.2f} ms, listing {full * 1000:.2f} ms")
+            assert top_n * speedup < full
+
+    # Projected listing builds three keys instead of validating full models
+    def test_projection(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        fields = ["status", "feature_data_type"]
+        timings, sizes = {}, {}
+        for label, selected in [("full", None), ("projected", fields)]:
+            rounds = []
+            for _ in range(3):
+                start = time.perf_counter()
+                result = service.get_all_feature_metadata(
+                    "developer", fields=selected, filters=None
+                )
+                # Response rows as the endpoint builds them
+                rows = [
+                    meta if isinstance(meta, dict) else meta.model_dump()
+                    for meta in result.values()
+                ]
+                rounds.append(time.perf_counter() - start)
+            timings[label] = min(rounds)
+            sizes[label] = len(json.dumps(rows))
+        assert list(result) == list(service.metadata)
+        assert set(result["team1:feature_1:v1"]) == {"feature_name", *fields}
+        assert sizes["projected"] * 3 < sizes["full"]
+        print(
+            f"full {timings['full'] * 1000:.2f} ms, "
+            f"projected {timings['projected'] * 1000:.2f} ms"
+        )
+        assert timings["projected"] * 2 < timings["full"]
+
+    # Facet counts come from counters and popcounts, not from listed records
+    def test_aggregate(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(40000)
+        fields = ["status", "feature_type", "feature_data_type", "created_by"]
+        service.aggregate_feature_metadata("developer", fields)
+        # Counters answer in O(values); filters add one popcount per value
+        for filters, speedup in [(None, 20), ({"feature_type": "batch"}, 3)]:
+            start = time.perf_counter()
+            for _ in range(10):
+                result = service.aggregate_feature_metadata(
+                    "developer", fields, filters
+                )
+            aggregate = (time.perf_counter() - start) / 10
+            listed = service.metadata.values()
+            if filters is not None:
+                listed = [meta for meta in listed if meta["feature_type"] == "batch"]
+            assert result["facets"]["created_by"][0]["count"] == sum(
+                1 for meta in listed if meta["created_by"] == "user0"
+            )
+            full = best_listing_time(service, filters, rounds=1)
+            print(
+                f"{filters} aggregate {aggregate * 1000:.2f} ms, full {full * 1000:.2f} ms"
+            )
+            assert aggregate * speedup < full
@@ -1,9 +1,15 @@
 import time
 
 import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 
+import app.main as main_module
 from app.main import app
+from app.models.request import FeatureMetadata
+from app.services.feature_service import FeatureMetadataService
+from app.utils.responses import FastJSONResponse, encode_json
 
 
 class TestResponseTimes:
@@ -110,3 +116,152 @@ class TestResponseTimes:
         duration = end - start
         assert resp.status_code == 200
         assert duration < 5, f"Workflow took {duration:.2f}s"
+
+    # Warm reads reuse encoded bytes instead of building and dumping a model
+    @pytest.mark.slow
+    def test_cached_record_bytes(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(1000, repeat=20)
+        names = list(service.metadata)
+        for name in names:
+            service.get_feature_json(name)
+        start = time.perf_counter()
+        for name in names:
+            service.get_feature_json(name)
+        cached = time.perf_counter() - start
+        start = time.perf_counter()
+        for name in names:
+            encode_json(FeatureMetadata(**service.metadata[name]).model_dump())
+        built = time.perf_counter() - start
+        print(f"cached {cached * 1000:.2f} ms, built {built * 1000:.2f} ms")
+        assert cached * 2 < built
+
+    # Listing bodies: models, dicts and jsonable_encoder before, fragments after
+    @pytest.mark.slow
+    @pytest.mark.parametrize("count", [1000, 10000])
+    def test_fast_listing_body(self, tmp_path, build_catalog, count):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(count)
+        timings = {}
+        start = time.perf_counter()
+        result = service.get_all_feature_metadata("developer")
+        content = {
+            "metadata": [meta.model_dump() for meta in result.values()],
+            "total_count": len(result),
+        }
+        before = JSONResponse(jsonable_encoder(content)).body
+        timings["before"] = time.perf_counter() - start
+        for label in ["cold", "warm"]:
+            start = time.perf_counter()
+            encoded = service.get_all_feature_metadata("developer", encoded=True)
+            after = FastJSONResponse(
+                {"metadata": list(encoded.values()), "total_count": len(encoded)}
+            ).body
+            timings[label] = time.perf_counter() - start
+        assert after == before
+        print(
+            f"{count} records: before {timings['before'] * 1000:.1f} ms, "
+            f"cold {timings['cold'] * 1000:.1f} ms, "
+            f"warm {timings['warm'] * 1000:.1f} ms"
+        )
+        assert timings["cold"] < timings["before"]
+        assert timings["warm"] * 5 < timings["before"]
+
+    # Batch reads: one lock and no exceptions, against the per-name loop
+    @pytest.mark.slow
+    def test_batch_reads(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(500)
+        names = [*service.metadata, *(f"missing:x:v{i}" for i in range(500))] * 2
+
+        def loop():
+            values = []
+            for name in names:
+                try:
+                    values.append(service.get_feature_json(name))
+                except ValueError:
+                    values.append(b"{}")
+            return values
+
+        def batch():
+            found = service.get_many(names, encoded=True)
+            return [found[name] or b"{}" for name in names]
+
+        assert batch() == loop()
+        timings = {}
+        for label, read in [("loop", loop), ("batch", batch)]:
+            best = float("inf")
+            for _ in range(5):
+                start = time.perf_counter()
+                read()
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+        print(
+            f"loop {timings['loop'] * 1000:.2f} ms, "
+            f"batch {timings['batch'] * 1000:.2f} ms"
+        )
+        assert timings["batch"] * 2 < timings["loop"]
+
+    # Polls with current known versions skip every body
+    @pytest.mark.slow
+    def test_conditional_batch(self, tmp_path, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(2000, repeat=10)
+        names = list(service.metadata)
+
+        def poll(known):
+            found = service.get_many_versioned(names, known_versions=known)
+            changed = [name for name in names if found[name][1] is not None]
+            return FastJSONResponse(
+                {
+                    "metadata": {"features": changed},
+                    "results": {
+                        "values": [found[name][1] for name in changed],
+                        "versions": [found[name][0] for name in changed],
+                    },
+                }
+            ).body
+
+        full = poll(None)
+        known = {
+            name: etag for name, (etag, _) in service.get_many_versioned(names).items()
+        }
+        timings = {}
+        for label, versions in [("full", None), ("known", known)]:
+            best = float("inf")
+            for _ in range(5):
+                start = time.perf_counter()
+                body = poll(versions)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = (best, len(body))
+        print(
+            f"full {timings['full'][0] * 1000:.2f} ms {timings['full'][1]} bytes, "
+            f"known {timings['known'][0] * 1000:.2f} ms {timings['known'][1]} bytes"
+        )
+        assert timings["full"][1] == len(full)
+        assert timings["known"][1] * 100 < timings["full"][1]
+        assert timings["known"][0] * 2 < timings["full"][0]
+
+    # Revalidated GET listings answer 304 without running the listing
+    @pytest.mark.slow
+    def test_conditional_listing_get(self, tmp_path, monkeypatch, build_catalog):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.metadata = build_catalog(20000)
+        monkeypatch.setattr(main_module, "feature_service", service)
+        url = "/features?user_role=developer&status=DEPLOYED"
+        etag = self.client.get(url).headers["etag"]
+        timings = {}
+        for label, headers in [("full", {}), ("revalidated", {"If-None-Match": etag})]:
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                resp = self.client.get(url, headers=headers)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = (best, resp.status_code)
+        print(
+            f"full {timings['full'][0] * 1000:.2f} ms, "
+            f"revalidated {timings['revalidated'][0] * 1000:.2f} ms"
+        )
+        assert timings["full"][1] == 200
+        assert timings["revalidated"][1] == 304
+        assert timings["revalidated"][0] * 5 < timings["full"][0]
@@ -0,0 +1,66 @@
+import gc
+import time
+import tracemalloc
+
+import pytest
+
+from app.services.snapshot import read_snapshot, write_snapshot
+from app.services.storage import FileBackend
+
+# Timing ratios, run apart from the coverage job
+pytestmark = pytest.mark.slow
+
+
+# Best of several load timings
+def best_load_time(path, rounds=3):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        read_snapshot(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# Retained and peak traced bytes of a load
+def traced_load(load):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load()
+        steady, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, steady, peak
+
+
+class TestSnapshotLoad:
+    # Binary snapshot smaller and faster to load than JSON
+    def test_binary_vs_json_load(self, tmp_path, build_catalog):
+        catalog = build_catalog(20000)
+        json_size = write_snapshot(tmp_path / "catalog.json", catalog, "json")
+        binary_size = write_snapshot(tmp_path / "catalog.snap", catalog, "binary")
+        assert read_snapshot(tmp_path / "catalog.snap") == catalog
+        json_time = best_load_time(tmp_path / "catalog.json")
+        binary_time = best_load_time(tmp_path / "catalog.snap")
+        print(
+            f"json {json_size} bytes {json_time * 1000:.1f} ms, "
+            f"binary {binary_size} bytes {binary_time * 1000:.1f} ms"
+        )
+        assert binary_size < json_size / 2
+        assert binary_time < json_time * 1.5
+
+    # Streaming load peaks near the loaded footprint
+    def test_streaming_load_memory(self, tmp_path, build_catalog):
+        catalog = build_catalog(20000)
+        write_snapshot(tmp_path / "catalog.json", catalog)
+        del catalog
+        backend = FileBackend(tmp_path / "catalog.json")
+        loaded, steady, peak = traced_load(backend.load)
+        del loaded
+        _, _, whole_peak = traced_load(lambda: read_snapshot(tmp_path / "catalog.json"))
+        print(
+            f"steady {steady / 1e6:.1f} MB, streaming peak {peak / 1e6:.1f} MB, "
+            f"whole-file peak {whole_peak / 1e6:.1f} MB"
+        )
+        assert peak < steady * 1.3
+        assert peak < whole_peak * 0.75
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from app.cli import build_parser, main
+from app.services.snapshot import is_binary_snapshot, write_snapshot
+from app.services.storage import FileBackend
+
+
+# Store with snapshot and log
+@pytest.fixture
+def data_file(tmp_path, monkeypatch, make_record):
+    monkeypatch.delenv("FEATURE_METADATA_BACKEND", raising=False)
+    monkeypatch.delenv("FEATURE_METADATA_SNAPSHOT_FORMAT", raising=False)
+    path = tmp_path / "m.json"
+    write_snapshot(path, {"a:x:v1": make_record("a:x:v1")})
+    backend = FileBackend(path, wal_enabled=True, compact_threshold=0)
+    backend.put("b:y:v1", {"b:y:v1": make_record("b:y:v1")})
+    backend.close()
+    return path
+
+
+# Verify clean store
+def test_verify_ok(data_file, capsys):
+    assert main(["--data-file", str(data_file), "verify"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)["records"] == 2
+    assert "verify: 2 records" in err
+
+
+# Verify failing store
+def test_verify_invalid(tmp_path, capsys):
+    write_snapshot(tmp_path / "m.json", {"a:x:v1": {"feature_name": "a:x:v1"}})
+    assert main(["--data-file", str(tmp_path / "m.json"), "--quiet", "verify"]) == 1
+    out, err = capsys.readouterr()
+    assert json.loads(out)["invalid_records"] == 1
+    assert err == ""
+
+
+# Compact folds log
+def test_compact(data_file, capsys):
+    assert main(["--data-file", str(data_file), "--quiet", "compact"]) == 0
+    assert "Compacted 2 records" in capsys.readouterr().out
+    with open(data_file) as f:
+        assert list(json.load(f)) == ["a:x:v1", "b:y:v1"]
+    assert (data_file.parent / "m.json.wal").stat().st_size == 0
+
+
+# Rebuild on SQLite store
+def test_rebuild(data_file, tmp_path, capsys):
+    output = tmp_path / "m.db"
+    args = ["--data-file", str(data_file), "--quiet", "convert"]
+    assert main(args + ["--output", str(output), "--to-backend", "sqlite"]) == 0
+    args = ["--data-file", str(output), "--backend", "sqlite", "--quiet", "rebuild"]
+    assert main(args) == 0
+    assert "Rebuilt indexes for 2 records" in capsys.readouterr().out
+
+
+# Rebuild rejected on JSON store
+def test_rebuild_json(data_file, capsys):
+    assert main(["--data-file", str(data_file), "--quiet", "rebuild"]) == 2
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "no derived indexes" in err
+
+
+# Convert to binary snapshot
+def test_convert(data_file, tmp_path, capsys):
+    output = tmp_path / "out.json"
+    args = ["--data-file", str(data_file), "--quiet", "convert"]
+    assert main(args + ["--output", str(output), "--to-format", "binary"]) == 0
+    assert "Converted 2 records" in capsys.readouterr().out
+    assert is_binary_snapshot((tmp_path / "out.snap").read_bytes())
+
+
+# Unreadable store
+def test_corrupt_store(tmp_path, capsys):
+    (tmp_path / "m.json").write_text("{")
+    assert main(["--data-file", str(tmp_path / "m.json"), "--quiet", "compact"]) == 2
+    assert capsys.readouterr().err.startswith("Error: ")
+
+
+# Invalid environment setting
+def test_open_failure(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("FEATURE_METADATA_SNAPSHOT_FORMAT", "xml")
+    assert main(["--data-file", str(tmp_path / "m.json"), "verify"]) == 2
+    assert "Invalid snapshot format" in capsys.readouterr().err
+
+
+# Command required
+def test_parser_requires_command():
+    with pytest.raises(SystemExit):
+        build_parser().parse_args([])
@@ -1,6 +1,13 @@
+import json
+
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import app, ensure_service
+from app.models.request import FeatureMetadata
+from app.models.response import (
+    FeatureMetadataBatchResponse,
+    FeatureMetadataSingleResponse,
+)
 
 client = TestClient(app)
 
@@ -216,21 +223,113 @@ def test_get_feature_metadata_not_found():
 # Batch error test
 def test_get_feature_metadata_batch_error(monkeypatch):
     monkeypatch.setattr(
-        "app.services.feature_service.FeatureMetadataService.get_feature_metadata",
-        lambda self, x, y="developer": (_ for _ in ()).throw(ValueError("batch error")),
+        "app.services.feature_service.FeatureMetadataService.get_many_versioned",
+        lambda self, x, y="developer", z=None, w=None: (_ for _ in ()).throw(
+            ValueError("batch error")
+        ),
     )
     resp = client.post(
         "/get_feature_metadata",
         json={"features": ["main:batcherror:v1"], "user_role": "developer"},
     )
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "batch error"
+
+
+# Batch with repeats and misses
+def test_get_feature_metadata_batch_misses():
+    data = {
+        "feature_name": "main:getmany:v1",
+        "feature_type": "batch",
+        "feature_data_type": "float",
+        "query": "SELECT 1",
+        "description": "desc",
+        "created_by": "dev",
+        "user_role": "developer",
+    }
+    client.post("/create_feature_metadata", json=data)
+    features = ["main:getmany:v1", "main:nomany:v1", "main:getmany:v1"]
+    resp = client.post(
+        "/get_feature_metadata",
+        json={"features": features, "user_role": "developer"},
+    )
     assert resp.status_code == 200
+    body = resp.json()
+    assert body["metadata"]["features"] == features
+    results = body["results"]
+    assert results["status/message"] == [
+        "200 OK",
+        "Feature main:nomany:v1 not found",
+        "200 OK",
+    ]
+    values = results["values"]
+    assert values[0]["feature_name"] == "main:getmany:v1"
+    assert values[1] == {}
+    assert values[2] == values[0]
+    assert len(set(results["event_timestamp"])) == 1
+
+
+# Conditional reads with ETag and known versions
+def test_get_feature_metadata_conditional():
+    for name in ["main:etag:v1", "main:etag:v2"]:
+        client.post(
+            "/create_feature_metadata",
+            json={
+                "feature_name": name,
+                "feature_type": "batch",
+                "feature_data_type": "float",
+                "query": "SELECT 1",
+                "description": "desc",
+                "created_by": "dev",
+                "user_role": "developer",
+            },
+        )
+    body = {"features": "main:etag:v1", "user_role": "developer"}
+    resp = client.post("/get_feature_metadata", json=body)
+    etag = resp.headers["etag"]
+    resp = client.post(
+        "/get_feature_metadata", json=body, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    features = ["main:etag:v1", "main:etag:v2", "main:noetag:v1"]
+    resp = client.post(
+        "/get_feature_metadata",
+        json={"features": features, "user_role": "developer"},
+    )
+    versions = resp.json()["results"]["versions"]
+    assert versions[0] == etag
+    assert versions[2] is None
+    client.post(
+        "/update_feature_metadata",
+        json={
+            "feature_name": "main:etag:v2",
+            "description": "changed",
+            "last_updated_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    known = dict(zip(features[:2], versions[:2], strict=True))
+    resp = client.post(
+        "/get_feature_metadata",
+        json={"features": features, "user_role": "developer", "known_versions": known},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["metadata"]["features"] == ["main:etag:v2", "main:noetag:v1"]
+    results = body["results"]
+    assert results["values"][0]["description"] == "changed"
+    assert results["versions"][0] not in (None, versions[1])
+    assert results["status/message"][1] == "Feature main:noetag:v1 not found"
+    assert len(results["event_timestamp"]) == 2
 
 
 # General error test
 def test_get_feature_metadata_general_error(monkeypatch):
     monkeypatch.setattr(
-        "app.services.feature_service.FeatureMetadataService.get_feature_metadata",
-        lambda self, x, y="developer": (_ for _ in ()).throw(
+        "app.services.feature_service.FeatureMetadataService.get_versioned_json",
+        lambda self, x, y="developer", z=None, w=None: (_ for _ in ()).throw(
             Exception("general error")
         ),
     )
@@ -276,7 +375,9 @@ def test_get_all_features_service_not_initialized(monkeypatch):
 def test_get_all_features_value_error(monkeypatch):
     monkeypatch.setattr(
         "app.services.feature_service.FeatureMetadataService.get_all_feature_metadata",
-        lambda self, x, y=None: (_ for _ in ()).throw(ValueError("bad value")),
+        lambda self, x, y=None, z=None, w=None, v=None: (_ for _ in ()).throw(
+            ValueError("bad value")
+        ),
     )
     resp = client.post("/get_all_feature_metadata", json={"user_role": "developer"})
     assert resp.status_code == 400
@@ -287,7 +388,9 @@ def test_get_all_features_value_error(monkeypatch):
 def test_get_all_features_general_error(monkeypatch):
     monkeypatch.setattr(
         "app.services.feature_service.FeatureMetadataService.get_all_feature_metadata",
-        lambda self, x, y=None: (_ for _ in ()).throw(Exception("general error")),
+        lambda self, x, y=None, z=None, w=None, v=None: (_ for _ in ()).throw(
+            Exception("general error")
+        ),
     )
     resp = client.post("/get_all_feature_metadata", json={"user_role": "developer"})
     assert resp.status_code == 500
@@ -1110,6 +1213,7 @@ def test_get_feature_metadata_invalid_features_type_runtime():
     class DummyRequest:
         features = {"foo": "bar"}
         user_role = "developer"
+        fields = None
 
     try:
         import asyncio
@@ -1143,3 +1247,667 @@ def test_delete_feature_metadata_empty_reason():
     )
     assert resp.status_code == 422
     assert resp.json()["detail"] == "deletion_reason is required"
+
+
+# Create with relaxed durability
+def test_create_feature_flushed():
+    resp = client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "main:flushed:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+            "durability": "flushed",
+        },
+    )
+    assert resp.status_code == 201
+
+
+# Unknown durability rejected
+def test_create_feature_invalid_durability():
+    resp = client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "main:baddurability:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+            "durability": "eventual",
+        },
+    )
+    assert resp.status_code == 400
+    assert "Invalid durability level" in resp.json()["detail"]
+
+
+# Health reports persistence lag
+def test_health_persistence_lag():
+    ensure_service()
+    resp = client.get("/health")
+    assert resp.json()["persistence"]["pending_writes"] >= 0
+    assert resp.json()["checkpoints"] == {}
+
+
+# Readiness reported apart from liveness
+def test_health_readiness():
+    ensure_service()
+    resp = client.get("/health")
+    assert resp.json()["ready"] is True
+    assert resp.json()["loading"]["state"] == "ready"
+    assert client.get("/health/ready").status_code == 200
+
+
+# Reads served while the catalog loads
+def test_serve_while_loading(tmp_path, monkeypatch):
+    import threading
+
+    import app.main as main_module
+    from app.services.feature_service import FeatureMetadataService
+    from app.services.storage import SqliteBackend
+
+    class GatedBackend(SqliteBackend):
+        gate = threading.Event()
+
+        def iter_recent(self):
+            assert self.gate.wait(5)
+            yield from super().iter_recent()
+
+    backend = GatedBackend(tmp_path / "metadata.db")
+    record = {
+        "feature_name": "main:loading:v1",
+        "feature_type": "batch",
+        "feature_data_type": "float",
+        "query": "SELECT 1",
+        "description": "desc",
+        "status": "DRAFT",
+        "created_time": 1,
+        "updated_time": 1,
+        "created_by": "dev",
+    }
+    backend.save_all({"main:loading:v1": record})
+    service = FeatureMetadataService(
+        str(tmp_path / "metadata.json"), backend=backend, load_mode="background"
+    )
+    monkeypatch.setattr(main_module, "feature_service", service)
+    try:
+        resp = client.get("/health/ready")
+        assert resp.status_code == 503
+        assert resp.json()["dependencies"] == {"feature_service": "loading"}
+        resp = client.post(
+            "/get_feature_metadata",
+            json={"features": ["main:loading:v1"], "user_role": "developer"},
+        )
+        assert resp.json()["results"]["status/message"] == ["200 OK"]
+        resp = client.post(
+            "/get_feature_metadata",
+            json={"features": "main:loading:v1", "user_role": "developer"},
+        )
+        assert resp.status_code == 200
+        resp = client.get("/features/main:loading:v1?user_role=developer")
+        assert resp.json()["feature_name"] == "main:loading:v1"
+        # Scan waits for the load off the event loop
+        threading.Timer(0.05, backend.gate.set).start()
+        resp = client.post("/get_all_feature_metadata", json={"user_role": "developer"})
+        assert resp.json()["total_count"] == 1
+    finally:
+        backend.gate.set()
+        service.close()
+
+
+# Count-only listing
+def test_get_all_count_only():
+    ensure_service()
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={
+            "user_role": "developer",
+            "status": ["DRAFT", "DEPLOYED"],
+            "count_only": True,
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["metadata"] == []
+    listed = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "status": ["DRAFT", "DEPLOYED"]},
+    )
+    assert resp.json()["total_count"] == listed.json()["total_count"]
+
+
+# Time range filters, malformed ranges rejected
+def test_get_all_time_range():
+    ensure_service()
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "created_time": {"gte": 0}},
+    )
+    assert resp.status_code == 200
+    listed = client.post("/get_all_feature_metadata", json={"user_role": "developer"})
+    assert resp.json()["total_count"] == listed.json()["total_count"]
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "created_time": {"after": 0}},
+    )
+    assert resp.status_code == 400
+    assert "Invalid range filter" in resp.json()["detail"]
+
+
+# Namespace listing by name prefix
+def test_get_all_prefix():
+    ensure_service()
+    for name in ["prefix:listed:v1", "prefix:listed:v2"]:
+        client.post(
+            "/create_feature_metadata",
+            json={
+                "feature_name": name,
+                "feature_type": "batch",
+                "feature_data_type": "float",
+                "query": "SELECT 1",
+                "description": "desc",
+                "created_by": "dev",
+                "user_role": "developer",
+            },
+        )
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "prefix": "prefix:listed:"},
+    )
+    assert resp.status_code == 200
+    assert [meta["feature_name"] for meta in resp.json()["metadata"]] == [
+        "prefix:listed:v1",
+        "prefix:listed:v2",
+    ]
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "prefix": "prefix:", "count_only": True},
+    )
+    assert resp.json()["total_count"] == 2
+    resp = client.post(
+        "/get_all_feature_metadata", json={"user_role": "developer", "prefix": 5}
+    )
+    assert resp.status_code == 400
+
+
+# Filter expressions with explain output
+def test_get_all_where():
+    ensure_service()
+    where = {
+        "and": [
+            {"field": "feature_name", "prefix": "prefix:listed:"},
+            {"not": {"field": "feature_name", "contains": "v2"}},
+        ]
+    }
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "where": where, "explain": True},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [meta["feature_name"] for meta in body["metadata"]] == ["prefix:listed:v1"]
+    assert body["plan"]["access"] == "prefix index on feature_name"
+    assert body["plan"]["actual_rows"] == 1
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "where": where, "count_only": True},
+    )
+    assert resp.json() == {"metadata": [], "total_count": 1}
+    for body in [
+        {"where": where, "status": "DRAFT"},
+        {"where": {"field": "status", "like": "x"}},
+        {"explain": True},
+    ]:
+        resp = client.post(
+            "/get_all_feature_metadata", json=dict(body, user_role="developer")
+        )
+        assert resp.status_code == 400
+
+
+# Cursor pages over the listing
+def test_get_all_pages():
+    ensure_service()
+    listed = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "prefix": "prefix:"},
+    ).json()
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={"user_role": "developer", "prefix": "prefix:", "limit": 1},
+    )
+    assert resp.status_code == 200
+    first = resp.json()
+    assert "total_count" not in first
+    assert first["metadata"] == listed["metadata"][:1]
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={
+            "user_role": "developer",
+            "prefix": "prefix:",
+            "cursor": first["next_cursor"],
+            "include_total": True,
+        },
+    )
+    assert resp.json()["metadata"] == listed["metadata"][1:]
+    assert resp.json()["total_count"] == listed["total_count"]
+    assert resp.json()["next_cursor"] is None
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={
+            "user_role": "developer",
+            "where": {"field": "feature_name", "prefix": "prefix:"},
+            "limit": 1,
+            "explain": True,
+        },
+    )
+    assert resp.json()["plan"]["access"] == "prefix index on feature_name"
+    for body in [{"limit": 0}, {"cursor": "bad"}, {"limit": "all"}]:
+        resp = client.post(
+            "/get_all_feature_metadata", json=dict(body, user_role="developer")
+        )
+        assert resp.status_code == 400
+
+
+# Sorted top-N listing
+def test_get_all_order_by():
+    ensure_service()
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={
+            "user_role": "developer",
+            "prefix": "prefix:",
+            "order_by": "feature_name",
+            "order": "desc",
+            "limit": 1,
+        },
+    )
+    assert resp.status_code == 200
+    assert [meta["feature_name"] for meta in resp.json()["metadata"]] == [
+        "prefix:listed:v2"
+    ]
+    resp = client.post(
+        "/get_all_feature_metadata",
+        json={
+            "user_role": "developer",
+            "prefix": "prefix:",
+            "order_by": "feature_name",
+            "order": "desc",
+            "cursor": resp.json()["next_cursor"],
+        },
+    )
+    assert [meta["feature_name"] for meta in resp.json()["metadata"]] == [
+        "prefix:listed:v1"
+    ]
+    for body in [{"order_by": "created_time", "order": "down"}, {"order_by": "x"}]:
+        resp = client.post(
+            "/get_all_feature_metadata", json=dict(body, user_role="developer")
+        )
+        assert resp.status_code == 400
+
+
+# Read endpoints return only the requested fields
+def test_fields_projection():
+    ensure_service()
+    client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "fields:listed:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    fields = ["status", "feature_data_type"]
+    expected = {
+        "feature_name": "fields:listed:v1",
+        "status": "DRAFT",
+        "feature_data_type": "float",
+    }
+    resp = client.post(
+        "/get_feature_metadata",
+        json={
+            "features": "fields:listed:v1",
+            "user_role": "developer",
+            "fields": fields,
+        },
+    )
+    assert resp.json()["values"] == expected
+    resp = client.post(
+        "/get_feature_metadata",
+        json={
+            "features": ["fields:listed:v1", "fields:missing:v1"],
+            "user_role": "developer",
+            "fields": fields,
+        },
+    )
+    assert resp.json()["results"]["values"] == [expected, {}]
+    for body in [
+        {"prefix": "fields:"},
+        {"prefix": "fields:", "limit": 5},
+        {"where": {"field": "feature_name", "prefix": "fields:"}},
+    ]:
+        resp = client.post(
+            "/get_all_feature_metadata",
+            json=dict(body, user_role="developer", fields=fields),
+        )
+        assert resp.json()["metadata"] == [expected]
+    resp = client.post(
+        "/get_feature_metadata",
+        json={"features": "fields:listed:v1", "user_role": "developer", "fields": []},
+    )
+    assert resp.status_code == 422
+    for bad in [["nope"], "status", []]:
+        resp = client.post(
+            "/get_all_feature_metadata", json={"user_role": "developer", "fields": bad}
+        )
+        assert resp.status_code == 400
+
+
+# Group-by counts with and without filters
+def test_aggregate_feature_metadata(monkeypatch):
+    ensure_service()
+    for i in (1, 2):
+        client.post(
+            "/create_feature_metadata",
+            json={
+                "feature_name": f"facets:counted:v{i}",
+                "feature_type": "batch",
+                "feature_data_type": ["float", "int"][i - 1],
+                "query": "SELECT 1",
+                "description": "desc",
+                "created_by": "dev",
+                "user_role": "developer",
+            },
+        )
+    resp = client.post(
+        "/aggregate_feature_metadata",
+        json={
+            "user_role": "developer",
+            "group_by": ["feature_data_type", "status"],
+            "prefix": "facets:",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "total_count": 2,
+        "facets": {
+            "feature_data_type": [
+                {"value": "float", "count": 1},
+                {"value": "int", "count": 1},
+            ],
+            "status": [{"value": "DRAFT", "count": 2}],
+        },
+    }
+    resp = client.post(
+        "/aggregate_feature_metadata",
+        json={
+            "user_role": "developer",
+            "group_by": "status",
+            "where": {"field": "feature_name", "eq": "facets:counted:v2"},
+        },
+    )
+    assert resp.json()["total_count"] == 1
+    for body in [
+        {"group_by": "nope"},
+        {"group_by": "status", "status": "DRAFT", "where": {"field": "x", "eq": 1}},
+        {"group_by": "status", "user_role": "nobody"},
+    ]:
+        resp = client.post(
+            "/aggregate_feature_metadata", json=dict({"user_role": "developer"}, **body)
+        )
+        assert resp.status_code == 400
+    monkeypatch.setattr(
+        "app.services.feature_service.FeatureMetadataService.aggregate_feature_metadata",
+        lambda self, *args: (_ for _ in ()).throw(Exception("general error")),
+    )
+    resp = client.post(
+        "/aggregate_feature_metadata",
+        json={"user_role": "developer", "group_by": "status"},
+    )
+    assert resp.status_code == 500
+
+
+# Aggregate service not initialized
+def test_aggregate_service_not_initialized(monkeypatch):
+    monkeypatch.setattr("app.main.ensure_service", lambda: None)
+    monkeypatch.setattr("app.main.feature_service", None)
+    resp = client.post(
+        "/aggregate_feature_metadata",
+        json={"user_role": "developer", "group_by": "status"},
+    )
+    assert resp.status_code == 500
+    assert resp.json()["detail"] == "Service not initialized"
+
+
+# Spliced read bodies keep the response_model shapes
+def test_get_feature_metadata_spliced_body():
+    ensure_service()
+    client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "spliced:read:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    expected = FeatureMetadataSingleResponse.model_validate(
+        client.post(
+            "/get_feature_metadata",
+            json={"features": "spliced:read:v1", "user_role": "developer"},
+        ).json()
+    )
+    assert len(expected.values) == len(FeatureMetadata.model_fields)
+    assert expected.values["status"] == "DRAFT"
+    resp = client.post(
+        "/get_feature_metadata",
+        json={
+            "features": ["spliced:read:v1", "spliced:missing:v1"],
+            "user_role": "developer",
+        },
+    )
+    assert resp.headers["content-type"] == "application/json"
+    batch = FeatureMetadataBatchResponse.model_validate(resp.json())
+    assert batch.metadata == {"features": ["spliced:read:v1", "spliced:missing:v1"]}
+    assert batch.results["values"] == [expected.values, {}]
+    assert batch.results["status/message"] == [
+        "200 OK",
+        "Feature spliced:missing:v1 not found",
+    ]
+
+
+# Fast listing bodies equal the model dumps, schemas still documented
+def test_get_all_fast_response():
+    ensure_service()
+    client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "fastjson:listed:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    from app.main import feature_service
+
+    expected = FeatureMetadata(
+        **feature_service.metadata["fastjson:listed:v1"]
+    ).model_dump()
+    for body in [
+        {"prefix": "fastjson:"},
+        {"prefix": "fastjson:", "limit": 5},
+        {"where": {"field": "feature_name", "prefix": "fastjson:"}},
+    ]:
+        resp = client.post(
+            "/get_all_feature_metadata", json=dict(body, user_role="developer")
+        )
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json()["metadata"] == [expected]
+    paths = app.openapi()["paths"]
+    schema = paths["/get_feature_metadata"]["post"]["responses"]["200"]["content"]
+    refs = json.dumps(schema["application/json"]["schema"])
+    assert "FeatureMetadataSingleResponse" in refs
+    assert "FeatureMetadataBatchResponse" in refs
+    assert "200" in paths["/get_all_feature_metadata"]["post"]["responses"]
+
+
+# Cacheable single feature GET
+def test_get_feature_route():
+    ensure_service()
+    client.post(
+        "/create_feature_metadata",
+        json={
+            "feature_name": "cached:single:v1",
+            "feature_type": "batch",
+            "feature_data_type": "float",
+            "query": "SELECT 1",
+            "description": "desc",
+            "created_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    from app.main import feature_service
+
+    url = "/features/cached:single:v1?user_role=developer"
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.content == feature_service.get_feature_json("cached:single:v1")
+    assert resp.headers["cache-control"] == "public, max-age=5"
+    assert resp.headers["vary"] == "Origin"
+    etag = resp.headers["etag"]
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.headers["cache-control"] == "public, max-age=5"
+    resp = client.get(url + "&fields=status", headers={"If-None-Match": etag})
+    assert resp.json() == {"feature_name": "cached:single:v1", "status": "DRAFT"}
+    client.post(
+        "/update_feature_metadata",
+        json={
+            "feature_name": "cached:single:v1",
+            "description": "changed",
+            "last_updated_by": "dev",
+            "user_role": "developer",
+        },
+    )
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["description"] == "changed"
+
+
+# Single feature GET errors are never cached
+def test_get_feature_route_errors(monkeypatch):
+    resp = client.get("/features/cached:missing:v1?user_role=developer")
+    assert resp.status_code == 404
+    assert resp.headers["cache-control"] == "no-store"
+    resp = client.get("/features/cached:missing:v1?user_role=developer&fields=nope")
+    assert resp.status_code == 400
+    assert resp.headers["cache-control"] == "no-store"
+    for url in [
+        "/features/cached:missing:v1",
+        "/features/cached:missing:v1?user_role=",
+        "/features/cached:missing:v1?user_role=nope",
+    ]:
+        resp = client.get(url)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid role"
+        assert resp.headers["cache-control"] == "no-store"
+    monkeypatch.setattr(
+        "app.services.feature_service.FeatureMetadataService.get_versioned_json",
+        lambda self, x, y="developer", z=None, w=None: (_ for _ in ()).throw(
+            Exception("general error")
+        ),
+    )
+    resp = client.get("/features/cached:missing:v1?user_role=developer")
+    assert resp.status_code == 500
+    assert resp.headers["cache-control"] == "no-store"
+    monkeypatch.setattr("app.main.ensure_service", lambda: None)
+    monkeypatch.setattr("app.main.feature_service", None)
+    resp = client.get("/features/cached:missing:v1?user_role=developer")
+    assert resp.json()["detail"] == "Service not initialized"
+
+
+# Cacheable listing GETs
+def test_list_features_routes():
+    ensure_service()
+    for name in ["cachedlist:a:v1", "cachedlist:a:v2", "cachedlist:b:v1"]:
+        client.post(
+            "/create_feature_metadata",
+            json={
+                "feature_name": name,
+                "feature_type": "batch",
+                "feature_data_type": "float",
+                "query": "SELECT 1",
+                "description": "desc",
+                "created_by": "dev",
+                "user_role": "developer",
+            },
+        )
+    url = "/features?user_role=developer&prefix=cachedlist:&fields=status"
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.json()["total_count"] == 3
+    assert resp.json()["metadata"][0] == {
+        "feature_name": "cachedlist:a:v1",
+        "status": "DRAFT",
+    }
+    assert resp.headers["vary"] == "Origin"
+    etag = resp.headers["etag"]
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    other = client.get(url + "&limit=1").headers["etag"]
+    assert other != etag
+    resp = client.get(
+        "/features?user_role=developer&prefix=cachedlist:&limit=2"
+        "&created_time.gte=0&feature_type=batch&feature_type=real-time"
+    )
+    assert len(resp.json()["metadata"]) == 2
+    assert resp.json()["next_cursor"]
+    resp = client.get("/namespaces/cachedlist:a/features?user_role=developer")
+    assert [m["feature_name"] for m in resp.json()["metadata"]] == [
+        "cachedlist:a:v1",
+        "cachedlist:a:v2",
+    ]
+    client.post(
+        "/delete_feature_metadata",
+        json={
+            "feature_name": "cachedlist:b:v1",
+            "deleted_by": "dev",
+            "user_role": "developer",
+            "deletion_reason": "test",
+        },
+    )
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["metadata"][2]["status"] == "DELETED"
+
+
+# Listing GET errors are never cached
+def test_list_features_route_errors(monkeypatch):
+    for url in [
+        "/features?user_role=nope",
+        "/features?user_role=developer&limit=ten",
+        "/features?user_role=developer&count_only=maybe",
+        "/namespaces/cachedlist/features?user_role=developer&prefix=x",
+    ]:
+        resp = client.get(url)
+        assert resp.status_code == 400
+        assert resp.headers["cache-control"] == "no-store"
+    monkeypatch.setattr("app.main.ensure_service", lambda: None)
+    monkeypatch.setattr("app.main.feature_service", None)
+    resp = client.get("/features?user_role=developer")
+    assert resp.status_code == 500
+    assert resp.headers["cache-control"] == "no-store"
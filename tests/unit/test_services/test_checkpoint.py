@@ -0,0 +1,254 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services.checkpoint import SnapshotCheckpointer, create_checkpointer
+from app.services.feature_service import FeatureMetadataService
+from app.services.storage import FileBackend, SqliteBackend, StorageError
+
+
+class TestFileCheckpoint:
+    # Checkpoint writes snapshot and drops sealed log
+    def test_checkpoint_writes_snapshot(self, wal_service, sample_create_request):
+        wal_service.create_feature_metadata(sample_create_request)
+        wal = wal_service.backend.wal
+        size = wal_service.backend.checkpoint(wal_service._lock, wal_service.metadata)
+        data_file = wal_service.backend.data_file
+        assert size == data_file.stat().st_size
+        with open(data_file) as f:
+            assert sample_create_request["feature_name"] in json.load(f)
+        assert not wal.rotated_file.exists()
+        assert wal.record_count == 0
+        assert wal.byte_count == 0
+
+    # Writers proceed while snapshot is written
+    def test_writes_not_blocked(self, wal_service, make_service, create_request):
+        backend = wal_service.backend
+        started = threading.Event()
+        release = threading.Event()
+        original = backend.write_snapshot
+
+        def slow_write(metadata):
+            started.set()
+            assert release.wait(5)
+            return original(metadata)
+
+        with patch.object(backend, "write_snapshot", side_effect=slow_write):
+            thread = threading.Thread(
+                target=backend.checkpoint,
+                args=(wal_service._lock, wal_service.metadata),
+            )
+            thread.start()
+            assert started.wait(5)
+            wal_service.create_feature_metadata(create_request("late:write:v1"))
+            release.set()
+            thread.join(5)
+        with open(backend.data_file) as f:
+            assert "late:write:v1" not in json.load(f)
+        assert backend.wal.record_count == 1
+        restarted = make_service(backend.data_file)
+        assert "late:write:v1" in restarted.metadata
+        restarted.backend.close()
+
+    # Crash before snapshot replays sealed segment
+    def test_recover_rotated_segment(
+        self, wal_service, sample_create_request, make_service, create_request
+    ):
+        wal_service.create_feature_metadata(sample_create_request)
+        wal_service.backend.wal.rotate()
+        wal_service.create_feature_metadata(create_request("after:rotate:v1"))
+        restarted = make_service(wal_service.backend.data_file)
+        assert list(restarted.metadata) == [
+            sample_create_request["feature_name"],
+            "after:rotate:v1",
+        ]
+        assert restarted.backend.wal.record_count == 2
+        restarted.backend.close()
+
+    # Failed snapshot keeps both segments
+    def test_failed_snapshot_keeps_log(
+        self, wal_service, sample_create_request, make_service, create_request
+    ):
+        wal_service.create_feature_metadata(sample_create_request)
+        backend = wal_service.backend
+        with patch.object(backend, "write_snapshot", side_effect=OSError("full")):
+            with pytest.raises(OSError):
+                backend.checkpoint(wal_service._lock, wal_service.metadata)
+        wal_service.create_feature_metadata(create_request("second:try:v1"))
+        backend.checkpoint(wal_service._lock, wal_service.metadata)
+        restarted = make_service(backend.data_file)
+        assert len(restarted.metadata) == 2
+        restarted.backend.close()
+
+    # Rotation failure releases snapshot lock
+    def test_rotate_failure_releases_lock(self, wal_service):
+        backend = wal_service.backend
+        with patch.object(backend.wal, "rotate", side_effect=OSError("x")):
+            with pytest.raises(OSError):
+                backend.checkpoint(wal_service._lock, wal_service.metadata)
+        assert backend._snapshot_lock.acquire(blocking=False)
+        backend._snapshot_lock.release()
+
+    # Rotation merges into existing sealed segment
+    def test_rotate_merges_segments(self, tmp_path):
+        backend = FileBackend(tmp_path / "metadata.json", wal_enabled=True)
+        wal = backend.wal
+        wal.append({"op": "put", "key": "a", "value": {"x": 1}})
+        wal.rotate()
+        wal.append({"op": "put", "key": "b", "value": {"x": 2}})
+        wal.rotate()
+        wal.rotate()
+        assert not wal.log_file.exists()
+        assert [r["key"] for r in wal.replay()] == ["a", "b"]
+        wal.reset()
+        assert not wal.rotated_file.exists()
+        backend.close()
+
+    # Rotation waits for in-flight flush
+    def test_rotate_waits_for_flush(self, tmp_path):
+        backend = FileBackend(tmp_path / "metadata.json", wal_enabled=True)
+        wal = backend.wal
+        wal.append({"op": "put", "key": "a", "value": {}})
+        with wal._cond:
+            wal._flushing = True
+        thread = threading.Thread(target=wal.rotate)
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        with wal._cond:
+            wal._flushing = False
+            wal._cond.notify_all()
+        thread.join(5)
+        assert wal.rotated_file.exists()
+        backend.close()
+
+    # Plain file backend snapshots without log
+    def test_checkpoint_without_wal(self, tmp_path):
+        backend = FileBackend(tmp_path / "metadata.json")
+        lock = threading.RLock()
+        assert backend.checkpoint(lock, {"a:b:1": {"x": 1}}) > 0
+        assert backend.load() == {"a:b:1": {"x": 1}}
+
+
+class TestSqliteCheckpoint:
+    # SQLite checkpoint folds its journal
+    def test_sqlite_checkpoint(self, tmp_path):
+        backend = SqliteBackend(tmp_path / "metadata.db")
+        backend.put("a:b:1", {"a:b:1": {"feature_name": "a:b:1"}})
+        assert backend.checkpoint(threading.RLock(), {}) > 0
+        backend.close()
+        with pytest.raises(StorageError, match="Failed to checkpoint"):
+            backend.checkpoint(threading.RLock(), {})
+
+
+class TestSnapshotCheckpointer:
+    # Start and stop background thread
+    def test_start_stop(self, wal_service, sample_create_request):
+        checkpointer = SnapshotCheckpointer(wal_service, interval_seconds=3600)
+        wal_service.backend.compact_threshold = 50
+        checkpointer.start()
+        checkpointer.start()
+        assert wal_service.checkpointer is checkpointer
+        assert wal_service.backend.compact_threshold == 0
+        wal_service.create_feature_metadata(sample_create_request)
+        checkpointer.stop()
+        checkpointer.stop()
+        assert wal_service.checkpointer is None
+        assert checkpointer.checkpoint_count == 1
+        with open(wal_service.backend.data_file) as f:
+            assert sample_create_request["feature_name"] in json.load(f)
+
+    # Record threshold wakes thread
+    def test_record_trigger(self, wal_service, sample_create_request, create_request):
+        checkpointer = SnapshotCheckpointer(
+            wal_service, interval_seconds=3600, max_log_records=2
+        )
+        done = threading.Event()
+        original = checkpointer.checkpoint
+
+        def tracked():
+            original()
+            done.set()
+
+        checkpointer.checkpoint = tracked
+        checkpointer.start()
+        wal_service.create_feature_metadata(sample_create_request)
+        assert not checkpointer._wake.is_set()
+        wal_service.create_feature_metadata(create_request("second:feature:v1"))
+        assert done.wait(5)
+        checkpointer.stop(final_checkpoint=False)
+        assert checkpointer.stats()["checkpoints"] == 1
+        assert wal_service.backend.wal.record_count == 0
+
+    # Service reports stats only while a checkpointer runs
+    def test_service_stats(self, wal_service):
+        assert wal_service.checkpoint_stats() == {}
+        checkpointer = SnapshotCheckpointer(wal_service, interval_seconds=3600)
+        checkpointer.start()
+        checkpointer.checkpoint()
+        stats = wal_service.checkpoint_stats()
+        assert stats == checkpointer.stats()
+        assert stats["checkpoints"] == 1
+        assert stats["last_bytes"] == wal_service.backend.data_file.stat().st_size
+        checkpointer.stop(final_checkpoint=False)
+        assert wal_service.checkpoint_stats() == {}
+
+    # Byte threshold wakes thread
+    def test_byte_trigger(self, wal_service, sample_create_request):
+        checkpointer = SnapshotCheckpointer(wal_service, max_log_bytes=1)
+        wal_service.checkpointer = checkpointer
+        wal_service.create_feature_metadata(sample_create_request)
+        assert checkpointer._wake.is_set()
+
+    # Backends without log never trigger
+    def test_no_wal_no_trigger(self, tmp_path):
+        service = FeatureMetadataService(
+            str(tmp_path / "metadata.json"),
+            backend=FileBackend(tmp_path / "metadata.json"),
+        )
+        checkpointer = SnapshotCheckpointer(service, max_log_records=0)
+        checkpointer.notify_write()
+        assert not checkpointer._wake.is_set()
+
+    # Interval elapses into checkpoint
+    def test_interval_trigger(self, wal_service):
+        checkpointer = SnapshotCheckpointer(wal_service, interval_seconds=0.01)
+        checkpointer.start()
+        for _ in range(500):
+            if checkpointer.checkpoint_count:
+                break
+            threading.Event().wait(0.01)
+        checkpointer.stop(final_checkpoint=False)
+        assert checkpointer.checkpoint_count >= 1
+        assert checkpointer.stats()["last_checkpoint_time"] is not None
+
+    # Failures counted and logged
+    def test_checkpoint_error(self, wal_service, caplog):
+        checkpointer = SnapshotCheckpointer(wal_service)
+        with patch.object(
+            wal_service.backend, "write_snapshot", side_effect=OSError("full")
+        ):
+            checkpointer.checkpoint()
+        assert checkpointer.error_count == 1
+        assert checkpointer.checkpoint_count == 0
+        assert "Checkpoint failed" in caplog.text
+
+
+class TestCreateCheckpointer:
+    # Disabled by default
+    def test_disabled(self, wal_service, monkeypatch):
+        monkeypatch.delenv("FEATURE_METADATA_CHECKPOINT_INTERVAL", raising=False)
+        assert create_checkpointer(wal_service) is None
+
+    # Env configures triggers
+    def test_env_options(self, wal_service, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_CHECKPOINT_INTERVAL", "30")
+        monkeypatch.setenv("FEATURE_METADATA_CHECKPOINT_MAX_RECORDS", "500")
+        monkeypatch.setenv("FEATURE_METADATA_CHECKPOINT_MAX_BYTES", "4096")
+        checkpointer = create_checkpointer(wal_service)
+        assert checkpointer is not None
+        assert checkpointer.interval_seconds == 30
+        assert checkpointer.max_log_records == 500
+        assert checkpointer.max_log_bytes == 4096
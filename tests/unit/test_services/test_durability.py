@@ -0,0 +1,251 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.checkpoint import SnapshotCheckpointer
+from app.services.feature_service import FeatureMetadataService
+from app.services.flusher import AsyncFlusher
+from app.services.storage import (
+    FileBackend,
+    ShardedFileBackend,
+    SqliteBackend,
+    StorageBackend,
+    StorageError,
+)
+from app.services.wal import WriteAheadLog
+
+
+class TestLogDurability:
+    # Flushed batches skip fsync
+    def test_flushed_skips_fsync(self, tmp_path):
+        wal = WriteAheadLog(tmp_path / "test.wal")
+        with patch("app.services.wal.os.fsync") as fsync:
+            wal.wait(wal.submit({"key": "a"}, sync=False))
+        assert fsync.call_count == 0
+        assert [r["key"] for r in WriteAheadLog(wal.log_file).replay()] == ["a"]
+        wal.close()
+
+    # One sync writer syncs the shared batch
+    def test_mixed_batch_syncs(self, tmp_path):
+        wal = WriteAheadLog(tmp_path / "test.wal")
+        wal.submit({"key": "a"}, sync=False)
+        batch = wal.submit({"key": "b"})
+        with patch("app.services.wal.os.fsync") as fsync:
+            wal.wait(batch)
+        assert fsync.call_count == 1
+        wal.close()
+
+
+class TestBackendDurability:
+    # Snapshot rewrite without fsync
+    def test_file_flushed_put(self, tmp_path, make_record):
+        backend = FileBackend(tmp_path / "metadata.json")
+        with patch("app.services.snapshot.os.fsync") as fsync:
+            backend.put("a:b:1", {"a:b:1": make_record("a:b:1")}, "flushed")
+        assert fsync.call_count == 0
+        with open(tmp_path / "metadata.json") as f:
+            assert "a:b:1" in json.load(f)
+
+    # Many records share one snapshot rewrite
+    def test_file_put_many_without_wal(self, tmp_path, make_record):
+        backend = FileBackend(tmp_path / "metadata.json")
+        metadata = {n: make_record(n) for n in ["a:b:1", "c:d:1"]}
+        with patch.object(backend, "_write_all") as write_all:
+            assert backend.put_many(list(metadata), metadata) is None
+        write_all.assert_called_once_with(metadata, fsync=True)
+
+    # Many records share one log commit
+    def test_file_put_many_with_wal(self, tmp_path, make_record):
+        backend = FileBackend(tmp_path / "metadata.json", wal_enabled=True)
+        metadata = {n: make_record(n) for n in ["a:b:1", "c:d:1"]}
+        batch = backend.put_many(list(metadata) + ["gone:x:1"], metadata)
+        backend.wait(batch)
+        assert backend.wal.commit_count == 1
+        assert FileBackend(tmp_path / "metadata.json", wal_enabled=True).load() == (
+            metadata
+        )
+        backend.close()
+
+    # Log compacts past threshold
+    def test_file_put_many_compacts(self, tmp_path, make_record):
+        backend = FileBackend(
+            tmp_path / "metadata.json", wal_enabled=True, compact_threshold=2
+        )
+        metadata = {n: make_record(n) for n in ["a:b:1", "c:d:1"]}
+        backend.wait(backend.put_many(list(metadata), metadata))
+        assert backend.wal.record_count == 0
+        with open(tmp_path / "metadata.json") as f:
+            assert json.load(f) == metadata
+        backend.close()
+
+    # Default put_many loops put
+    def test_default_put_many(self):
+        class MemoryBackend(StorageBackend):
+            def __init__(self):
+                self.calls = []
+
+            def load(self):
+                return {}
+
+            def save_all(self, metadata):
+                pass
+
+            def put(self, feature_name, metadata, durability="sync"):
+                self.calls.append((feature_name, durability))
+                return None
+
+            def checkpoint(self, lock, metadata):
+                return 0
+
+        backend = MemoryBackend()
+        metadata = {"a:b:1": {}, "c:d:1": {}}
+        assert (
+            backend.put_many(["a:b:1", "x:y:1", "c:d:1"], metadata, "flushed") is None
+        )
+        assert backend.calls == [("a:b:1", "flushed"), ("c:d:1", "flushed")]
+
+    # Each touched shard written once
+    def test_sharded_put_many(self, tmp_path, make_record):
+        backend = ShardedFileBackend(tmp_path / "metadata.json")
+        metadata = {n: make_record(n) for n in ["a:x:1", "a:y:1", "b:z:1"]}
+        with patch("app.services.snapshot.os.fsync") as fsync:
+            backend.put_many(list(metadata), metadata, "flushed")
+        assert fsync.call_count == 0
+        assert sorted(p.name for p in backend.shard_dir.iterdir()) == [
+            "a.json",
+            "b.json",
+        ]
+        assert backend.load() == metadata
+
+    # Relaxed sync restored after write
+    def test_sqlite_flushed(self, tmp_path, make_record):
+        backend = SqliteBackend(tmp_path / "metadata.db")
+        metadata = {n: make_record(n) for n in ["a:b:1", "c:d:1"]}
+        backend.put_many(list(metadata), metadata, "flushed")
+        assert backend._conn.execute("PRAGMA synchronous").fetchone() == (2,)
+        assert backend.load() == metadata
+        backend.close()
+
+    # Failed batch rolled back
+    def test_sqlite_put_many_rollback(self, tmp_path, make_record):
+        backend = SqliteBackend(tmp_path / "metadata.db")
+        metadata = {"a:b:1": make_record("a:b:1"), "c:d:1": {"bad": {1, 2}}}
+        with pytest.raises(StorageError):
+            backend.put_many(list(metadata), metadata)
+        assert backend.load() == {}
+        backend.close()
+
+
+class TestServiceDurability:
+    # Unknown level rejected before mutation
+    def test_invalid_durability(self, wal_service, create_request):
+        request = create_request("a:b:1", "eventual")
+        with pytest.raises(ValueError, match="Invalid durability level"):
+            wal_service.create_feature_metadata(request)
+        assert wal_service.metadata == {}
+
+    # Invalid default rejected
+    def test_invalid_default(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_DURABILITY", "never")
+        with pytest.raises(ValueError, match="Invalid durability level"):
+            FeatureMetadataService(str(tmp_path / "metadata.json"))
+
+    # Env default applied
+    def test_env_default(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_DURABILITY", "Flushed")
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        assert service.default_durability == "flushed"
+
+    # Flushed write reaches the log without fsync
+    def test_flushed_write(self, wal_service, create_request):
+        request = create_request("a:b:1", "flushed")
+        with patch("app.services.wal.os.fsync") as fsync:
+            wal_service.create_feature_metadata(request)
+        assert fsync.call_count == 0
+        assert wal_service.backend.wal.record_count == 1
+
+    # Async write acked before persistence, flushed later
+    def test_async_write(self, wal_service, create_request):
+        request = create_request("a:b:1", "async")
+        with patch.object(AsyncFlusher, "start"):
+            wal_service.create_feature_metadata(request)
+        assert "a:b:1" in wal_service.metadata
+        assert wal_service.backend.wal.record_count == 0
+        lag = wal_service.persistence_lag()
+        assert lag["pending_writes"] == 1
+        assert lag["lag_ms"] >= 0
+        assert wal_service.flusher.flush() == 1
+        assert wal_service.flusher.flush() == 0
+        assert wal_service.backend.wal.record_count == 1
+        assert wal_service.persistence_lag()["pending_writes"] == 0
+        assert wal_service.persistence_lag()["flushed_records"] == 1
+
+    # Background thread persists async writes
+    def test_background_flush(
+        self, tmp_path, monkeypatch, make_service, create_request
+    ):
+        monkeypatch.setenv("FEATURE_METADATA_ASYNC_FLUSH_MS", "1")
+        service = make_service(tmp_path / "metadata.json", compact_threshold=0)
+        service.create_feature_metadata(create_request("a:b:1", "async"))
+        deadline = time.monotonic() + 5
+        while service.persistence_lag()["flushes"] == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        service.close()
+        restarted = make_service(tmp_path / "metadata.json")
+        assert "a:b:1" in restarted.metadata
+        restarted.close()
+
+    # Close drains pending writes
+    def test_close_flushes(self, tmp_path, make_service, create_request):
+        service = make_service(tmp_path / "metadata.json", compact_threshold=0)
+        service.create_feature_metadata(create_request("a:b:1", "async"))
+        flusher = service.flusher
+        flusher.start()
+        service.close()
+        assert service.flusher is None
+        assert flusher.stats()["pending_writes"] == 0
+        restarted = make_service(tmp_path / "metadata.json")
+        assert "a:b:1" in restarted.metadata
+        restarted.close()
+
+    # Failed flush keeps records queued
+    def test_flush_error_requeues(self, wal_service, create_request):
+        with patch.object(AsyncFlusher, "start"):
+            wal_service.create_feature_metadata(create_request("a:b:1", "async"))
+            wal_service.create_feature_metadata(create_request("c:d:1", "async"))
+        flusher = wal_service.flusher
+        with patch.object(
+            wal_service.backend, "put_many", side_effect=StorageError("full")
+        ):
+            assert flusher.flush() == 0
+
+        # Write queued while the failing commit waits
+        def failing_wait(batch):
+            flusher.mark("a:b:1")
+            flusher.mark("e:f:1")
+            raise OSError("disk")
+
+        with patch.object(wal_service.backend, "wait", side_effect=failing_wait):
+            assert flusher.flush() == 0
+        stats = wal_service.persistence_lag()
+        assert stats["errors"] == 2
+        assert stats["pending_writes"] == 3
+        assert list(flusher._pending) == ["a:b:1", "c:d:1", "e:f:1"]
+        assert flusher.flush() == 3
+
+    # Flush wakes checkpointer
+    def test_flush_notifies_checkpointer(self, wal_service, create_request):
+        wal_service.checkpointer = SnapshotCheckpointer(wal_service)
+        with patch.object(AsyncFlusher, "start"):
+            wal_service.create_feature_metadata(create_request("a:b:1", "async"))
+        with patch.object(wal_service.checkpointer, "notify_write") as notify:
+            wal_service.flusher.flush()
+        notify.assert_called_once()
+
+    # No flusher reports zero lag
+    def test_idle_lag(self, wal_service):
+        assert wal_service.persistence_lag()["pending_writes"] == 0
+        assert wal_service.persistence_lag()["lag_ms"] == 0.0
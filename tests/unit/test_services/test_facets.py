@@ -0,0 +1,96 @@
+from collections import Counter
+
+import pytest
+
+from app.services.facets import buckets, check_group_by, scan_counts
+
+
+# Service with mixed statuses, creators and a record without last_updated_by
+@pytest.fixture
+def service(populated_service):
+    populated_service.delete_feature_metadata(
+        {"feature_name": "a:feature:v2", "deleted_by": "dev", "user_role": "developer"}
+    )
+    record = populated_service.metadata["b:feature:v3"]
+    del record["last_updated_by"]
+    populated_service.indexes.update("b:feature:v3", record)
+    return populated_service
+
+
+# Group-by counts of a listing, counted record by record
+def reference(records, field):
+    return buckets(
+        Counter(str(meta[field]) if field in meta else None for meta in records)
+    )
+
+
+class TestFacets:
+    # Field names checked against the model, one name allowed
+    def test_check_group_by(self):
+        assert check_group_by("status") == ["status"]
+        assert check_group_by(["status", "created_by", "status"]) == [
+            "status",
+            "created_by",
+        ]
+        for bad in [None, [], [1], ["nope"]]:
+            with pytest.raises(ValueError, match="Invalid group_by"):
+                check_group_by(bad)
+
+    # Largest first, ties by value, missing last
+    def test_buckets(self):
+        counts = scan_counts([{"x": 1}, {"x": "b"}, {}, {"x": "a"}, {"x": 1}], "x")
+        assert buckets(counts) == [
+            {"value": "1", "count": 2},
+            {"value": "a", "count": 1},
+            {"value": "b", "count": 1},
+            {"value": None, "count": 1},
+        ]
+
+    # Counters, popcounts and scans agree with counting the listing
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"filters": {"status": "DRAFT"}},
+            {"filters": {"feature_type": "batch", "created_by": "user1"}},
+            {"filters": {"description": "desc 1"}},
+            {"filters": {"created_by": "user0", "status": ["DRAFT", "DELETED"]}},
+            {"filters": {"feature_type": "batc"}},
+            {"filters": {"status": "NOPE"}},
+            {"prefix": "a:"},
+            {"where": {"field": "feature_name", "contains": "v1"}},
+        ],
+    )
+    def test_matches_listing(self, service, kwargs):
+        fields = [
+            "status",
+            "feature_type",
+            "created_by",
+            "last_updated_by",
+            "approved_by",
+        ]
+        result = service.aggregate_feature_metadata("developer", fields, **kwargs)
+        if "where" in kwargs:
+            listed = service.query_feature_metadata("developer", kwargs["where"])[0]
+        else:
+            listed = service.get_all_feature_metadata(
+                "developer", kwargs.get("filters"), kwargs.get("prefix")
+            )
+        records = [service.metadata[name] for name in listed]
+        assert result["total_count"] == len(records)
+        for field in fields:
+            assert result["facets"][field] == reference(records, field)
+
+    # Counters follow mutations without a rebuild
+    def test_counters_follow_mutations(self, service, sample_create_request):
+        before = service.aggregate_feature_metadata("developer", "status")
+        service.create_feature_metadata(
+            dict(sample_create_request, feature_name="c:feature:v1")
+        )
+        after = service.aggregate_feature_metadata("developer", "status")
+        assert after["total_count"] == before["total_count"] + 1
+        assert after["facets"]["status"] == reference(
+            service.metadata.values(), "status"
+        )
+        with pytest.raises(ValueError, match="Invalid group_by"):
+            service.aggregate_feature_metadata("developer", ["nope"])
@@ -50,12 +50,6 @@ class TestFeatureMetadataService:
         assert service.metadata == {}
         temp_path.unlink()
 
-    # Save data IO error
-    def test_save_data_io_error(self, temp_service):
-        with patch("builtins.open", side_effect=OSError("Mock IO error")):
-            with pytest.raises(Exception, match="Failed to save data"):
-                temp_service._save_data()
-
     # Convert dict method test
     def test_convert_request_to_dict_with_dict(self, temp_service):
         class DictOnly:
@@ -191,7 +185,7 @@ class TestFeatureMetadataService:
         deployed_metadata = sample_feature_metadata.copy()
         deployed_metadata["status"] = "DEPLOYED"
         temp_service.metadata[deployed_metadata["feature_name"]] = deployed_metadata
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": deployed_metadata["feature_name"],
             "user_role": "developer",
@@ -206,7 +200,7 @@ class TestFeatureMetadataService:
         testing_metadata = sample_feature_metadata.copy()
         testing_metadata["status"] = "READY_FOR_TESTING"
         temp_service.metadata[testing_metadata["feature_name"]] = testing_metadata
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": testing_metadata["feature_name"],
             "user_role": "developer",
@@ -221,7 +215,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_feature_metadata["feature_name"]] = (
             sample_feature_metadata.copy()
         )
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": sample_feature_metadata["feature_name"],
             "user_role": "developer",
@@ -240,7 +234,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_feature_metadata["feature_name"]] = (
             sample_feature_metadata.copy()
         )
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": sample_feature_metadata["feature_name"],
             "user_role": "developer",
@@ -256,7 +250,7 @@ class TestFeatureMetadataService:
         deployed_metadata = sample_feature_metadata.copy()
         deployed_metadata["status"] = "DEPLOYED"
         temp_service.metadata[deployed_metadata["feature_name"]] = deployed_metadata
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": deployed_metadata["feature_name"],
             "user_role": "developer",
@@ -284,7 +278,7 @@ class TestFeatureMetadataService:
         deployed_metadata = sample_feature_metadata.copy()
         deployed_metadata["status"] = "DEPLOYED"
         temp_service.metadata[deployed_metadata["feature_name"]] = deployed_metadata
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         request_data = {
             "feature_name": deployed_metadata["feature_name"],
             "user_role": "developer",
@@ -323,7 +317,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_create_request["feature_name"]][
             "status"
         ] = "READY_FOR_TESTING"
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         submit_request = {
             "feature_name": sample_create_request["feature_name"],
             "user_role": "developer",
@@ -338,7 +332,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_create_request["feature_name"]][
             "status"
         ] = "READY_FOR_TESTING"
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         test_request = {
             "feature_name": sample_create_request["feature_name"],
             "user_role": "notarole",
@@ -377,7 +371,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_create_request["feature_name"]][
             "status"
         ] = "READY_FOR_TESTING"
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         test_request = {
             "feature_name": sample_create_request["feature_name"],
             "user_role": "tester",
@@ -395,7 +389,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_create_request["feature_name"]][
             "status"
         ] = "TEST_SUCCEEDED"
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         approve_request = {
             "feature_name": sample_create_request["feature_name"],
             "user_role": "notarole",
@@ -434,7 +428,7 @@ class TestFeatureMetadataService:
         temp_service.metadata[sample_create_request["feature_name"]][
             "status"
         ] = "TEST_SUCCEEDED"
-        temp_service._save_data()
+        temp_service.backend.save_all(temp_service.metadata)
         reject_request = {
             "feature_name": sample_create_request["feature_name"],
             "user_role": "notarole",
@@ -524,13 +518,6 @@ def test_convert_request_to_dict_dict_not_dict(temp_service):
         temp_service._convert_request_to_dict(BadDict())
 
 
-# Save data unexpected error
-def test_save_data_unexpected_error(temp_service):
-    with patch("builtins.open", side_effect=RuntimeError("fail")):
-        with pytest.raises(RuntimeError, match="fail"):
-            temp_service._save_data()
-
-
 # Fuzzy match logic test
 def test_fuzzy_match_logic(temp_service):
     temp_service.metadata = {
@@ -633,3 +620,42 @@ def test_delete_feature_permission_denied(temp_service, sample_create_request):
     }
     with pytest.raises(ValueError):
         temp_service.delete_feature_metadata(request_data)
+
+
+# Batch read test
+def test_get_many(temp_service, sample_create_request):
+    temp_service.create_feature_metadata(sample_create_request)
+    name = sample_create_request["feature_name"]
+    found = temp_service.get_many(["missing:x:v1", name, "missing:x:v1"])
+    assert list(found) == ["missing:x:v1", name]
+    assert found["missing:x:v1"] is None
+    assert found[name] == temp_service.get_feature_metadata(name)
+    projected = temp_service.get_many([name], fields=["status"])
+    assert projected == {name: {"feature_name": name, "status": "DRAFT"}}
+    encoded = temp_service.get_many([name], encoded=True)
+    assert encoded[name] == temp_service.get_feature_json(name)
+    with pytest.raises(ValueError, match="Invalid fields"):
+        temp_service.get_many([name], fields=["nope"])
+
+
+# Batch lock test
+def test_get_many_single_lock(temp_service, sample_create_request):
+    temp_service.create_feature_metadata(sample_create_request)
+    names = [sample_create_request["feature_name"], "missing:x:v1"] * 3
+    acquired = []
+    lock = temp_service._lock
+
+    class CountingLock:
+        def __enter__(self):
+            acquired.append(1)
+            return lock.__enter__()
+
+        def __exit__(self, *exc):
+            return lock.__exit__(*exc)
+
+    temp_service._lock = CountingLock()
+    try:
+        temp_service.get_many(names, encoded=True)
+    finally:
+        temp_service._lock = lock
+    assert len(acquired) == 1
@@ -0,0 +1,74 @@
+import difflib
+import random
+
+from app.services.fuzzy import FuzzyScorer, fuzzy_matches
+
+
+# Original per-record difflib scan
+def reference_matches(records, filters, threshold):
+    matched = []
+    for feature_name, record in records:
+        match_score = 0.0
+        match_fields = 0
+        for key, value in filters.items():
+            if key in record and record[key] is not None:
+                match_fields += 1
+                match_score += difflib.SequenceMatcher(
+                    None, str(record[key]), str(value)
+                ).ratio()
+        if match_fields > 0 and (match_score / match_fields) >= threshold:
+            matched.append(feature_name)
+    return matched
+
+
+class TestFuzzyScorer:
+    # Bound never below the exact score, both memoised
+    def test_bound_and_score(self):
+        scorer = FuzzyScorer("batch")
+        for value in ["batch", "batc", "hctab", "real-time", "", "b"]:
+            assert scorer.bound(value) >= scorer.score(value)
+            assert scorer.score(value) == (
+                difflib.SequenceMatcher(None, value, "batch").ratio()
+            )
+        assert set(scorer.scores) == set(scorer.bounds)
+        assert FuzzyScorer("").bound("") == FuzzyScorer("").score("") == 1.0
+
+    # Shortlisting does not depend on shared trigrams
+    def test_no_shared_trigram(self):
+        assert list(fuzzy_matches([("a", {"f": "axbxc"})], {"f": "abc"}, 0.7)) == ["a"]
+
+
+class TestFuzzyMatches:
+    # Same names as the full difflib scan
+    def test_equivalent_to_scan(self):
+        rng = random.Random(7)
+        words = ["batch", "real-time", "DRAFT", "DEPLOYED", "alice", "bob", ""]
+
+        def mutate(word):
+            chars = list(word)
+            for _ in range(rng.randint(0, 2)):
+                if chars and rng.random() < 0.5:
+                    del chars[rng.randrange(len(chars))]
+                else:
+                    chars.insert(rng.randint(0, len(chars)), rng.choice("abtxe"))
+            return "".join(chars)
+
+        records = [
+            (
+                f"r{i}",
+                {
+                    key: rng.choice([None, 1, mutate(rng.choice(words))])
+                    for key in rng.sample(["a", "b", "c"], rng.randint(0, 3))
+                },
+            )
+            for i in range(400)
+        ]
+        for _ in range(40):
+            filters = {
+                key: mutate(rng.choice(words))
+                for key in rng.sample(["a", "b", "c"], rng.randint(1, 3))
+            }
+            for threshold in [0.5, 0.7, 0.9]:
+                assert list(fuzzy_matches(records, filters, threshold)) == (
+                    reference_matches(records, filters, threshold)
+                )
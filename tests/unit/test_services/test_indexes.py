@@ -0,0 +1,425 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.indexes import (
+    BitmapIndex,
+    CatalogIndex,
+    HashIndex,
+    OrderedIndex,
+    in_range,
+    iter_bitmap,
+    range_bounds,
+    to_bitmap,
+)
+
+
+# Service over a temporary store
+@pytest.fixture
+def service(tmp_path):
+    return FeatureMetadataService(str(tmp_path / "metadata.json"))
+
+
+class TestHashIndex:
+    # Records move between value buckets
+    def test_update_moves_bucket(self):
+        index = HashIndex("status")
+        index.update(0, {"status": "DRAFT"})
+        index.update(1, {"status": "DRAFT"})
+        index.update(0, {"status": "DEPLOYED"})
+        index.update(0, {"status": "DEPLOYED"})
+        assert index.lookup("DRAFT") == {1}
+        assert index.lookup("DEPLOYED") == {0}
+        index.update(1, {"status": "DEPLOYED"})
+        assert "DRAFT" not in index.buckets
+        assert index.counts() == {"DEPLOYED": 2}
+        assert index.counts({1, 5}) == {"DEPLOYED": 1}
+
+    # Values compared as strings, missing field matches anything
+    def test_lookup_semantics(self):
+        index = HashIndex("approved_by")
+        index.update(0, {"approved_by": None})
+        index.update(1, {"approved_by": 7})
+        index.update(2, {})
+        assert index.lookup(7) == {1, 2}
+        assert index.lookup("7") == {1, 2}
+        assert index.lookup("None") == {0, 2}
+        assert index.lookup("x") == {2}
+
+
+class TestBitmapIndex:
+    # Bits packed and unpacked in id order
+    def test_bitmap_round_trip(self):
+        assert to_bitmap([0, 3, 9], 10) == 0b1000001001
+        assert list(iter_bitmap(0b1000001001)) == [0, 3, 9]
+        assert list(iter_bitmap(0)) == []
+
+    # Built and incrementally updated bitsets agree
+    def test_build_matches_update(self):
+        records = [{"status": "DRAFT"}, {"status": "DEPLOYED"}, {}, {"status": 1}]
+        built, updated = BitmapIndex("status"), BitmapIndex("status")
+        built.build(records)
+        for record_id, record in enumerate(records):
+            updated.update(record_id, record)
+        assert built.bitmaps == updated.bitmaps
+        assert (
+            built.sizes == updated.sizes == {"DRAFT": 1, "DEPLOYED": 1, None: 1, "1": 1}
+        )
+        assert built.lookup("DRAFT") == 0b0101
+        assert built.lookup(["DRAFT", "1"]) == 0b1101
+
+    # Bit moves between values, empty bitsets dropped
+    def test_update_moves_bit(self):
+        index = BitmapIndex("status")
+        index.update(0, {"status": "DRAFT"})
+        index.update(0, {"status": "DRAFT"})
+        index.update(0, {"status": "DEPLOYED"})
+        assert index.bitmaps == {"DEPLOYED": 1}
+        index.update(1, {"status": "DEPLOYED"})
+        index.update(2, {"status": "DRAFT"})
+        index.update(1, {"status": "DRAFT"})
+        assert index.counts() == {"DEPLOYED": 1, "DRAFT": 2}
+        assert index.counts(0b110) == {"DRAFT": 2}
+
+
+class TestOrderedIndex:
+    # Bounds normalised to integer [lower, upper)
+    def test_range_bounds(self):
+        assert range_bounds({"gte": 5, "lt": 9}) == (5, 9)
+        assert range_bounds({"gt": 5, "lte": 9}) == (6, 10)
+        assert range_bounds({"gte": 1.5, "lt": 2.5}) == (2, 3)
+        assert range_bounds({"gt": 1.5, "lte": 2.5}) == (2, 3)
+        assert range_bounds({"gte": 1, "gt": 3, "lt": 9, "lte": 4}) == (4, 5)
+        assert range_bounds({}) == (None, None)
+        for bad in [{"eq": 1}, {"gte": "1"}, {"lt": True}, {"gt": float("nan")}]:
+            with pytest.raises(ValueError, match="Invalid range filter"):
+                range_bounds(bad)
+
+    # Only integral numbers fall inside a range
+    def test_in_range(self):
+        assert in_range(2.0, {"gt": 1, "lte": 2})
+        assert not in_range(1.5, {"gt": 1, "lte": 2})
+        assert not in_range(2, {"gte": 1, "lt": 2})
+        assert not in_range(0, {"gte": 1})
+        assert not in_range(3, {"lte": 2})
+        assert not in_range(1, {"gt": 1})
+        assert not in_range(None, {})
+        assert not in_range(True, {})
+        assert not in_range("1", {})
+
+    # Built and incrementally updated keys agree, non-integers skipped
+    def test_build_matches_update(self):
+        records = [
+            {"t": 5},
+            {"t": 1},
+            {},
+            {"t": None},
+            {"t": 5.0},
+            {"t": True},
+            {"t": 2.5},
+        ]
+        built, updated = OrderedIndex("t"), OrderedIndex("t")
+        built.build(records)
+        for record_id, record in enumerate(records):
+            updated.update(record_id, record)
+        assert built.keys == updated.keys
+        assert built.values == updated.values == {0: 5, 1: 1, 4: 5}
+        assert built.range({"gte": 5}) == {0, 4}
+        assert built.range({"lt": 5}) == {1}
+        assert built.range({}) == {0, 1, 4}
+
+    # Key moves with the value, dropped when the value goes
+    def test_update_moves_key(self):
+        index = OrderedIndex("t")
+        index.update(0, {"t": 1})
+        index.update(1, {"t": -3})
+        index.update(0, {"t": 1})
+        index.update(0, {"t": 7})
+        assert index.range({"gte": 0}) == {0}
+        assert index.range({"lt": 0}) == {1}
+        index.update(0, {})
+        assert index.range({}) == {1}
+        assert index.values == {1: -3}
+
+
+class TestCatalogIndex:
+    # Intersection returned in catalog order
+    def test_match(self, make_record):
+        index = CatalogIndex()
+        metadata = {
+            "a": make_record("a", feature_type="batch"),
+            "b": make_record("b", feature_type="real-time"),
+            "c": make_record("c", feature_type="batch", status="DEPLOYED"),
+        }
+        index.sync(metadata)
+        assert index.match({"feature_type": "batch"}) == ["a", "c"]
+        assert index.match({"feature_type": "batch", "status": "DRAFT"}) == ["a"]
+        assert index.match({"feature_type": "x", "status": "DRAFT"}) == []
+        assert index.match({"description": "d"}) is None
+        assert index.match({"created_time": {"gte": 2}}) == []
+        assert index.is_indexed("created_time", {"gte": 0})
+        assert not index.is_indexed("created_time", 1)
+        assert not index.is_indexed("status", {"gte": 0})
+
+    # AND across fields, OR within a list, counts by popcount
+    def test_bitmap_filters(self, make_record):
+        index = CatalogIndex()
+        metadata = {
+            "a": make_record("a", feature_type="batch", created_by="x"),
+            "b": make_record("b", feature_type="real-time", status="DEPLOYED"),
+            "c": make_record("c", feature_type="batch", status="DEPLOYED"),
+            "d": make_record("d", feature_type="batch", created_by="y"),
+        }
+        # Records without the field match any value
+        del metadata["b"]["created_by"], metadata["c"]["created_by"]
+        index.sync(metadata)
+        filters = {"feature_type": "batch", "status": ["DRAFT", "DEPLOYED"]}
+        assert index.match(filters) == ["a", "c", "d"]
+        assert index.count(filters) == 3
+        assert index.match(dict(filters, created_by="x")) == ["a", "c"]
+        assert index.match({"created_by": ["x", "y"]}) == ["a", "b", "c", "d"]
+        assert index.count({"created_by": "x", "approved_by": "z"}) == 3
+        assert index.match({"created_by": "q", "approved_by": "z", "tested_by": 1}) == [
+            "b",
+            "c",
+        ]
+        assert index.count({"description": "d"}) is None
+        index.sync({"e": make_record("e", created_by="x")})
+        assert (
+            index.match({"created_by": "q", "approved_by": "z", "tested_by": 1}) == []
+        )
+
+    # Ranges intersect with equality sets and bitsets
+    def test_range_filters(self, make_record):
+        index = CatalogIndex()
+        index.sync(
+            {
+                name: make_record(name, created_by=by, updated_time=time)
+                for name, by, time in [("a", "x", 3), ("b", "y", 1), ("c", "x", 2)]
+            }
+        )
+        unstamped = make_record("d", created_by="x")
+        del unstamped["updated_time"]
+        index.update("d", unstamped)
+        assert index.match({"updated_time": {"gte": 2}}) == ["a", "c"]
+        assert index.match({"updated_time": {"lt": 3}, "created_by": "x"}) == ["c"]
+        assert index.match({"updated_time": {"gt": 1}, "status": "DRAFT"}) == [
+            "a",
+            "c",
+        ]
+        assert index.count({"updated_time": {"lte": 3}, "created_by": "y"}) == 1
+        index.update("a", make_record("a", updated_time=0))
+        assert index.match({"updated_time": {"lt": 2}}) == ["a", "b"]
+
+    # Prefix listing in string order, combined with filters in catalog order
+    def test_prefix(self, make_record):
+        index = CatalogIndex()
+        index.sync(
+            {
+                name: make_record(name)
+                for name in ["fraud:b:v1", "fraud:a:v2", "fraudx:a:v1", "fr:a:v1"]
+            }
+        )
+        index.update("fraud:a:v1", make_record("fraud:a:v1", status="DEPLOYED"))
+        assert index.with_prefix("fraud:") == ["fraud:a:v1", "fraud:a:v2", "fraud:b:v1"]
+        assert index.with_prefix("fraud:a:") == ["fraud:a:v1", "fraud:a:v2"]
+        assert index.with_prefix("zzz") == []
+        assert len(index.with_prefix("")) == 5
+        assert index.match({}, "fraud:") == ["fraud:b:v1", "fraud:a:v2", "fraud:a:v1"]
+        assert index.match({"status": "DRAFT"}, "fraud") == [
+            "fraud:b:v1",
+            "fraud:a:v2",
+            "fraudx:a:v1",
+        ]
+        assert index.count({"created_by": "dev"}, "fraud:a:") == 2
+        assert index.count({}, "fr:") == 1
+
+    # Replaced or externally filled catalog rebuilt
+    def test_sync_rebuilds(self, make_record):
+        index = CatalogIndex(["status"])
+        metadata = {"a": make_record("a")}
+        index.sync(metadata)
+        metadata["b"] = make_record("b")
+        index.update("c", make_record("c"))
+        index.sync(metadata)
+        assert index.names == ["a", "b"]
+        assert index.sorted_names == ["a", "b"]
+        replaced = {"z": make_record("z")}
+        index.sync(replaced)
+        assert index.match({"status": "DRAFT"}) == ["z"]
+
+
+class TestServiceIndexes:
+    # Workflow mutations keep the index current
+    def test_maintained_on_mutation(self, service, sample_create_request):
+        service.create_feature_metadata(sample_create_request)
+        name = sample_create_request["feature_name"]
+        service.submit_test_feature_metadata(
+            {"feature_name": name, "user_role": "developer", "submitted_by": "dev"}
+        )
+        assert service.indexes.match({"status": "DRAFT"}) == []
+        assert list(
+            service.get_all_feature_metadata(
+                "developer", {"status": "READY_FOR_TESTING"}
+            )
+        ) == [name]
+        service.test_feature_metadata(
+            {
+                "feature_name": name,
+                "user_role": "tester",
+                "test_result": "TEST_SUCCEEDED",
+                "tested_by": "qa",
+            }
+        )
+        result = service.get_all_feature_metadata(
+            "developer", {"status": "TEST_SUCCEEDED", "tested_by": "qa"}
+        )
+        assert list(result) == [name]
+
+    # Non-indexed filters checked on candidates only
+    def test_residual_filters(self, service, sample_create_request):
+        for suffix, description in [("1", "one"), ("2", "two")]:
+            service.create_feature_metadata(
+                dict(
+                    sample_create_request,
+                    feature_name=f"idx:f:v{suffix}",
+                    description=description,
+                )
+            )
+        result = service.get_all_feature_metadata(
+            "developer", {"status": "DRAFT", "description": "two"}
+        )
+        assert list(result) == ["idx:f:v2"]
+
+    # Loaded catalog indexed at startup
+    def test_indexed_on_load(self, tmp_path, sample_create_request):
+        data_file = str(tmp_path / "metadata.json")
+        FeatureMetadataService(data_file).create_feature_metadata(sample_create_request)
+        restarted = FeatureMetadataService(data_file)
+        assert restarted.indexes.match({"created_by": "test_user"}) == [
+            sample_create_request["feature_name"]
+        ]
+
+    # Counts without listing, falling back like the listing does
+    def test_count(self, service, sample_create_request):
+        for suffix, feature_type in [("1", "batch"), ("2", "real-time")]:
+            service.create_feature_metadata(
+                dict(
+                    sample_create_request,
+                    feature_name=f"cnt:f:v{suffix}",
+                    feature_type=feature_type,
+                )
+            )
+        assert service.count_feature_metadata("developer") == 2
+        assert (
+            service.count_feature_metadata(
+                "developer", {"feature_type": ["batch", "real-time"], "status": "DRAFT"}
+            )
+            == 2
+        )
+        assert (
+            service.count_feature_metadata(
+                "developer",
+                {"feature_type": "batch", "description": "Test create feature"},
+            )
+            == 1
+        )
+        assert (
+            service.count_feature_metadata(
+                "developer", {"description": ["Test create feature"]}
+            )
+            == 2
+        )
+        # Fuzzy fallback counted when nothing matches exactly
+        assert service.count_feature_metadata(
+            "developer", {"feature_type": "batc"}
+        ) == (
+            len(service.get_all_feature_metadata("developer", {"feature_type": "batc"}))
+        )
+
+    # Range filters exact on indexed and residual fields, 400 on bad input
+    def test_range_filters(self, service, sample_create_request):
+        names = [f"rng:f:v{i}" for i in range(1, 4)]
+        for i, name in enumerate(names):
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=name)
+            )
+            record = service.metadata[name]
+            record.update(deployed_time=100 * i if i else None, version=i)
+            service.indexes.update(name, record)
+        result = service.get_all_feature_metadata(
+            "developer", {"deployed_time": {"gte": 0, "lt": 200}}
+        )
+        assert list(result) == [names[1]]
+        result = service.get_all_feature_metadata(
+            "developer", {"version": {"gt": 0.5}, "status": "DRAFT"}
+        )
+        assert list(result) == names[1:]
+        assert service.count_feature_metadata("developer", {"version": {"lte": 0}}) == 1
+        # Fuzzy fallback keeps the range exact
+        result = service.get_all_feature_metadata(
+            "developer", {"deployed_time": {"gte": 150}, "status": "DRAF"}
+        )
+        assert list(result) == [names[2]]
+        assert (
+            service.get_all_feature_metadata(
+                "developer", {"deployed_time": {"gte": 1000}, "status": "DRAF"}
+            )
+            == {}
+        )
+        with pytest.raises(ValueError, match="Invalid range filter"):
+            service.get_all_feature_metadata("developer", {"created_time": {"eq": 1}})
+
+    # Index and scan agree on float times, integral ones included
+    def test_float_times(self, service, sample_create_request):
+        names = [f"flt:f:v{i}" for i in range(1, 4)]
+        for name, updated_time in zip(names, [5, 6.0, 6.5], strict=True):
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=name)
+            )
+            record = service.metadata[name]
+            record["updated_time"] = updated_time
+            service.indexes.update(name, record)
+        for bounds in [{"gte": 5}, {"gt": 5}, {"lt": 7}, {"gt": 5.5, "lte": 6.5}]:
+            filters = {"updated_time": bounds}
+            indexed = list(service.get_all_feature_metadata("developer", filters))
+            with (
+                patch.object(service.indexes, "match", return_value=None),
+                patch.object(service.indexes, "is_indexed", return_value=False),
+            ):
+                scanned = list(service.get_all_feature_metadata("developer", filters))
+            assert indexed == scanned
+            assert names[2] not in indexed
+        assert indexed == [names[1]]
+
+    # Namespace listing and counts, prefix kept in the fuzzy fallback
+    def test_prefix_listing(self, service, sample_create_request):
+        names = ["fraud:amount:v1", "fraud:amount:v2", "risk:amount:v1"]
+        for name in names:
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=name)
+            )
+        listed = service.get_all_feature_metadata("developer", prefix="fraud:amount:")
+        assert list(listed) == names[:2]
+        assert service.count_feature_metadata("developer", prefix="fraud:") == 2
+        assert service.count_feature_metadata("developer", prefix="none:") == 0
+        assert (
+            list(
+                service.get_all_feature_metadata(
+                    "developer", {"description": "Test create feature"}, "risk:"
+                )
+            )
+            == names[2:]
+        )
+        assert (
+            service.count_feature_metadata(
+                "developer", {"feature_type": "batc"}, "risk:"
+            )
+            == 1
+        )
+        assert service.get_all_feature_metadata("developer", prefix="none:") == {}
+        with pytest.raises(ValueError, match="Invalid prefix"):
+            service.get_all_feature_metadata("developer", prefix=1)
+        with pytest.raises(ValueError, match="Invalid prefix"):
+            service.count_feature_metadata("developer", prefix=["fraud:"])
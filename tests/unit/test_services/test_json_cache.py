@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from app.models.request import FeatureMetadata
+from app.services.json_cache import RecordJsonCache
+
+
+class TestRecordJsonCache:
+    # Bytes equal the model dump, encoded once per record dict
+    def test_get(self, sample_feature_metadata):
+        cache = RecordJsonCache()
+        record = dict(sample_feature_metadata, description="naïve")
+        encoded = cache.get("a:b:v1", record)
+        assert json.loads(encoded) == FeatureMetadata(**record).model_dump()
+        assert "naïve".encode() in encoded
+        assert cache.get("a:b:v1", record) is encoded
+        assert cache.get("a:b:v1", dict(record)) is not encoded
+        cache.invalidate("a:b:v1")
+        cache.invalidate("a:b:v1")
+        assert cache.entries == {}
+
+    # Mutations drop cached bytes, reads re-encode the new state
+    def test_service_invalidation(self, populated_service):
+        before = populated_service.get_feature_json("b:feature:v1")
+        assert populated_service.get_feature_json("b:feature:v1") is before
+        populated_service.update_feature_metadata(
+            {
+                "feature_name": "b:feature:v1",
+                "description": "changed",
+                "last_updated_by": "dev",
+                "user_role": "developer",
+            }
+        )
+        after = json.loads(populated_service.get_feature_json("b:feature:v1"))
+        assert (
+            after == populated_service.get_feature_metadata("b:feature:v1").model_dump()
+        )
+        assert after["description"] == "changed"
+        assert json.loads(
+            populated_service.get_feature_json("b:feature:v1", fields=["status"])
+        ) == {
+            "feature_name": "b:feature:v1",
+            "status": "DRAFT",
+        }
+        with pytest.raises(ValueError, match="not found"):
+            populated_service.get_feature_json("j:missing:v1")
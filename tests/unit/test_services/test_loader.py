@@ -0,0 +1,295 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services.checkpoint import SnapshotCheckpointer
+from app.services.feature_service import FeatureMetadataService
+from app.services.loader import BackgroundLoader
+from app.services.snapshot import write_snapshot
+from app.services.storage import (
+    FileBackend,
+    ShardedFileBackend,
+    SqliteBackend,
+    StorageBackend,
+    StorageError,
+)
+
+
+# SQLite store whose background stream waits on a gate
+class GatedBackend(SqliteBackend):
+    def __init__(self, db_file):
+        super().__init__(db_file)
+        self.gate = threading.Event()
+
+    def iter_recent(self):
+        assert self.gate.wait(5)
+        yield from super().iter_recent()
+
+
+# Background service over a gated store
+@pytest.fixture
+def gated_service(tmp_path, catalog):
+    backend = GatedBackend(tmp_path / "metadata.db")
+    backend.save_all(catalog)
+    service = FeatureMetadataService(
+        str(tmp_path / "metadata.json"), backend=backend, load_mode="background"
+    )
+    yield service
+    backend.gate.set()
+    service.close()
+
+
+class TestRecentFirst:
+    # Log changes newest first, then the snapshot
+    def test_file_backend(self, tmp_path, make_record, catalog):
+        backend = FileBackend(tmp_path / "m.json", wal_enabled=True)
+        backend.save_all(catalog)
+        for record in [
+            {"op": "put", "key": "c:w:v1", "value": make_record("c:w:v1")},
+            {
+                "op": "put",
+                "key": "a:x:v1",
+                "value": make_record("a:x:v1", updated_time=9),
+            },
+            {"op": "delete", "key": "b:y:v1"},
+            {"op": "put", "key": "d:q:v1", "value": "bad"},
+            {"op": "put", "key": 5, "value": {}},
+        ]:
+            backend.wal.append(record)
+        names = [name for name, _ in backend.iter_recent()]
+        assert names == ["a:x:v1", "c:w:v1", "a:z:v1"]
+        assert dict(backend.iter_recent()) == backend.load()
+        assert backend.wal.record_count == 5
+        backend.close()
+
+    # Unreadable log still yields the snapshot
+    def test_file_backend_log_error(self, tmp_path, capsys, catalog):
+        backend = FileBackend(tmp_path / "m.json", wal_enabled=True)
+        backend.save_all(catalog)
+        with patch.object(backend.wal, "replay", side_effect=OSError("disk")):
+            assert dict(backend.iter_recent()) == catalog
+        assert "Error replaying log: disk" in capsys.readouterr().out
+        assert list(FileBackend(tmp_path / "none.json").iter_recent()) == []
+        backend.close()
+
+    # Latest shard first, membership rebuilt
+    def test_sharded_backend(self, tmp_path, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        backend.save_all(catalog)
+        os.utime(backend.shard_path("a"), ns=(1, 1))
+        assert [name for name, _ in backend.iter_recent()] == [
+            "b:y:v1",
+            "a:x:v1",
+            "a:z:v1",
+        ]
+        assert list(backend._members) == ["b", "a"]
+
+    # Point reads scan one shard
+    def test_sharded_get(self, tmp_path, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        assert backend.supports_point_reads()
+        assert backend.get("a:x:v1") is None
+        write_snapshot(tmp_path / "m.json", catalog)
+        assert not backend.supports_point_reads()
+        assert backend.get("a:x:v1") is None
+        assert dict(backend.iter_recent()) == catalog
+        backend.save_all(catalog)
+        assert backend.supports_point_reads()
+        assert backend.get("a:z:v1") == catalog["a:z:v1"]
+        assert backend.get("a:q:v1") is None
+        assert backend.get("c:q:v1") is None
+
+    # Rows by updated_time, newest first
+    def test_sqlite_backend(self, tmp_path, catalog):
+        backend = SqliteBackend(tmp_path / "m.db")
+        backend.PAGE_SIZE = 2
+        backend.save_all(catalog)
+        assert [name for name, _ in backend.iter_recent()] == [
+            "a:z:v1",
+            "b:y:v1",
+            "a:x:v1",
+        ]
+        assert backend.supports_point_reads()
+        assert backend.get("b:y:v1") == catalog["b:y:v1"]
+        assert backend.get("c:q:v1") is None
+        backend.close()
+        with pytest.raises(StorageError, match="Failed to load"):
+            list(backend.iter_recent())
+        with pytest.raises(StorageError, match="Failed to load"):
+            backend.get("a:x:v1")
+
+    # Page query failure surfaced
+    def test_sqlite_page_error(self, tmp_path, catalog):
+        backend = SqliteBackend(tmp_path / "m.db")
+        backend.PAGE_SIZE = 2
+        backend.save_all(catalog)
+        records = backend.iter_recent()
+        assert next(records)[0] == "a:z:v1"
+        backend._conn.execute("DROP TABLE feature_metadata")
+        with pytest.raises(StorageError, match="Failed to load"):
+            list(records)
+        backend.close()
+
+    # Default stream uses load, no point reads
+    def test_default(self, catalog):
+        class MemoryBackend(StorageBackend):
+            def load(self):
+                return catalog
+
+            def save_all(self, metadata):
+                pass
+
+            def put(self, feature_name, metadata, durability="sync"):
+                return None
+
+            def checkpoint(self, lock, metadata):
+                return 0
+
+        backend = MemoryBackend()
+        assert dict(backend.iter_recent()) == catalog
+        assert not backend.supports_point_reads()
+        assert backend.get("a:x:v1") is None
+
+
+class TestBackgroundLoad:
+    # Same catalog as a blocking load
+    def test_loads_catalog(self, tmp_path, catalog):
+        data_file = tmp_path / "m.json"
+        write_snapshot(data_file, dict(catalog, **{"bad:r:v1": [1]}))
+        service = FeatureMetadataService(str(data_file), load_mode="background")
+        assert service.loader.wait(5)
+        assert service.is_ready()
+        assert service.metadata == catalog
+        status = service.load_status()
+        assert status["state"] == "ready"
+        assert status["loaded_records"] == 3
+        assert status["skipped_records"] == 1
+        assert status["elapsed_ms"] > 0
+        service.close()
+
+    # Env selects mode, unknown mode rejected
+    def test_load_mode_env(self, tmp_path, monkeypatch, catalog):
+        monkeypatch.setenv("FEATURE_METADATA_LOAD_MODE", "Background")
+        monkeypatch.setenv("FEATURE_METADATA_LOAD_BATCH_SIZE", "1")
+        write_snapshot(tmp_path / "m.json", catalog)
+        service = FeatureMetadataService(str(tmp_path / "m.json"))
+        assert service.loader.batch_size == 1
+        assert service.loader.wait(5)
+        assert service.metadata == catalog
+        service.close()
+        with pytest.raises(ValueError, match="Invalid load mode"):
+            FeatureMetadataService(str(tmp_path / "m.json"), load_mode="lazy")
+
+    # Blocking mode reports ready immediately
+    def test_blocking_status(self, tmp_path, catalog):
+        write_snapshot(tmp_path / "m.json", catalog)
+        service = FeatureMetadataService(str(tmp_path / "m.json"))
+        assert service.is_ready()
+        assert service.load_status()["loaded_records"] == 3
+        service._await_loaded()
+
+    # Reads served before the load finishes
+    def test_reads_on_demand(self, gated_service, catalog):
+        assert not gated_service.is_ready()
+        assert gated_service.load_status()["state"] == "loading"
+        meta = gated_service.get_feature_metadata("b:y:v1")
+        assert meta.feature_name == "b:y:v1"
+        assert gated_service.get_feature_metadata("b:y:v1") == meta
+        assert list(gated_service.metadata) == ["b:y:v1"]
+        with pytest.raises(ValueError, match="not found"):
+            gated_service.get_feature_metadata("c:q:v1")
+        with pytest.raises(ValueError, match="not found"):
+            gated_service.get_feature_metadata(None)
+        gated_service.backend.gate.set()
+        assert gated_service.loader.wait(5)
+        assert gated_service.metadata == catalog
+        # Each record counted once, by whichever path added it
+        status = gated_service.load_status()
+        assert status["fetched_records"] == 1
+        assert status["loaded_records"] == 2
+
+    # Batch reads fetch each missing name once during load
+    def test_batch_reads_on_demand(self, gated_service):
+        found = gated_service.get_many(["b:y:v1", "c:q:v1", "b:y:v1"])
+        assert list(found) == ["b:y:v1", "c:q:v1"]
+        assert found["b:y:v1"].feature_name == "b:y:v1"
+        assert found["c:q:v1"] is None
+        assert gated_service.load_status()["fetched_records"] == 1
+        gated_service.backend.gate.set()
+        assert gated_service.loader.wait(5)
+
+    # Writes wait for the whole catalog
+    def test_writes_wait(self, gated_service, sample_create_request):
+        request = dict(sample_create_request, feature_name="a:x:v1")
+        errors = []
+
+        def create():
+            try:
+                gated_service.create_feature_metadata(request)
+            except ValueError as e:
+                errors.append(str(e))
+
+        thread = threading.Thread(target=create)
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        gated_service.backend.gate.set()
+        thread.join(5)
+        assert errors == ["Feature a:x:v1 already exists"]
+
+    # Point read failure falls back to loaded records
+    def test_fetch_error(self, gated_service):
+        with patch.object(
+            gated_service.backend, "get", side_effect=StorageError("locked")
+        ):
+            assert gated_service.loader.fetch("a:x:v1") is None
+
+    # Stores without point reads wait for the load
+    def test_fetch_waits(self, gated_service, catalog):
+        loader = gated_service.loader
+        with patch.object(
+            gated_service.backend, "supports_point_reads", return_value=False
+        ):
+            thread = threading.Thread(target=loader.fetch, args=("a:x:v1",))
+            thread.start()
+            thread.join(0.05)
+            assert thread.is_alive()
+            gated_service.backend.gate.set()
+            thread.join(5)
+        assert loader.fetch("a:x:v1") == catalog["a:x:v1"]
+
+    # Failed load leaves an empty, ready catalog
+    def test_load_error(self, tmp_path):
+        (tmp_path / "m.json").write_text('{"a:x:v1": {}, "b')
+        service = FeatureMetadataService(
+            str(tmp_path / "m.json"), load_mode="background"
+        )
+        assert service.loader.wait(5)
+        assert service.is_ready()
+        assert service.metadata == {}
+        assert service.load_status()["error"]
+        service.close()
+
+    # Shutdown mid-load blocks writes and checkpoints
+    def test_stopped(self, gated_service, sample_create_request):
+        loader = gated_service.loader
+        loader._stop.set()
+        gated_service.backend.gate.set()
+        assert loader.wait(5)
+        loader.stop()
+        assert loader.state == "stopped"
+        with pytest.raises(Exception, match="Catalog load stopped"):
+            gated_service.create_feature_metadata(sample_create_request)
+        checkpointer = SnapshotCheckpointer(gated_service)
+        with patch.object(gated_service.backend, "checkpoint") as checkpoint:
+            checkpointer.checkpoint()
+        checkpoint.assert_not_called()
+
+    # Start is idempotent
+    def test_start_once(self, gated_service):
+        thread = gated_service.loader._thread
+        gated_service.loader.start()
+        assert gated_service.loader._thread is thread
+        assert isinstance(gated_service.loader, BackgroundLoader)
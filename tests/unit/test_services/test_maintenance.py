@@ -0,0 +1,303 @@
+import builtins
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services.maintenance import (
+    Progress,
+    check_record,
+    compact_store,
+    convert_store,
+    rebuild_store,
+    verify_store,
+)
+from app.services.snapshot import write_snapshot
+from app.services.storage import (
+    FileBackend,
+    ShardedFileBackend,
+    SqliteBackend,
+    StorageBackend,
+    StorageError,
+    create_backend,
+)
+
+
+# Names whose indexed status column is DRAFT
+def drafts(backend):
+    rows = backend._conn.execute(
+        "SELECT feature_name FROM feature_metadata WHERE status = 'DRAFT' "
+        "ORDER BY rowid"
+    )
+    return [name for (name,) in rows]
+
+
+# Silent progress
+@pytest.fixture
+def progress():
+    return Progress("test")
+
+
+# WAL-enabled file backend with logged changes
+@pytest.fixture
+def logged_backend(tmp_path, make_record, catalog):
+    backend = FileBackend(tmp_path / "m.json", wal_enabled=True, compact_threshold=0)
+    backend.save_all(catalog)
+    catalog["a:x:v1"] = make_record("a:x:v1", status="DEPLOYED")
+    backend.put("a:x:v1", catalog)
+    catalog["c:w:v1"] = make_record("c:w:v1")
+    backend.put("c:w:v1", catalog)
+    yield backend, catalog
+    backend.close()
+
+
+class TestProgress:
+    # Reports on interval and at end
+    def test_reports_throughput(self):
+        stream = io.StringIO()
+        progress = Progress("verify", stream, interval_seconds=0)
+        assert list(progress.track(range(3))) == [0, 1, 2]
+        progress.report()
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 4
+        assert lines[-1].startswith("verify: 3 records in ")
+        assert "records/s" in lines[-1]
+        assert progress.rate() > 0
+
+    # Silent without stream
+    def test_silent(self, progress):
+        assert list(progress.track("ab")) == ["a", "b"]
+        progress.report()
+        assert progress.count == 2
+
+
+class TestStreamingBackends:
+    # Log applied over streamed snapshot in load order
+    def test_file_iter_matches_load(self, logged_backend):
+        backend, catalog = logged_backend
+        assert list(backend.iter_records()) == list(backend.load().items())
+        assert dict(backend.iter_records()) == catalog
+
+    # Deleted then re-added record moves to end
+    def test_file_iter_delete(self, logged_backend):
+        backend, _ = logged_backend
+        backend.wal.append({"op": "delete", "key": "b:y:v1"})
+        backend.wal.append({"op": "delete", "key": "a:z:v1"})
+        backend.wal.append({"op": "put", "key": "a:z:v1", "value": {"v": 2}})
+        backend.wal.append({"op": "put", "key": 5, "value": {}})
+        names = [name for name, _ in backend.iter_records()]
+        assert names == list(backend.load())
+        assert names == ["a:x:v1", "c:w:v1", "a:z:v1"]
+
+    # Missing store streams nothing
+    def test_file_iter_empty(self, tmp_path):
+        assert list(FileBackend(tmp_path / "m.json").iter_records()) == []
+
+    # Default stream and write use load and save_all
+    def test_default_stream(self, catalog):
+        class MemoryBackend(StorageBackend):
+            def __init__(self):
+                self.data = {}
+
+            def load(self):
+                return dict(self.data)
+
+            def save_all(self, metadata):
+                self.data = dict(metadata)
+
+            def put(self, feature_name, metadata, durability="sync"):
+                return None
+
+            def checkpoint(self, lock, metadata):
+                return 0
+
+        backend = MemoryBackend()
+        assert backend.write_records(catalog.items()) == 3
+        assert dict(backend.iter_records()) == catalog
+
+    # Shards streamed and regrouped
+    def test_sharded_stream(self, tmp_path, make_record, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        assert backend.write_records(catalog.items()) == 3
+        assert sorted(p.name for p in backend.shard_dir.iterdir()) == [
+            "a.json",
+            "b.json",
+        ]
+        assert dict(backend.iter_records()) == catalog
+        backend.write_records(iter([("b:y:v1", make_record("b:y:v1"))]))
+        assert [p.name for p in backend.shard_dir.iterdir()] == ["b.json"]
+
+    # Open shard files capped, suspended shards reopened for appending
+    def test_sharded_stream_open_cap(self, tmp_path, make_record):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        backend.MAX_OPEN_SHARDS = 2
+        names = [f"{category}:f:v{i}" for i in range(3) for category in "abcd"]
+        files = []
+        peak = 0
+
+        def tracked(*args, **kwargs):
+            nonlocal peak
+            files.append(builtins.open(*args, **kwargs))
+            peak = max(peak, sum(not f.closed for f in files))
+            return files[-1]
+
+        with patch("app.services.snapshot.open", tracked, create=True):
+            written = backend.write_records((name, make_record(name)) for name in names)
+        assert written == 12
+        assert peak == 2
+        with open(backend.shard_path("c")) as f:
+            assert list(json.load(f)) == ["c:f:v0", "c:f:v1", "c:f:v2"]
+        assert dict(backend.iter_records()) == {
+            name: make_record(name) for name in names
+        }
+
+    # Legacy single file streamed
+    def test_sharded_stream_legacy(self, tmp_path, catalog):
+        write_snapshot(tmp_path / "m.json", catalog)
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        assert dict(backend.iter_records()) == catalog
+
+    # Binary shards grouped in memory
+    def test_sharded_stream_binary(self, tmp_path, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json", snapshot_format="binary")
+        backend.write_records(catalog.items())
+        assert backend.shard_path("a").suffix == ".snap"
+        assert backend.load() == catalog
+
+    # Failed stream leaves shards untouched
+    def test_sharded_stream_abort(self, tmp_path, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        backend.save_all(catalog)
+
+        def failing():
+            yield "a:x:v1", {}
+            raise OSError("read")
+
+        with pytest.raises(OSError):
+            backend.write_records(failing())
+        assert backend.load() == catalog
+        assert not list(backend.shard_dir.glob("*.tmp"))
+
+    # Rows paged in insertion order
+    def test_sqlite_stream(self, tmp_path, catalog):
+        backend = SqliteBackend(tmp_path / "m.db")
+        backend.PAGE_SIZE = 2
+        assert backend.write_records(catalog.items()) == 3
+        assert list(backend.iter_records()) == list(catalog.items())
+        backend.close()
+        with pytest.raises(StorageError, match="Failed to load"):
+            list(backend.iter_records())
+
+
+class TestVerify:
+    # Schema problems described
+    def test_check_record(self, make_record):
+        assert check_record("a:x:v1", make_record("a:x:v1")) is None
+        assert check_record("a:x:v1", []) == "record is not an object"
+        assert check_record("a:x:v1", make_record("b")) == (
+            "feature_name does not match key"
+        )
+        problem = check_record("a:x:v1", {"feature_name": "a:x:v1"})
+        assert "feature_type: Field required" in problem
+
+    # Healthy store passes
+    def test_verify_ok(self, logged_backend, progress):
+        backend, catalog = logged_backend
+        report = verify_store(backend, progress)
+        assert report["ok"]
+        assert report["records"] == len(catalog)
+        assert report["errors"] == []
+
+    # Invalid records and torn log reported
+    def test_verify_problems(self, logged_backend, progress):
+        backend, _ = logged_backend
+        backend.wal.append({"op": "put", "key": "bad:r:v1", "value": {"x": 1}})
+        with open(backend.wal.log_file, "ab") as f:
+            f.write(b"deadbeef\t{")
+        report = verify_store(backend, progress)
+        assert not report["ok"]
+        assert report["invalid_records"] == 1
+        assert report["log_invalid_bytes"] == 10
+        assert report["errors"][0].startswith("bad:r:v1: ")
+        assert "unreadable trailing bytes" in report["errors"][1]
+        # Verification never repairs the log
+        assert backend.wal.log_file.read_bytes().endswith(b"deadbeef\t{")
+
+    # Reported errors capped
+    def test_verify_caps_errors(self, tmp_path, progress, monkeypatch):
+        monkeypatch.setattr("app.services.maintenance.MAX_REPORTED_ERRORS", 1)
+        write_snapshot(tmp_path / "m.json", {"a": {}, "b": {}})
+        report = verify_store(FileBackend(tmp_path / "m.json"), progress)
+        assert report["invalid_records"] == 2
+        assert len(report["errors"]) == 1
+
+    # Corrupt snapshot reported
+    def test_verify_corrupt(self, tmp_path, progress):
+        (tmp_path / "m.json").write_text('{"a:x:v1": ')
+        report = verify_store(FileBackend(tmp_path / "m.json"), progress)
+        assert not report["ok"]
+        assert report["errors"][0].startswith("Unreadable store after 0 records")
+
+
+class TestMaintenance:
+    # Log folded into snapshot
+    def test_compact_file(self, logged_backend, progress):
+        backend, catalog = logged_backend
+        assert compact_store(backend, progress) == len(catalog)
+        assert backend.wal.log_file.stat().st_size == 0
+        with open(backend.data_file) as f:
+            assert json.load(f) == catalog
+
+    # SQLite vacuumed
+    def test_compact_sqlite(self, tmp_path, progress, catalog):
+        backend = SqliteBackend(tmp_path / "m.db")
+        backend.save_all(catalog)
+        assert compact_store(backend, progress) == 3
+        backend.close()
+        with pytest.raises(StorageError, match="Failed to compact"):
+            backend.compact()
+
+    # Indexed columns recomputed
+    def test_rebuild_sqlite(self, tmp_path, progress, catalog):
+        backend = SqliteBackend(tmp_path / "m.db")
+        backend.PAGE_SIZE = 2
+        backend.save_all(catalog)
+        backend._conn.execute("UPDATE feature_metadata SET status = 'STALE'")
+        assert rebuild_store(backend, progress) == 3
+        assert drafts(backend) == list(catalog)
+        backend._conn.execute("UPDATE feature_metadata SET record = 'x'")
+        with pytest.raises(StorageError, match="Failed to rebuild"):
+            backend.rebuild_indexes()
+        assert drafts(backend) == list(catalog)
+        backend.close()
+
+    # Misplaced shard records regrouped
+    def test_rebuild_sharded(self, tmp_path, progress, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json")
+        backend.shard_dir.mkdir()
+        write_snapshot(backend.shard_path("a"), catalog)
+        assert rebuild_store(backend, progress) == 3
+        with open(backend.shard_path("b")) as f:
+            assert list(json.load(f)) == ["b:y:v1"]
+
+    # JSON store has no derived indexes
+    def test_rebuild_file(self, logged_backend, progress):
+        backend, _ = logged_backend
+        with pytest.raises(ValueError, match="no derived indexes"):
+            rebuild_store(backend, progress)
+
+    # Records copied across backends and formats
+    @pytest.mark.parametrize(
+        "kind,snapshot_format",
+        [("json", "binary"), ("sqlite", "json"), ("sharded", "json")],
+    )
+    def test_convert(self, logged_backend, tmp_path, progress, kind, snapshot_format):
+        backend, catalog = logged_backend
+        (tmp_path / "out").mkdir()
+        target = create_backend(
+            tmp_path / "out" / "m.json", kind=kind, snapshot_format=snapshot_format
+        )
+        assert convert_store(backend, target, progress) == len(catalog)
+        assert target.load() == catalog
+        target.close()
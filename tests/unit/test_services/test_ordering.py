@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.indexes import CatalogIndex
+from app.services.ordering import sort_key, sort_value, top_ids
+
+
+# Catalog with mixed, missing and tied sort values
+@pytest.fixture
+def catalog():
+    rng = random.Random(3)
+    metadata = {}
+    for i in range(60):
+        record = {"feature_name": f"t:f:v{i}", "status": rng.choice(["A", "B"])}
+        record["updated_time"] = rng.choice([None, "x", 1, 2, 3, rng.randint(0, 50)])
+        if rng.random() < 0.8:
+            record["created_by"] = rng.choice([None, "ann", "bob", 7, 2.5, "Ann"])
+        metadata[record["feature_name"]] = record
+    index = CatalogIndex()
+    index.sync(metadata)
+    return metadata, index
+
+
+# Full sort of the same order
+def reference(index, metadata, field, descending, candidates):
+    ids = [i for i in range(len(index.names)) if candidates is None or i in candidates]
+    keyed = []
+    tail = []
+    for record_id in ids:
+        value = sort_value(index, metadata[index.names[record_id]], field)
+        if value is None:
+            tail.append(record_id)
+        else:
+            keyed.append((sort_key(value), record_id))
+    keyed.sort(reverse=descending)
+    return [record_id for _, record_id in keyed] + tail
+
+
+class TestOrdering:
+    # Numbers sort before strings
+    def test_sort_key(self):
+        values = ["b", 3, "a", 1.5, True]
+        assert sorted(values, key=sort_key) == [True, 1.5, 3, "a", "b"]
+
+    # Index walk and heap agree with a full sort, page after page
+    @pytest.mark.parametrize("field", ["updated_time", "created_by"])
+    @pytest.mark.parametrize("descending", [False, True])
+    @pytest.mark.parametrize("filtered", [False, True])
+    def test_matches_full_sort(self, catalog, field, descending, filtered):
+        metadata, index = catalog
+        candidates = None
+        if filtered:
+            candidates = set(index.match({"status": "A"}))
+            candidates = {index.ids[name] for name in candidates}
+        expected = reference(index, metadata, field, descending, candidates)
+        assert top_ids(index, metadata, field, descending, 10**6, candidates) == (
+            expected
+        )
+        for limit in [1, 7]:
+            pages, after = [], None
+            while True:
+                page = top_ids(
+                    index, metadata, field, descending, limit, candidates, after
+                )
+                pages.extend(page)
+                if len(page) < limit:
+                    break
+                last = page[-1]
+                value = sort_value(index, metadata[index.names[last]], field)
+                after = (value, last)
+            assert pages == expected
+
+    # Non-integer cursor value on an ordered field rejected
+    def test_bad_cursor_value(self, catalog):
+        metadata, index = catalog
+        with pytest.raises(ValueError, match="does not match"):
+            top_ids(index, metadata, "updated_time", False, 5, after=("x", 0))
+
+
+class TestServiceOrdering:
+    # Most recently updated first, paged by keyset cursors
+    def test_sorted_pages(self, tmp_path, sample_create_request):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        for i in range(1, 6):
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=f"s:f:v{i}")
+            )
+            record = service.metadata[f"s:f:v{i}"]
+            record["updated_time"] = [30, 10, 50, 20, 40][i - 1]
+            service.indexes.update(f"s:f:v{i}", record)
+        page = service.page_feature_metadata(
+            "developer",
+            {"status": "DRAFT"},
+            order_by="updated_time",
+            descending=True,
+            limit=2,
+        )
+        assert list(page["metadata"]) == ["s:f:v3", "s:f:v5"]
+        page = service.page_feature_metadata(
+            "developer",
+            {"status": "DRAFT"},
+            order_by="updated_time",
+            descending=True,
+            limit=5,
+            cursor=page["next_cursor"],
+        )
+        assert list(page["metadata"]) == ["s:f:v1", "s:f:v4", "s:f:v2"]
+        assert page["next_cursor"] is None
+        first = service.page_feature_metadata(
+            "developer", order_by="feature_name", limit=1
+        )
+        assert list(first["metadata"]) == ["s:f:v1"]
+        with pytest.raises(ValueError, match="does not match"):
+            service.page_feature_metadata("developer", cursor=first["next_cursor"])
+        with pytest.raises(ValueError, match="Invalid order_by"):
+            service.page_feature_metadata("developer", order_by="nope")
@@ -0,0 +1,115 @@
+import pytest
+
+from app.services.pagination import check_page_size, cursor_position, encode_cursor
+
+
+# Follow cursors to the end
+def read_all(service, **kwargs):
+    names, cursor = [], None
+    while True:
+        page = service.page_feature_metadata("developer", cursor=cursor, **kwargs)
+        names.extend(page["metadata"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names
+
+
+class TestCursor:
+    # Cursor round trip and rejection
+    def test_cursor(self):
+        ids = {"a:b:v1": 3}
+        assert cursor_position(encode_cursor("a:b:v1"), ids) == (3, [])
+        assert cursor_position(encode_cursor("a:b:v1", None), ids) == (3, [None])
+        for bad in ["", "!!", 5, encode_cursor("x")[:-2] + "@@"]:
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                cursor_position(bad, ids)
+        with pytest.raises(ValueError, match="no longer valid"):
+            cursor_position(encode_cursor("gone:b:v1"), ids)
+
+    # Page size bounds
+    def test_page_size(self):
+        check_page_size(1)
+        check_page_size(1000)
+        for bad in [0, 1001, "5", True, 2.0]:
+            with pytest.raises(ValueError, match="limit|Limit"):
+                check_page_size(bad)
+
+
+class TestPages:
+    # Pages concatenate to the full listing
+    def test_pages_cover_listing(self, populated_service):
+        full = list(populated_service.get_all_feature_metadata("developer"))
+        for limit in [1, 3, 8, 9]:
+            assert read_all(populated_service, limit=limit) == full
+        page = populated_service.page_feature_metadata(
+            "developer", limit=2, include_total=True
+        )
+        assert page["total_count"] == 8
+        assert list(page["metadata"]) == full[:2]
+        assert "total_count" not in populated_service.page_feature_metadata(
+            "developer", limit=2
+        )
+
+    # Filtered, prefixed, fuzzy and expression listings page the same way
+    def test_filtered_pages(self, populated_service):
+        for kwargs in [
+            {"filters": {"feature_type": "real-time"}},
+            {"prefix": "a:"},
+            {"filters": {"feature_type": "batc"}},
+            {"where": {"field": "feature_name", "contains": "v"}},
+        ]:
+            filters = kwargs.get("filters")
+            if "where" in kwargs:
+                expected = list(
+                    populated_service.query_feature_metadata(
+                        "developer", kwargs["where"]
+                    )[0]
+                )
+            else:
+                expected = list(
+                    populated_service.get_all_feature_metadata(
+                        "developer", filters, kwargs.get("prefix")
+                    )
+                )
+            assert expected
+            assert read_all(populated_service, limit=1, **kwargs) == expected
+        page = populated_service.page_feature_metadata(
+            "developer", where={"field": "status", "eq": "DRAFT"}, limit=2
+        )
+        assert page["plan"]["access"] == "eq index on status"
+
+    # Inserts and deletes between pages neither skip nor repeat records
+    def test_stable_under_writes(self, populated_service, sample_create_request):
+        page = populated_service.page_feature_metadata("developer", limit=2)
+        seen = list(page["metadata"])
+        populated_service.delete_feature_metadata(
+            {"feature_name": seen[0], "deleted_by": "dev", "user_role": "developer"}
+        )
+        populated_service.create_feature_metadata(
+            dict(sample_create_request, feature_name="c:feature:v1")
+        )
+        page = populated_service.page_feature_metadata(
+            "developer", limit=10, cursor=page["next_cursor"]
+        )
+        assert seen + list(page["metadata"]) == list(
+            populated_service.get_all_feature_metadata("developer")
+        )
+        assert page["next_cursor"] is None
+
+    # Cursor re-anchored after the index is rebuilt
+    def test_rebuilt_catalog(self, populated_service):
+        page = populated_service.page_feature_metadata("developer", limit=3)
+        last = list(page["metadata"])[-1]
+        populated_service.metadata = dict(
+            reversed(list(populated_service.metadata.items()))
+        )
+        rest = populated_service.page_feature_metadata(
+            "developer", limit=10, cursor=page["next_cursor"]
+        )
+        names = list(populated_service.metadata)
+        assert list(rest["metadata"]) == names[names.index(last) + 1 :]
+        populated_service.metadata = {}
+        with pytest.raises(ValueError, match="no longer valid"):
+            populated_service.page_feature_metadata(
+                "developer", cursor=page["next_cursor"]
+            )
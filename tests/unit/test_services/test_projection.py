@@ -0,0 +1,47 @@
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.projection import check_fields, project
+
+
+class TestProjection:
+    # Field lists checked against the model, feature_name always first
+    def test_check_fields(self):
+        assert check_fields(None) is None
+        assert check_fields(["status", "feature_name", "status"]) == [
+            "feature_name",
+            "status",
+        ]
+        for bad in [[], "status", [1], ["status", "nope"]]:
+            with pytest.raises(ValueError, match="Invalid fields"):
+                check_fields(bad)
+
+    # Unset fields come back as None, like the model defaults
+    def test_project(self):
+        record = {"feature_name": "a:b:v1", "status": "DRAFT"}
+        assert project(record, ["feature_name", "approved_by"]) == {
+            "feature_name": "a:b:v1",
+            "approved_by": None,
+        }
+
+    # Projected records equal the same keys of the full model
+    def test_service_projection(self, tmp_path, sample_create_request):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        service.create_feature_metadata(
+            dict(sample_create_request, feature_name="p:f:v1")
+        )
+        fields = ["status", "tested_by", "created_time"]
+        full = service.get_feature_metadata("p:f:v1").dict()
+        expected = {key: full[key] for key in ["feature_name", *fields]}
+        assert service.get_feature_metadata("p:f:v1", fields=fields) == expected
+        listings = [
+            service.get_all_feature_metadata("developer", fields=fields),
+            service.page_feature_metadata("developer", fields=fields)["metadata"],
+            service.query_feature_metadata(
+                "developer", {"field": "status", "eq": "DRAFT"}, fields=fields
+            )[0],
+        ]
+        for listing in listings:
+            assert listing == {"p:f:v1": expected}
+        with pytest.raises(ValueError, match="Invalid fields"):
+            service.get_feature_metadata("p:f:v1", fields=["nope"])
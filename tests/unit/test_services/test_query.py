@@ -0,0 +1,249 @@
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.indexes import CatalogIndex
+from app.services.query import QueryPlan, compile_filter
+
+
+# Small indexed catalog
+@pytest.fixture
+def catalog(make_record):
+    metadata = {
+        "fraud:amount:v1": make_record(
+            "fraud:amount:v1", created_by="ann", updated_time=10, description="sum"
+        ),
+        "fraud:amount:v2": make_record(
+            "fraud:amount:v2", status="DEPLOYED", created_by="bob", updated_time=20
+        ),
+        "risk:score:v1": make_record(
+            "risk:score:v1", created_by="ann", updated_time=30, description="avg sum"
+        ),
+        "risk:age:v1": {"feature_name": "risk:age:v1", "updated_time": 40},
+    }
+    index = CatalogIndex()
+    index.sync(metadata)
+    return metadata, index
+
+
+# Plan and run an expression
+def run(catalog, where):
+    metadata, index = catalog
+    plan = QueryPlan(compile_filter(where), index)
+    names = plan.execute(metadata)
+    return names, plan.explain(len(names))
+
+
+class TestCompile:
+    # Malformed expressions rejected
+    @pytest.mark.parametrize(
+        "where, message",
+        [
+            ([], "Invalid filter expression"),
+            ({}, "Invalid filter expression"),
+            ({"and": [], "field": "x"}, "only key"),
+            ({"or": []}, "non-empty list"),
+            ({"and": {"field": "x"}}, "non-empty list"),
+            ({"eq": 1}, "needs a field name"),
+            ({"field": "x"}, "Invalid filter operators"),
+            ({"field": "x", "like": "y"}, "Invalid filter operators"),
+            ({"field": "x", "in": "y"}, "needs a list"),
+            ({"field": "x", "contains": 1}, "needs a string"),
+            ({"field": "x", "prefix": None}, "needs a string"),
+            ({"field": "x", "gte": "1"}, "Invalid range filter"),
+        ],
+    )
+    def test_invalid(self, where, message):
+        with pytest.raises(ValueError, match=message):
+            compile_filter(where)
+
+    # Deep nesting capped
+    def test_depth(self):
+        where = {"field": "status", "eq": "DRAFT"}
+        for _ in range(40):
+            where = {"not": where}
+        with pytest.raises(ValueError, match="nested deeper"):
+            compile_filter(where)
+
+    # Leaf operators and combinators as predicates
+    def test_predicates(self, make_record):
+        record = make_record("a:b:v1", created_by="ann", updated_time=5)
+        holds = [
+            {"field": "status", "eq": "DRAFT"},
+            {"field": "created_by", "in": ["bob", "ann"]},
+            {"field": "feature_name", "prefix": "a:"},
+            {"field": "feature_name", "contains": ":b:"},
+            {"field": "updated_time", "gte": 5, "lt": 6},
+            {"not": {"field": "missing", "eq": "None"}},
+            {
+                "or": [
+                    {"field": "status", "eq": "X"},
+                    {"field": "status", "eq": "DRAFT"},
+                ]
+            },
+        ]
+        for where in holds:
+            assert compile_filter(where).test(record)
+        fails = [
+            {"field": "missing", "contains": ""},
+            {"field": "updated_time", "gt": 5},
+            {"and": [{"field": "status", "eq": "DRAFT"}, {"field": "x", "eq": 1}]},
+            {"field": "status", "eq": "DRAFT", "prefix": "X"},
+        ]
+        for where in fails:
+            assert not compile_filter(where).test(record)
+
+
+class TestPlanner:
+    # Most selective index chosen, rest checked on its candidates
+    def test_picks_selective_index(self, catalog):
+        names, plan = run(
+            catalog,
+            {
+                "and": [
+                    {"field": "status", "eq": "DRAFT"},
+                    {"field": "created_by", "eq": "bob"},
+                    {"field": "description", "contains": "sum"},
+                ]
+            },
+        )
+        assert names == []
+        assert plan["access"] == "eq index on created_by"
+        assert plan["estimated_rows"] == plan["candidate_rows"] == 1
+        assert plan["residual"]
+        names, plan = run(
+            catalog,
+            {
+                "and": [
+                    {"field": "updated_time", "lt": 35},
+                    {"field": "status", "eq": "DRAFT"},
+                ]
+            },
+        )
+        assert names == ["fraud:amount:v1", "risk:score:v1"]
+        assert plan["access"] == "eq index on status"
+
+    # Union of fully indexed branches, scan otherwise
+    def test_or_and_not(self, catalog):
+        names, plan = run(
+            catalog,
+            {
+                "or": [
+                    {"field": "feature_name", "prefix": "risk:"},
+                    {"field": "created_by", "in": ["bob"]},
+                ]
+            },
+        )
+        assert names == ["fraud:amount:v2", "risk:score:v1", "risk:age:v1"]
+        assert (
+            plan["access"]
+            == "union of prefix index on feature_name, in index on created_by"
+        )
+        assert plan["estimated_rows"] == 3
+        assert not plan["residual"]
+        names, plan = run(
+            catalog,
+            {
+                "or": [
+                    {"field": "status", "eq": "DEPLOYED"},
+                    {"field": "description", "contains": "avg"},
+                ]
+            },
+        )
+        assert names == ["fraud:amount:v2", "risk:score:v1"]
+        assert plan["access"] == "full scan"
+        assert plan["estimated_rows"] == 4
+        names, plan = run(catalog, {"not": {"field": "status", "eq": "DRAFT"}})
+        assert names == ["fraud:amount:v2", "risk:age:v1"]
+        assert plan["filter"] == "NOT status eq 'DRAFT'"
+
+    # Branch leftovers rechecked after a union
+    def test_or_with_residual(self, catalog):
+        names, plan = run(
+            catalog,
+            {
+                "or": [
+                    {
+                        "and": [
+                            {"field": "created_by", "eq": "ann"},
+                            {"field": "updated_time", "gt": 10},
+                        ]
+                    },
+                    {"field": "status", "eq": "DEPLOYED"},
+                ]
+            },
+        )
+        assert names == ["fraud:amount:v2", "risk:score:v1"]
+        assert plan["residual"]
+        assert plan["candidate_rows"] == 3
+        assert plan["actual_rows"] == 2
+
+    # Range plans read the ordered index
+    def test_range(self, catalog):
+        names, plan = run(catalog, {"field": "updated_time", "gte": 20, "lte": 30})
+        assert names == ["fraud:amount:v2", "risk:score:v1"]
+        assert plan["access"] == "range index on updated_time"
+        assert plan["filter"] == "updated_time gte 20 lte 30"
+        assert not plan["residual"]
+        names, plan = run(catalog, {"field": "updated_time", "gte": 30, "lt": 20})
+        assert names == []
+        assert plan["estimated_rows"] == 0
+
+    # Planned results equal a full scan of the same expression
+    def test_matches_scan(self, catalog):
+        metadata, index = catalog
+        expressions = [
+            {"field": "status", "in": ["DRAFT", "DEPLOYED"]},
+            {
+                "and": [
+                    {"field": "description", "contains": "sum"},
+                    {"field": "feature_name", "contains": "risk"},
+                ]
+            },
+            {
+                "and": [
+                    {
+                        "and": [
+                            {"field": "created_by", "eq": "ann"},
+                            {"field": "description", "contains": "avg"},
+                        ]
+                    },
+                    {"field": "status", "eq": "DRAFT"},
+                ]
+            },
+            {"field": "status", "eq": "None"},
+            {
+                "and": [
+                    {"field": "feature_name", "prefix": "fraud:"},
+                    {"not": {"field": "created_by", "eq": "ann"}},
+                ]
+            },
+            {
+                "or": [
+                    {"field": "updated_time", "gte": 40},
+                    {"field": "feature_type", "eq": "batch"},
+                ]
+            },
+        ]
+        for where in expressions:
+            expression = compile_filter(where)
+            scanned = [name for name, meta in metadata.items() if expression.test(meta)]
+            assert QueryPlan(expression, index).execute(metadata) == scanned
+
+
+class TestServiceQuery:
+    # Records, counts and prefix through the service
+    def test_query(self, tmp_path, sample_create_request):
+        service = FeatureMetadataService(str(tmp_path / "metadata.json"))
+        for name in ["q:a:v1", "q:b:v1", "p:a:v1"]:
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=name)
+            )
+        where = {"field": "feature_name", "contains": ":a:"}
+        result, plan = service.query_feature_metadata("developer", where)
+        assert list(result) == ["q:a:v1", "p:a:v1"]
+        assert plan["actual_rows"] == 2
+        count, plan = service.count_query_matches("developer", where, "q:")
+        assert count == 1
+        assert plan["access"] == "prefix index on feature_name"
+        with pytest.raises(ValueError, match="Invalid prefix"):
+            service.count_query_matches("developer", where, 1)
@@ -0,0 +1,140 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.snapshot import is_binary_snapshot, write_snapshot
+from app.services.storage import ShardedFileBackend, create_backend
+
+
+# Sharded backend fixture
+@pytest.fixture
+def sharded(tmp_path):
+    return ShardedFileBackend(tmp_path / "metadata.json")
+
+
+class TestShardedFileBackend:
+    # One file per category
+    def test_save_all_writes_shards(self, sharded, catalog):
+        sharded.save_all(catalog)
+        files = sorted(p.name for p in sharded.shard_dir.iterdir())
+        assert files == ["a.json", "b.json"]
+        with open(sharded.shard_path("a")) as f:
+            assert list(json.load(f)) == ["a:x:v1", "a:z:v1"]
+
+    # Put rewrites only its namespace
+    def test_put_rewrites_one_shard(self, sharded, catalog):
+        sharded.save_all(catalog)
+        catalog["a:x:v1"]["status"] = "DEPLOYED"
+        with patch("app.services.storage.write_snapshot", wraps=write_snapshot) as spy:
+            sharded.put("a:x:v1", catalog)
+        assert [c.args[0].name for c in spy.call_args_list] == ["a.json"]
+        assert set(spy.call_args_list[0].args[1]) == {
+            "a:x:v1",
+            "a:z:v1",
+        }
+
+    # Shards load back into one catalog
+    def test_load_merges_shards(self, sharded, tmp_path, make_record, catalog):
+        sharded.save_all(catalog)
+        catalog["c:w:v1"] = make_record("c:w:v1")
+        sharded.put("c:w:v1", catalog)
+        reopened = ShardedFileBackend(tmp_path / "metadata.json", load_workers=2)
+        assert reopened.load() == catalog
+        reopened.put("c:w:v1", catalog)
+        assert reopened.load() == catalog
+
+    # Shards read concurrently
+    def test_parallel_load(self, sharded, catalog):
+        sharded.save_all(catalog)
+        threads = set()
+        original = sharded.load.__globals__["load_records"]
+
+        def tracking_read(path):
+            threads.add(threading.get_ident())
+            return original(path)
+
+        with patch("app.services.storage.load_records", side_effect=tracking_read):
+            assert len(sharded.load()) == 3
+        assert threading.get_ident() not in threads
+
+    # Legacy single file imported
+    def test_imports_single_file(self, tmp_path, catalog):
+        write_snapshot(tmp_path / "metadata.json", catalog)
+        backend = ShardedFileBackend(tmp_path / "metadata.json")
+        assert backend.load() == catalog
+        catalog = backend.load()
+        catalog["a:x:v1"]["status"] = "DEPLOYED"
+        backend.put("a:x:v1", catalog)
+        reopened = ShardedFileBackend(tmp_path / "metadata.json").load()
+        assert list(reopened) == ["a:x:v1", "a:z:v1"]
+
+    # Empty store loads empty
+    def test_load_missing(self, sharded):
+        assert sharded.load() == {}
+
+    # Removed namespaces deleted
+    def test_stale_shards_removed(self, sharded, catalog):
+        sharded.save_all(catalog)
+        del catalog["b:y:v1"]
+        sharded.save_all(catalog)
+        assert not sharded.shard_path("b").exists()
+        catalog.pop("a:z:v1")
+        sharded.put("a:x:v1", catalog)
+        assert sharded.load() == {"a:x:v1": catalog["a:x:v1"]}
+        catalog.pop("a:x:v1")
+        sharded.put("a:x:v1", catalog)
+        assert not sharded.shard_path("a").exists()
+        assert sharded.load() == {}
+
+    # Unsafe categories escaped
+    def test_shard_path_escaped(self, sharded):
+        assert sharded.shard_path("a/b").name == "a%2Fb.json"
+        assert sharded.shard_path("").name == "%.json"
+        assert sharded.shard_path("..").parent == sharded.shard_dir
+        assert ShardedFileBackend.shard_key("plain") == "plain"
+
+    # Binary shards
+    def test_binary_format(self, tmp_path, catalog):
+        backend = ShardedFileBackend(tmp_path / "m.json", snapshot_format="binary")
+        backend.save_all(catalog)
+        path = backend.shard_path("a")
+        assert path.suffix == ".snap"
+        assert is_binary_snapshot(path.read_bytes())
+        assert backend.load() == catalog
+        assert backend.checkpoint(threading.RLock(), {}) > 0
+
+    # Unknown format rejected
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid snapshot format"):
+            ShardedFileBackend(tmp_path / "m.json", snapshot_format="xml")
+
+
+class TestShardedService:
+    # Workflow persists across restart
+    def test_service_round_trip(self, tmp_path, sample_create_request):
+        data_file = tmp_path / "metadata.json"
+        service = FeatureMetadataService(
+            str(data_file), backend=ShardedFileBackend(data_file)
+        )
+        service.create_feature_metadata(sample_create_request)
+        other = dict(sample_create_request, feature_name="other:feature:v1")
+        service.create_feature_metadata(other)
+        restarted = FeatureMetadataService(
+            str(data_file), backend=ShardedFileBackend(data_file)
+        )
+        assert set(restarted.metadata) == {
+            sample_create_request["feature_name"],
+            "other:feature:v1",
+        }
+
+    # Env selects sharded backend
+    def test_env_sharded(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_BACKEND", "sharded")
+        monkeypatch.setenv("FEATURE_METADATA_SHARD_LOAD_WORKERS", "4")
+        backend = create_backend(tmp_path / "metadata.json")
+        assert isinstance(backend, ShardedFileBackend)
+        assert backend.shard_dir == tmp_path / "metadata.shards"
+        assert backend.load_workers == 4
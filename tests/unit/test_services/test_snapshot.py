@@ -0,0 +1,285 @@
+import json
+import struct
+
+import pytest
+
+from app.services.snapshot import (
+    SNAPSHOT_MAGIC,
+    SnapshotFormatError,
+    decode_snapshot,
+    encode_snapshot,
+    is_binary_snapshot,
+    iter_json_snapshot,
+    iter_snapshot,
+    read_snapshot,
+    write_snapshot,
+    write_snapshot_records,
+)
+from app.services.storage import FileBackend, create_backend
+
+
+# Mixed-shape sample catalog
+def sample_metadata():
+    return {
+        "a:b:v1": {
+            "feature_name": "a:b:v1",
+            "status": "DRAFT",
+            "created_time": 1700000000000,
+            "ratio": 0.5,
+            "enabled": True,
+            "count": 1,
+            "missing": None,
+            "tags": ["x", "y"],
+            "extra": {"nested": [1, 2]},
+            "unicode": "café ☃ \U0001f600",
+        },
+        "c:d:v1": {
+            "feature_name": "c:d:v1",
+            "status": "DRAFT",
+            "created_time": 1700000000000,
+            "ratio": 0.5,
+            "enabled": 1,
+            "count": True,
+            "missing": None,
+            "tags": ["x", "y"],
+            "extra": {},
+            "unicode": "",
+        },
+        "e:f:v1": {"feature_name": "e:f:v1", "status": "DEPLOYED"},
+        "empty:record:v1": {},
+    }
+
+
+class TestSnapshotCodec:
+    # Round trip preserves values and order
+    def test_round_trip(self):
+        metadata = sample_metadata()
+        decoded = decode_snapshot(encode_snapshot(metadata))
+        assert decoded == metadata
+        assert list(decoded) == list(metadata)
+        assert list(decoded["a:b:v1"]) == list(metadata["a:b:v1"])
+        assert decoded["a:b:v1"]["enabled"] is True
+        assert decoded["c:d:v1"]["count"] is True
+        assert decoded["c:d:v1"]["enabled"] == 1
+        assert decoded["c:d:v1"]["enabled"] is not True
+
+    # Mutable values are not shared between records
+    def test_mutable_values_independent(self):
+        decoded = decode_snapshot(encode_snapshot(sample_metadata()))
+        decoded["a:b:v1"]["tags"].append("z")
+        assert decoded["c:d:v1"]["tags"] == ["x", "y"]
+
+    # Repeated strings stored once
+    def test_strings_deduplicated(self):
+        metadata = {
+            f"team:f{i}:v1": {"status": "DEPLOYED", "owner": "shared-owner"}
+            for i in range(100)
+        }
+        data = encode_snapshot(metadata)
+        assert data.count(b"shared-owner") == 1
+        assert data.count(b"DEPLOYED") == 1
+        assert len(data) < len(json.dumps(metadata, indent=2))
+
+    # Empty catalog round trip
+    def test_empty(self):
+        assert decode_snapshot(encode_snapshot({})) == {}
+
+    # Header identifies format
+    def test_magic(self):
+        data = encode_snapshot({})
+        assert is_binary_snapshot(data)
+        assert data.startswith(SNAPSHOT_MAGIC)
+        assert not is_binary_snapshot(b'{"a": 1}')
+
+    # Corruption detected
+    def test_checksum_mismatch(self):
+        data = bytearray(encode_snapshot(sample_metadata()))
+        data[-1] ^= 0xFF
+        with pytest.raises(SnapshotFormatError, match="checksum"):
+            decode_snapshot(bytes(data))
+
+    # Truncated files rejected
+    def test_truncated(self):
+        data = encode_snapshot(sample_metadata())
+        with pytest.raises(SnapshotFormatError, match="header"):
+            decode_snapshot(data[:4])
+        with pytest.raises(SnapshotFormatError, match="truncated"):
+            decode_snapshot(data[:20])
+        with pytest.raises(SnapshotFormatError, match="checksum"):
+            decode_snapshot(data[:-1])
+
+    # Unknown header fields rejected
+    def test_bad_header(self):
+        data = encode_snapshot({})
+        body = data[struct.calcsize("<8sHHI") :]
+        with pytest.raises(SnapshotFormatError, match="Not a binary"):
+            decode_snapshot(b"X" * 8 + data[8:])
+        with pytest.raises(SnapshotFormatError, match="version"):
+            decode_snapshot(struct.pack("<8sHHI", SNAPSHOT_MAGIC, 99, 0, 6) + body)
+        with pytest.raises(SnapshotFormatError, match="section count"):
+            decode_snapshot(struct.pack("<8sHHI", SNAPSHOT_MAGIC, 1, 0, 2) + body)
+
+    # Inconsistent record tables rejected
+    def test_corrupt_tables(self, monkeypatch):
+        from app.services import snapshot
+
+        def rebuild(sections):
+            out = [struct.pack("<8sHHI", SNAPSHOT_MAGIC, 1, 0, len(sections))]
+            for payload in sections:
+                out.append(
+                    struct.pack("<IQ", snapshot.zlib.crc32(payload), len(payload))
+                )
+                out.append(payload)
+            return b"".join(out)
+
+        sections = snapshot._read_sections(encode_snapshot(sample_metadata()))
+        short_layout = json.loads(sections[2])
+        short_layout[0][1] += 1
+        cases = [
+            # Values array shorter than layout
+            sections[:5] + [sections[5][:-4]],
+            # Record count exceeds shape rows
+            sections[:2] + [json.dumps(short_layout).encode()] + sections[3:],
+            # Name slot out of range
+            sections[:3] + [b"\xff\xff\xff\xff" + sections[3][4:]] + sections[4:],
+            # Duplicate record names
+            sections[:3] + [sections[3][:4] * 4] + sections[4:],
+            # Names and shapes disagree
+            sections[:3] + [sections[3][:4]] + sections[4:],
+        ]
+        for case in cases:
+            with pytest.raises(SnapshotFormatError, match="corrupt"):
+                decode_snapshot(rebuild(case))
+
+
+class TestSnapshotFiles:
+    # Reader detects both formats
+    def test_read_detects_format(self, tmp_path):
+        metadata = sample_metadata()
+        write_snapshot(tmp_path / "m.snap", metadata, "binary")
+        size = write_snapshot(tmp_path / "m.json", metadata)
+        assert size == (tmp_path / "m.json").stat().st_size
+        assert read_snapshot(tmp_path / "m.snap") == metadata
+        assert read_snapshot(tmp_path / "m.json") == metadata
+        (tmp_path / "list.json").write_text("[1]")
+        assert read_snapshot(tmp_path / "list.json") == {}
+        assert not (tmp_path / "m.snap.tmp").exists()
+
+    # Unknown format rejected
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid snapshot format"):
+            write_snapshot(tmp_path / "m.bin", {}, "xml")
+
+
+class TestStreamingSnapshots:
+    # Records parsed across chunk boundaries
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+    def test_iter_json(self, tmp_path, chunk_size):
+        metadata = dict(sample_metadata(), **{"n:u:v1": 12345, "s:t:v1": '"}'})
+        metadata["d:e:v1"] = {"tags": {"a": [1, {"c": "\n  },"}]}, "by": "dev"}
+        # indent=2 takes the batched path, others fall back per record
+        for indent in (None, 1, 2, 4):
+            path = tmp_path / "m.json"
+            path.write_text(json.dumps(metadata, indent=indent))
+            assert dict(iter_json_snapshot(path, chunk_size)) == metadata
+
+    # Empty and non-object files
+    def test_iter_json_no_records(self, tmp_path):
+        path = tmp_path / "m.json"
+        path.write_text(" {} ")
+        assert list(iter_json_snapshot(path)) == []
+        path.write_text("[1, 2]")
+        assert list(iter_json_snapshot(path)) == []
+
+    # Malformed JSON raises
+    @pytest.mark.parametrize("chunk_size", [2, 1 << 20])
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            '{"a": 1',
+            '{"a" 1}',
+            '{"a": 1,}',
+            '{"a": 1} x',
+            "{1: 2}",
+            '{"a": 1 "b"}',
+            '{\n  "a": {\n  },\n}',
+        ],
+    )
+    def test_iter_json_malformed(self, tmp_path, text, chunk_size):
+        path = tmp_path / "m.json"
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_snapshot(path, chunk_size))
+
+    # Either format streamed
+    def test_iter_snapshot(self, tmp_path):
+        write_snapshot(tmp_path / "m.snap", sample_metadata(), "binary")
+        write_snapshot(tmp_path / "m.json", sample_metadata())
+        assert dict(iter_snapshot(tmp_path / "m.snap")) == sample_metadata()
+        assert dict(iter_snapshot(tmp_path / "m.json")) == sample_metadata()
+
+    # Writer output matches json.dump
+    def test_writer_matches_dump(self, tmp_path):
+        for metadata in (sample_metadata(), {}):
+            size = write_snapshot_records(tmp_path / "w.json", metadata.items())
+            write_snapshot(tmp_path / "d.json", metadata)
+            written = (tmp_path / "w.json").read_text()
+            assert written == (tmp_path / "d.json").read_text()
+            assert size == len(metadata)
+        assert write_snapshot_records(
+            tmp_path / "w.snap", sample_metadata().items(), "binary"
+        ) == len(sample_metadata())
+        assert read_snapshot(tmp_path / "w.snap") == sample_metadata()
+
+    # Failed stream leaves target untouched
+    def test_writer_abort(self, tmp_path):
+        path = tmp_path / "m.json"
+        write_snapshot(path, sample_metadata())
+
+        def failing():
+            yield "x:y:v1", {}
+            raise OSError("read")
+
+        with pytest.raises(OSError):
+            write_snapshot_records(path, failing())
+        assert read_snapshot(path) == sample_metadata()
+        assert not (tmp_path / "m.json.tmp").exists()
+
+
+class TestBinaryFileBackend:
+    # Binary snapshot replaces JSON on save
+    def test_binary_backend(self, tmp_path):
+        data_file = tmp_path / "metadata.json"
+        backend = FileBackend(data_file, wal_enabled=True, snapshot_format="binary")
+        backend.save_all(sample_metadata())
+        assert backend.snapshot_file == tmp_path / "metadata.snap"
+        assert not data_file.exists()
+        assert is_binary_snapshot(backend.snapshot_file.read_bytes())
+        metadata = sample_metadata()
+        metadata["g:h:v1"] = {"feature_name": "g:h:v1"}
+        backend.put("g:h:v1", metadata)
+        backend.close()
+        reopened = FileBackend(data_file, wal_enabled=True, snapshot_format="binary")
+        assert reopened.load() == metadata
+        reopened.close()
+
+    # Existing JSON imported on first start
+    def test_imports_json(self, tmp_path):
+        data_file = tmp_path / "metadata.json"
+        write_snapshot(data_file, sample_metadata())
+        backend = FileBackend(data_file, snapshot_format="binary")
+        assert backend.load() == sample_metadata()
+        backend.save_all({"x:y:v1": {}})
+        assert backend.load() == {"x:y:v1": {}}
+
+    # Unknown format rejected
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid snapshot format"):
+            FileBackend(tmp_path / "metadata.json", snapshot_format="xml")
+
+    # Format selected from env
+    def test_env_format(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_SNAPSHOT_FORMAT", "Binary")
+        backend = create_backend(tmp_path / "metadata.json")
+        assert backend.snapshot_format == "binary"
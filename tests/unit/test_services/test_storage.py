@@ -0,0 +1,219 @@
+import json
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.services.feature_service import FeatureMetadataService
+from app.services.storage import (
+    FileBackend,
+    SqliteBackend,
+    StorageBackend,
+    StorageError,
+    create_backend,
+)
+
+
+# SQLite backend fixture
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = SqliteBackend(tmp_path / "metadata.db")
+    yield backend
+    backend.close()
+
+
+# SQLite-backed service fixture
+@pytest.fixture
+def sqlite_service(tmp_path):
+    service = FeatureMetadataService(
+        str(tmp_path / "metadata.json"),
+        backend=SqliteBackend(tmp_path / "metadata.db"),
+    )
+    yield service
+    service.backend.close()
+
+
+class TestStorageBackendInterface:
+    # Default hooks are no-ops
+    def test_default_hooks(self):
+        class MemoryBackend(StorageBackend):
+            def load(self):
+                return {}
+
+            def save_all(self, metadata):
+                pass
+
+            def put(self, feature_name, metadata):
+                return None
+
+            def checkpoint(self, lock, metadata):
+                return 0
+
+        backend = MemoryBackend()
+        assert backend.wait(None) is None
+        assert backend.close() is None
+
+
+class TestFileBackend:
+    # Round trip snapshot
+    def test_save_and_load(self, tmp_path, make_record):
+        backend = FileBackend(tmp_path / "metadata.json")
+        backend.save_all({"a:b:1": make_record("a:b:1")})
+        assert FileBackend(tmp_path / "metadata.json").load() == {
+            "a:b:1": make_record("a:b:1")
+        }
+
+    # Non-dict snapshot ignored
+    def test_load_non_dict(self, tmp_path):
+        (tmp_path / "metadata.json").write_text("[1, 2]")
+        assert FileBackend(tmp_path / "metadata.json").load() == {}
+
+    # Non-object records skipped while streaming
+    def test_load_skips_invalid(self, tmp_path, capsys, make_record):
+        records = {"a:b:1": make_record("a:b:1"), "c:d:1": [1], "e:f:1": "x"}
+        (tmp_path / "metadata.json").write_text(json.dumps(records, indent=2))
+        assert FileBackend(tmp_path / "metadata.json").load() == {
+            "a:b:1": make_record("a:b:1")
+        }
+        assert "Skipped 2 invalid records" in capsys.readouterr().out
+
+    # Put without log rewrites snapshot
+    def test_put_without_wal(self, tmp_path, make_record):
+        backend = FileBackend(tmp_path / "metadata.json")
+        assert backend.put("a:b:1", {"a:b:1": make_record("a:b:1")}) is None
+        backend.wait(None)
+        backend.close()
+        with open(tmp_path / "metadata.json") as f:
+            assert "a:b:1" in json.load(f)
+
+
+class TestSqliteBackend:
+    # Row-level upsert and load
+    def test_put_and_load(self, sqlite_backend, make_record):
+        metadata = {"a:b:1": make_record("a:b:1"), "c:d:1": make_record("c:d:1")}
+        sqlite_backend.put("a:b:1", metadata)
+        sqlite_backend.put("c:d:1", metadata)
+        metadata["a:b:1"]["status"] = "READY_FOR_TESTING"
+        sqlite_backend.put("a:b:1", metadata)
+        loaded = sqlite_backend.load()
+        assert list(loaded) == ["a:b:1", "c:d:1"]
+        assert loaded["a:b:1"]["status"] == "READY_FOR_TESTING"
+
+    # WAL journal mode enabled
+    def test_journal_mode(self, sqlite_backend):
+        with sqlite3.connect(sqlite_backend.db_file) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    # Save all replaces rows
+    def test_save_all(self, sqlite_backend, make_record):
+        sqlite_backend.put("old:x:1", {"old:x:1": make_record("old:x:1")})
+        sqlite_backend.save_all({"a:b:1": make_record("a:b:1", extra=[1])})
+        assert sqlite_backend.load() == {"a:b:1": make_record("a:b:1", extra=[1])}
+
+    # Errors wrapped as StorageError
+    def test_errors_wrapped(self, sqlite_backend, make_record):
+        sqlite_backend.close()
+        with pytest.raises(StorageError, match="Failed to load"):
+            sqlite_backend.load()
+        with pytest.raises(StorageError, match="Failed to save"):
+            sqlite_backend.put("a:b:1", {"a:b:1": make_record("a:b:1")})
+        with pytest.raises(StorageError, match="Failed to save"):
+            sqlite_backend.save_all({})
+
+    # Failed bulk save rolls back
+    def test_save_all_rollback(self, sqlite_backend, make_record):
+        sqlite_backend.put("a:b:1", {"a:b:1": make_record("a:b:1")})
+        with pytest.raises(StorageError):
+            sqlite_backend.save_all({"x:y:1": {"bad": {1, 2}}})
+        assert list(sqlite_backend.load()) == ["a:b:1"]
+
+    # Open failure wrapped
+    def test_open_failure(self, tmp_path):
+        with pytest.raises(StorageError, match="Failed to open"):
+            SqliteBackend(tmp_path / "missing" / "metadata.db")
+
+
+class TestSqliteService:
+    # Workflow persists across restart
+    def test_workflow_persists(self, sqlite_service, sample_create_request, tmp_path):
+        name = sample_create_request["feature_name"]
+        sqlite_service.create_feature_metadata(sample_create_request)
+        sqlite_service.submit_test_feature_metadata(
+            {"feature_name": name, "submitted_by": "dev", "user_role": "developer"}
+        )
+        restarted = FeatureMetadataService(
+            str(tmp_path / "metadata.json"),
+            backend=SqliteBackend(tmp_path / "metadata.db"),
+        )
+        assert restarted.metadata[name]["status"] == "READY_FOR_TESTING"
+        restarted.backend.close()
+
+    # Filters use indexed candidates
+    def test_filtered_listing(self, sqlite_service, sample_create_request):
+        sqlite_service.create_feature_metadata(sample_create_request)
+        other = dict(
+            sample_create_request,
+            feature_name="test:other:v1",
+            feature_type="real-time",
+        )
+        sqlite_service.create_feature_metadata(other)
+        result = sqlite_service.get_all_feature_metadata(
+            "developer", {"feature_type": "real-time"}
+        )
+        assert list(result) == ["test:other:v1"]
+
+    # Storage errors surface as save failures
+    def test_storage_error_on_write(self, sqlite_service, sample_create_request):
+        with patch.object(sqlite_service.backend, "put", side_effect=StorageError("x")):
+            with pytest.raises(Exception, match="Failed to save data"):
+                sqlite_service.create_feature_metadata(sample_create_request)
+        with patch.object(
+            sqlite_service.backend, "wait", side_effect=StorageError("x")
+        ):
+            with pytest.raises(Exception, match="Failed to save data"):
+                sqlite_service._commit(None)
+
+    # Load errors reset metadata
+    def test_storage_error_on_load(self, sqlite_service, capsys):
+        with patch.object(
+            sqlite_service.backend, "load", side_effect=StorageError("x")
+        ):
+            sqlite_service._load_data()
+        assert sqlite_service.metadata == {}
+        assert "Error loading data" in capsys.readouterr().out
+
+
+class TestCreateBackend:
+    # Default JSON backend
+    def test_default_json(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("FEATURE_METADATA_BACKEND", raising=False)
+        monkeypatch.delenv("FEATURE_METADATA_WAL", raising=False)
+        backend = create_backend(tmp_path / "metadata.json")
+        assert isinstance(backend, FileBackend)
+        assert backend.wal is None
+
+    # Env enables log options
+    def test_env_wal_options(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_WAL", "true")
+        monkeypatch.setenv("FEATURE_METADATA_COMPACT_THRESHOLD", "7")
+        monkeypatch.setenv("FEATURE_METADATA_GROUP_COMMIT", "1")
+        monkeypatch.setenv("FEATURE_METADATA_GROUP_COMMIT_MS", "5")
+        backend = create_backend(tmp_path / "metadata.json")
+        assert backend.wal is not None
+        assert backend.compact_threshold == 7
+        assert backend.group_commit
+        assert backend.wal.group_commit_window == 0.005
+
+    # SQLite backend from env
+    def test_env_sqlite(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_BACKEND", "SQLite")
+        backend = create_backend(tmp_path / "metadata.json")
+        assert isinstance(backend, SqliteBackend)
+        assert backend.db_file == tmp_path / "metadata.db"
+        backend.close()
+
+    # Unknown backend rejected
+    def test_invalid_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FEATURE_METADATA_BACKEND", "redis")
+        with pytest.raises(ValueError, match="Invalid storage backend"):
+            create_backend(tmp_path / "metadata.json")
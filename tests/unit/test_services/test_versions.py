@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from app.services.versions import RecordVersions, etag_matches
+
+
+# Update one feature's description
+def update(service, name):
+    service.update_feature_metadata(
+        {
+            "feature_name": name,
+            "description": "changed",
+            "last_updated_by": "dev",
+            "user_role": "developer",
+        }
+    )
+
+
+class TestEtagMatches:
+    # Single tags, lists, weak tags and the wildcard
+    @pytest.mark.parametrize(
+        "condition,expected",
+        [
+            (None, False),
+            ("", False),
+            ('"e-1"', True),
+            ('W/"e-1"', True),
+            ("e-1", True),
+            ('"e-2"', False),
+            ('"e-2", "e-1"', True),
+            ('"e-2" ,W/"e-3"', False),
+            ("*", True),
+        ],
+    )
+    def test_matches(self, condition, expected):
+        assert etag_matches(condition, '"e-1"') is expected
+
+
+class TestRecordVersions:
+    # Versions are stable per record dict and only ever increase
+    def test_get(self):
+        versions = RecordVersions()
+        record = {"feature_name": "a:b:v1"}
+        first = versions.get("a:b:v1", record)
+        assert versions.get("a:b:v1", record) == first
+        replaced = versions.get("a:b:v1", dict(record))
+        assert replaced > first
+        versions.invalidate("a:b:v1")
+        versions.invalidate("a:b:v1")
+        assert versions.get("a:b:v1", record) > replaced
+
+    # Tags carry the epoch, and projections get their own tag
+    def test_etag(self):
+        versions = RecordVersions()
+        record = {"feature_name": "a:b:v1"}
+        etag = versions.etag("a:b:v1", record)
+        assert etag == f'"{versions.epoch}-{versions.get("a:b:v1", record)}"'
+        projected = versions.etag("a:b:v1", record, ["feature_name", "status"])
+        assert projected.startswith(etag[:-1] + "-")
+        assert projected != versions.etag("a:b:v1", record, ["feature_name"])
+        versions.clear()
+        assert versions.entries == {}
+        assert versions.etag("a:b:v1", record) != etag
+
+    # Listing tags change with any write or reload
+    def test_catalog_etag(self):
+        versions = RecordVersions()
+        etag = versions.catalog_etag("/features?user_role=developer")
+        assert versions.catalog_etag("/features?user_role=developer") == etag
+        assert versions.catalog_etag("/features?user_role=tester") != etag
+        versions.invalidate("a:b:v1")
+        changed = versions.catalog_etag("/features?user_role=developer")
+        assert changed != etag
+        versions.clear()
+        assert versions.catalog_etag("/features?user_role=developer") != changed
+
+
+class TestConditionalReads:
+    # Current tags skip the body, mutations and reloads change the tag
+    def test_single(self, populated_service):
+        etag, body = populated_service.get_versioned_json("b:feature:v1")
+        assert body == populated_service.get_feature_json("b:feature:v1")
+        assert populated_service.get_versioned_json(
+            "b:feature:v1", if_none_match=etag
+        ) == (
+            etag,
+            None,
+        )
+        update(populated_service, "b:feature:v1")
+        changed, body = populated_service.get_versioned_json(
+            "b:feature:v1", if_none_match=etag
+        )
+        assert changed != etag
+        assert json.loads(body)["description"] == "changed"
+        populated_service._load_data()
+        assert populated_service.get_versioned_json(
+            "b:feature:v1", if_none_match=changed
+        )[1]
+        with pytest.raises(ValueError, match="not found"):
+            populated_service.get_versioned_json("c:missing:v1", if_none_match="*")
+
+    # Batches leave out bodies of names whose known tag is current
+    def test_batch(self, populated_service):
+        names = ["b:feature:v1", "a:feature:v2", "c:missing:v1"]
+        found = populated_service.get_many_versioned(names)
+        assert found["c:missing:v1"] is None
+        known = {name: found[name][0] for name in names[:2]}
+        assert populated_service.get_many_versioned(names, known_versions=known) == {
+            "b:feature:v1": (known["b:feature:v1"], None),
+            "a:feature:v2": (known["a:feature:v2"], None),
+            "c:missing:v1": None,
+        }
+        update(populated_service, "a:feature:v2")
+        found = populated_service.get_many_versioned(names, fields=["description"])
+        assert json.loads(found["a:feature:v2"][1]) == {
+            "feature_name": "a:feature:v2",
+            "description": "changed",
+        }
+        found = populated_service.get_many_versioned(names, known_versions=known)
+        assert found["b:feature:v1"][1] is None
+        assert found["a:feature:v2"][0] != known["a:feature:v2"]
+        assert found["a:feature:v2"][1] == populated_service.get_feature_json(
+            "a:feature:v2"
+        )
@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+import time
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from app.services.wal import WriteAheadLog
+
+
+# Temporary log fixture
+@pytest.fixture
+def wal(tmp_path):
+    log = WriteAheadLog(tmp_path / "test.wal")
+    yield log
+    log.close()
+
+
+class TestWriteAheadLog:
+    # Append and replay test
+    def test_append_and_replay(self, wal):
+        wal.append({"op": "put", "key": "a", "value": {"x": 1}})
+        wal.append({"op": "put", "key": "b", "value": {"x": 2}})
+        assert wal.record_count == 2
+        records = list(WriteAheadLog(wal.log_file).replay())
+        assert [r["key"] for r in records] == ["a", "b"]
+
+    # Missing file replay
+    def test_replay_missing_file(self, wal):
+        assert list(wal.replay()) == []
+        assert wal.record_count == 0
+
+    # Torn tail truncated
+    def test_replay_truncates_torn_tail(self, wal):
+        wal.append({"op": "put", "key": "a", "value": {}})
+        wal.close()
+        good_size = wal.log_file.stat().st_size
+        with open(wal.log_file, "ab") as f:
+            f.write(b'0000abcd\t{"op": "put"')
+        records = list(wal.replay())
+        assert len(records) == 1
+        assert wal.log_file.stat().st_size == good_size
+
+    # Corrupt checksum stops replay
+    def test_replay_stops_at_bad_checksum(self, wal):
+        wal.append({"op": "put", "key": "a", "value": {}})
+        wal.close()
+        with open(wal.log_file, "ab") as f:
+            f.write(b'00000000\t{"op":"put","key":"b"}\n')
+        assert [r["key"] for r in wal.replay()] == ["a"]
+
+    # Decode rejects bad lines
+    def test_decode_record_invalid(self):
+        payload = b"[1,2]"
+        line = WriteAheadLog.encode_record({"k": 1})
+        assert WriteAheadLog.decode_record(line) == {"k": 1}
+        assert WriteAheadLog.decode_record(b"zz\tnot json\n") is None
+        assert WriteAheadLog.decode_record(line[:-1]) is None
+        checksum = b"%08x" % zlib.crc32(payload)
+        assert WriteAheadLog.decode_record(checksum + b"\t" + payload + b"\n") is None
+
+    # Reset empties log
+    def test_reset(self, wal):
+        wal.append({"op": "put", "key": "a", "value": {}})
+        wal.reset()
+        assert wal.record_count == 0
+        assert wal.log_file.stat().st_size == 0
+        assert list(wal.replay()) == []
+
+
+class TestGroupCommit:
+    # Concurrent records share fsyncs
+    def test_concurrent_appends_batched(self, tmp_path):
+        log = WriteAheadLog(tmp_path / "group.wal", group_commit_window_ms=20)
+        threads = [
+            threading.Thread(target=log.append, args=({"op": "put", "key": str(i)},))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert log.commit_count < 20
+        log.close()
+        assert len(list(log.replay())) == 20
+
+    # Submit then wait
+    def test_submit_wait(self, wal):
+        first = wal.submit({"op": "put", "key": "a"})
+        second = wal.submit({"op": "put", "key": "b"})
+        assert first is second
+        wal.wait(first)
+        assert first.done
+        assert wal.commit_count == 1
+
+    # Failed write raises for batch
+    def test_write_failure(self, wal):
+        with patch("app.services.wal.os.fsync", side_effect=OSError("disk")):
+            with pytest.raises(OSError, match="disk"):
+                wal.append({"op": "put", "key": "a"})
+        wal.append({"op": "put", "key": "b"})
+        assert wal.commit_count == 1
+
+    # Reset acknowledges pending records
+    def test_reset_completes_pending(self, wal):
+        batch = wal.submit({"op": "put", "key": "a"})
+        wal.reset()
+        assert batch.done
+        wal.wait(batch)
+        assert wal.commit_count == 0
+
+    # Reset and close wait for flush
+    def test_reset_waits_for_flush(self, wal):
+        started = threading.Event()
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            started.set()
+            time.sleep(0.05)
+            real_fsync(fd)
+
+        with patch("app.services.wal.os.fsync", side_effect=slow_fsync):
+            writer = threading.Thread(target=wal.append, args=({"key": "a"},))
+            writer.start()
+            started.wait()
+            wal.close()
+            started.clear()
+            writer.join()
+            writer = threading.Thread(target=wal.append, args=({"key": "b"},))
+            writer.start()
+            started.wait()
+            wal.reset()
+            writer.join()
+        assert wal.record_count == 0
+
+
+class TestServiceWriteAheadLog:
+    # Mutation appends instead of rewrite
+    def test_mutation_appends_log(self, wal_service, sample_create_request):
+        wal_service.create_feature_metadata(sample_create_request)
+        assert wal_service.backend.wal.record_count == 1
+        assert not wal_service.data_file.exists()
+
+    # Restart replays snapshot and log
+    def test_restart_replays_log(
+        self, wal_service, sample_create_request, tmp_path, make_service
+    ):
+        wal_service.create_feature_metadata(sample_create_request)
+        wal_service.submit_test_feature_metadata(
+            {
+                "feature_name": sample_create_request["feature_name"],
+                "submitted_by": "dev",
+                "user_role": "developer",
+            }
+        )
+        restarted = make_service(wal_service.data_file)
+        name = sample_create_request["feature_name"]
+        assert restarted.metadata[name]["status"] == "READY_FOR_TESTING"
+        assert restarted.backend.wal.record_count == 2
+        restarted.backend.close()
+
+    # Compaction writes snapshot
+    def test_compaction_threshold(self, tmp_path, sample_create_request, make_service):
+        service = make_service(tmp_path / "metadata.json", compact_threshold=2)
+        service.create_feature_metadata(sample_create_request)
+        second = dict(sample_create_request, feature_name="test:create:v2")
+        service.create_feature_metadata(second)
+        assert service.backend.wal.record_count == 0
+        with open(service.data_file) as f:
+            assert set(json.load(f)) == {"test:create:v1", "test:create:v2"}
+        service.backend.close()
+
+    # Delete record replay
+    def test_replay_delete_and_invalid_records(self, tmp_path, make_service):
+        log = WriteAheadLog(tmp_path / "metadata.json.wal")
+        log.append({"op": "put", "key": "a:b:1", "value": {"status": "DRAFT"}})
+        log.append({"op": "put", "key": "c:d:1", "value": {"status": "DRAFT"}})
+        log.append({"op": "delete", "key": "a:b:1"})
+        log.append({"op": "put", "key": 5, "value": {}})
+        log.append({"op": "put", "key": "e:f:1", "value": "bad"})
+        log.close()
+        service = make_service(tmp_path / "metadata.json")
+        assert list(service.metadata) == ["c:d:1"]
+        service.backend.close()
+
+    # Log append failure
+    def test_append_failure(self, wal_service, sample_create_request):
+        with patch.object(wal_service.backend.wal, "wait", side_effect=OSError("disk")):
+            with pytest.raises(Exception, match="Failed to save data"):
+                wal_service.create_feature_metadata(sample_create_request)
+
+    # Replay failure is logged
+    def test_replay_failure(self, tmp_path, capsys, make_service):
+        with patch.object(WriteAheadLog, "replay", side_effect=OSError("io")):
+            service = make_service(tmp_path / "metadata.json")
+        assert service.metadata == {}
+        assert "Error replaying log" in capsys.readouterr().out
+
+    # Group commit service writes
+    def test_group_commit_service(self, tmp_path, sample_create_request, make_service):
+        service = make_service(
+            tmp_path / "metadata.json", group_commit=True, group_commit_window_ms=20
+        )
+
+        def create(i):
+            service.create_feature_metadata(
+                dict(sample_create_request, feature_name=f"group:commit:v{i + 1}")
+            )
+
+        threads = [threading.Thread(target=create, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert service.backend.wal.commit_count < 10
+        service.backend.close()
+        restarted = make_service(service.data_file)
+        assert len(restarted.metadata) == 10
+        restarted.backend.close()
+
+    # Group commit write failure
+    def test_group_commit_failure(self, tmp_path, sample_create_request, make_service):
+        service = make_service(tmp_path / "metadata.json", group_commit=True)
+        with patch("app.services.wal.os.fsync", side_effect=OSError("disk")):
+            with pytest.raises(Exception, match="Failed to save data"):
+                service.create_feature_metadata(sample_create_request)
+        service.backend.close()
@@ -0,0 +1,31 @@
+from app.utils.config import env_flag, env_int, env_str
+
+
+class TestConfig:
+    # Boolean env flag
+    def test_env_flag(self, monkeypatch):
+        monkeypatch.delenv("TEST_FLAG", raising=False)
+        assert env_flag("TEST_FLAG") is False
+        assert env_flag("TEST_FLAG", default=True) is True
+        monkeypatch.setenv("TEST_FLAG", "yes")
+        assert env_flag("TEST_FLAG") is True
+        monkeypatch.setenv("TEST_FLAG", "0")
+        assert env_flag("TEST_FLAG", default=True) is False
+        monkeypatch.setenv("TEST_FLAG", " ")
+        assert env_flag("TEST_FLAG", default=True) is True
+
+    # Integer env setting
+    def test_env_int(self, monkeypatch):
+        monkeypatch.delenv("TEST_INT", raising=False)
+        assert env_int("TEST_INT", 5) == 5
+        monkeypatch.setenv("TEST_INT", "12")
+        assert env_int("TEST_INT", 5) == 12
+        monkeypatch.setenv("TEST_INT", "abc")
+        assert env_int("TEST_INT", 5) == 5
+
+    # String env setting
+    def test_env_str(self, monkeypatch):
+        monkeypatch.delenv("TEST_STR", raising=False)
+        assert env_str("TEST_STR", "json") == "json"
+        monkeypatch.setenv("TEST_STR", " sqlite ")
+        assert env_str("TEST_STR", "json") == "sqlite"
@@ -0,0 +1,55 @@
+import pytest
+
+from app.utils.query_string import listing_request, parse_fields, parse_flag
+
+
+class TestQueryString:
+    # Flags accept the usual spellings only
+    def test_parse_flag(self):
+        assert parse_flag("count_only", "true") is True
+        assert parse_flag("count_only", "1") is True
+        assert parse_flag("count_only", "No") is False
+        assert parse_flag("count_only", "") is False
+        with pytest.raises(ValueError, match="Invalid count_only"):
+            parse_flag("count_only", "maybe")
+
+    # Comma lists skip blanks
+    def test_parse_fields(self):
+        assert parse_fields("status, description,,") == ["status", "description"]
+
+    # Options, repeated filters and ranges shaped like the POST body
+    def test_listing_request(self):
+        params = [
+            ("user_role", "developer"),
+            ("limit", "10"),
+            ("include_total", "true"),
+            ("fields", "status"),
+            ("fields", "description"),
+            ("status", "DRAFT"),
+            ("status", "DEPLOYED"),
+            ("status", "READY_FOR_TESTING"),
+            ("feature_type", "batch"),
+            ("created_time.gte", "100"),
+            ("created_time.lt", "2.5"),
+            ("where", '{"field": "status", "eq": "DRAFT"}'),
+        ]
+        assert listing_request(params) == {
+            "user_role": "developer",
+            "limit": 10,
+            "include_total": True,
+            "fields": ["status", "description"],
+            "status": ["DRAFT", "DEPLOYED", "READY_FOR_TESTING"],
+            "feature_type": "batch",
+            "created_time": {"gte": 100, "lt": 2.5},
+            "where": {"field": "status", "eq": "DRAFT"},
+        }
+        assert listing_request([("limit", "ten")]) == {"limit": "ten"}
+
+    # Malformed where and mixed values and ranges are rejected
+    def test_listing_request_errors(self):
+        with pytest.raises(ValueError, match="Invalid where"):
+            listing_request([("where", "{")])
+        with pytest.raises(ValueError, match="either values or a range"):
+            listing_request([("created_time", "1"), ("created_time.gte", "1")])
+        with pytest.raises(ValueError, match="either values or a range"):
+            listing_request([("created_time.gte", "1"), ("created_time", "1")])
@@ -0,0 +1,34 @@
+import json
+
+from app.utils.responses import FastJSONResponse, encode_json, render_json
+
+
+class TestResponses:
+    # Compact UTF-8 JSON, as Starlette renders it
+    def test_encode_json(self):
+        assert (
+            encode_json({"a": [1, None], "b": "é"}) == '{"a":[1,null],"b":"é"}'.encode()
+        )
+
+    # Fragments spliced into plain values at any depth
+    def test_render_json(self):
+        content = {
+            "values": b'{"x":1}',
+            "results": {"values": [b'{"y":2}', b"{}"], "status": ["ok", "miss"]},
+            "rows": [{"z": 3}],
+            1: None,
+        }
+        assert json.loads(render_json(content)) == {
+            "values": {"x": 1},
+            "results": {"values": [{"y": 2}, {}], "status": ["ok", "miss"]},
+            "rows": [{"z": 3}],
+            "1": None,
+        }
+        assert render_json([]) == b"[]"
+        assert render_json({}) == b"{}"
+
+    # Response carries the rendered body as JSON
+    def test_response(self):
+        response = FastJSONResponse({"metadata": [b'{"a":1}'], "total_count": 1})
+        assert response.body == b'{"metadata":[{"a":1}],"total_count":1}'
+        assert response.media_type == "application/json"